@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from enum import Enum, auto
-from typing import List
+from typing import Callable, Dict, List, Tuple
 
 import requests
 from lxml import html
@@ -171,8 +171,79 @@ class AnalogueStoreStock():
             return f'Analogue products: {productsString}'
 
 
+class AnalogueStoreChangeType(Enum):
+    ADDED = auto()
+    IN_STOCK = auto()
+    OUT_OF_STOCK = auto()
+    PRICE_CHANGED = auto()
+    REMOVED = auto()
+
+    def toStr(self) -> str:
+        if self is self.ADDED:
+            return 'added'
+        elif self is self.IN_STOCK:
+            return 'in stock'
+        elif self is self.OUT_OF_STOCK:
+            return 'out of stock'
+        elif self is self.PRICE_CHANGED:
+            return 'price changed'
+        elif self is self.REMOVED:
+            return 'removed'
+        else:
+            raise RuntimeError(f'unknown AnalogueStoreChangeType: \"{self}\"')
+
+
+class AnalogueStoreChange():
+
+    def __init__(
+        self,
+        changeType: AnalogueStoreChangeType,
+        product: AnalogueStoreEntry,
+        previousProduct: AnalogueStoreEntry = None
+    ):
+        if changeType is None:
+            raise ValueError(f'changeType argument is malformed: \"{changeType}\"')
+        elif product is None:
+            raise ValueError(f'product argument is malformed: \"{product}\"')
+
+        self.__changeType = changeType
+        self.__product = product
+        self.__previousProduct = previousProduct
+
+    def getChangeType(self) -> AnalogueStoreChangeType:
+        return self.__changeType
+
+    def getPreviousProduct(self) -> AnalogueStoreEntry:
+        # the product as it was before this change, or None if it's newly added
+        return self.__previousProduct
+
+    def getProduct(self) -> AnalogueStoreEntry:
+        # the product as it is now (or as it last was, if it's been removed)
+        return self.__product
+
+    def toStr(self) -> str:
+        name = self.__product.getName()
+
+        if self.__changeType is AnalogueStoreChangeType.ADDED:
+            return f'{self.__product.toStr(includePrice = True, includeStockInfo = True)} is new in the Analogue store'
+        elif self.__changeType is AnalogueStoreChangeType.IN_STOCK:
+            return f'{self.__product.toStr(includePrice = True)} is back in stock'
+        elif self.__changeType is AnalogueStoreChangeType.OUT_OF_STOCK:
+            return f'{name} is out of stock'
+        elif self.__changeType is AnalogueStoreChangeType.PRICE_CHANGED:
+            return f'{name} changed price from {self.__previousProduct.getPrice()} to {self.__product.getPrice()}'
+        else:
+            return f'{name} is no longer in the Analogue store'
+
+
 class AnalogueStoreRepository():
 
+    # Each time that the store stock is refreshed, it's compared against the previous stock,
+    # product by product (by product type and name), and every difference becomes an
+    # AnalogueStoreChange. Those are passed to each change listener (only when there is at least
+    # one), and can also be polled for with fetchStoreChanges(). The very first refresh has
+    # nothing to compare against, so it never produces any changes.
+
     def __init__(
         self,
         storeUrl: str = 'https://www.analogue.co/store',
@@ -187,17 +258,117 @@ class AnalogueStoreRepository():
         self.__cacheTime = datetime.utcnow() - cacheTimeDelta
         self.__cacheTimeDelta = cacheTimeDelta
         self.__storeStock = None
+        self.__changeListeners: List[Callable[[List[AnalogueStoreChange]], None]] = list()
+        self.__pendingChanges: List[AnalogueStoreChange] = list()
+
+    def addChangeListener(self, changeListener: Callable[[List[AnalogueStoreChange]], None]):
+        # the given listener is called with the list of changes after every refresh that has any
+        if changeListener is None:
+            raise ValueError(f'changeListener argument is malformed: \"{changeListener}\"')
+
+        self.__changeListeners.append(changeListener)
+
+    def __computeChanges(self, previousStock: AnalogueStoreStock, storeStock: AnalogueStoreStock) -> List[AnalogueStoreChange]:
+        # The store can list more than one product with the same type and name (e.g. the same
+        # product twice), so each (type, name) maps to a list of products. Those are first paired
+        # up with an unchanged previous product (same stock and price), and then the rest with
+        # the previous stock's in the order that they're listed. That way, duplicates that only
+        # swapped places aren't changes, and a duplicate is only ever added or removed when the
+        # number of them actually changes.
+        previousProducts: Dict[Tuple[AnalogueProductType, str], List[AnalogueStoreEntry]] = dict()
+
+        for product in previousStock.getProducts():
+            previousProducts.setdefault(self.__getProductKey(product), list()).append(product)
+
+        storeProducts = storeStock.getProducts()
+        unchangedProducts: Dict[int, AnalogueStoreEntry] = dict()
+
+        for index, product in enumerate(storeProducts):
+            sameProducts = previousProducts.get(self.__getProductKey(product), list())
+
+            for previousIndex, previousProduct in enumerate(sameProducts):
+                if product.inStock() == previousProduct.inStock() and product.getPrice() == previousProduct.getPrice():
+                    unchangedProducts[index] = sameProducts.pop(previousIndex)
+                    break
+
+        changes: List[AnalogueStoreChange] = list()
+
+        for index, product in enumerate(storeProducts):
+            if index in unchangedProducts:
+                continue
+
+            sameProducts = previousProducts.get(self.__getProductKey(product))
+
+            if not utils.hasItems(sameProducts):
+                changes.append(AnalogueStoreChange(AnalogueStoreChangeType.ADDED, product))
+                continue
+
+            previousProduct = sameProducts.pop(0)
+
+            if product.inStock() and not previousProduct.inStock():
+                changes.append(AnalogueStoreChange(AnalogueStoreChangeType.IN_STOCK, product, previousProduct))
+            elif not product.inStock() and previousProduct.inStock():
+                changes.append(AnalogueStoreChange(AnalogueStoreChangeType.OUT_OF_STOCK, product, previousProduct))
+
+            if product.hasPrice() and previousProduct.hasPrice() and product.getPrice() != previousProduct.getPrice():
+                changes.append(AnalogueStoreChange(AnalogueStoreChangeType.PRICE_CHANGED, product, previousProduct))
+
+        # whatever's left wasn't in the new stock at all
+        for sameProducts in previousProducts.values():
+            for previousProduct in sameProducts:
+                changes.append(AnalogueStoreChange(AnalogueStoreChangeType.REMOVED, previousProduct, previousProduct))
+
+        return changes
+
+    def fetchStoreChanges(self) -> List[AnalogueStoreChange]:
+        # Refreshes the store stock (if the cached stock is old enough to be) and returns every
+        # change found since the last call to this method, which is an empty list if nothing has
+        # changed.
+        self.fetchStoreStock()
+
+        changes = self.__pendingChanges
+        self.__pendingChanges = list()
+        return changes
 
     def fetchStoreStock(self) -> AnalogueStoreStock:
         if self.__cacheTime + self.__cacheTimeDelta < datetime.utcnow() or self.__storeStock is None:
+            previousStock = self.__storeStock
             self.__storeStock = self.__refreshStoreStock()
             self.__cacheTime = datetime.utcnow()
 
+            if previousStock is not None:
+                self.__onStoreStockRefreshed(previousStock, self.__storeStock)
+
         return self.__storeStock
 
+    def __getProductKey(self, product: AnalogueStoreEntry) -> Tuple[AnalogueProductType, str]:
+        return product.getProductType(), product.getName().lower()
+
     def getStoreUrl(self) -> str:
         return self.__storeUrl
 
+    def removeChangeListener(self, changeListener: Callable[[List[AnalogueStoreChange]], None]):
+        if changeListener in self.__changeListeners:
+            self.__changeListeners.remove(changeListener)
+
+    def __onStoreStockRefreshed(self, previousStock: AnalogueStoreStock, storeStock: AnalogueStoreStock):
+        changes = self.__computeChanges(previousStock, storeStock)
+        if not utils.hasItems(changes):
+            return
+
+        print(f'Found {len(changes)} Analogue store change(s) ({utils.getNowTimeText()})')
+        self.__pendingChanges.extend(changes)
+
+        # if nothing polls for changes, only the most recent ones are kept
+        del self.__pendingChanges[:-256]
+
+        for changeListener in self.__changeListeners:
+            try:
+                changeListener(list(changes))
+            except Exception as e:
+                # one broken listener shouldn't keep the others from hearing about the changes
+                print(f'Exception occurred when notifying an Analogue store change listener: {e}')
+
     def __refreshStoreStock(self) -> AnalogueStoreStock:
         print(f'Refreshing Analogue store stock... ({utils.getNowTimeText()})')
 
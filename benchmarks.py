@@ -0,0 +1,345 @@
+import io
+import json
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.enEsLocalDictionary import EnEsLocalDictionary
+    from CynanBotCommon.jishoCache import JishoCache
+    from CynanBotCommon.jishoHelper import JishoHelper
+    from CynanBotCommon.jmdictDatabase import JmdictDatabase
+    from CynanBotCommon.pokepediaDamageClass import PokepediaDamageClass
+    from CynanBotCommon.pokepediaDatabase import PokepediaDatabase
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaMoveStreamParser import \
+        PokepediaMoveStreamParser
+    from CynanBotCommon.pokepediaMoveTable import PokepediaMoveTable
+    from CynanBotCommon.pokepediaNameIndex import PokepediaNameIndex
+    from CynanBotCommon.pokepediaRepository import PokepediaRepository
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from enEsLocalDictionary import EnEsLocalDictionary
+    from jishoCache import JishoCache
+    from jishoHelper import JishoHelper
+    from jmdictDatabase import JmdictDatabase
+    from pokepediaDamageClass import PokepediaDamageClass
+    from pokepediaDatabase import PokepediaDatabase
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaMoveStreamParser import PokepediaMoveStreamParser
+    from pokepediaMoveTable import PokepediaMoveTable
+    from pokepediaNameIndex import PokepediaNameIndex
+    from pokepediaRepository import PokepediaRepository
+
+
+# This file is meant to be run by hand, separately from the others in this repository. Each
+# benchmark takes its inputs (usually API responses recorded to disk, e.g. with curl) from the
+# command line, for example:
+#
+# python benchmarks.py jsonDecoding pokeapiMove.json openWeatherOneCall.json jokeApiJoke.json
+
+def measurePeakMemory(function: Callable) -> int:
+    # returns the peak number of bytes allocated by a single call
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def timeFunction(function: Callable, iterations: int) -> float:
+    # returns the best average time per call, in microseconds
+    timer = timeit.Timer(function)
+    return min(timer.repeat(repeat = 5, number = iterations)) / iterations * 1000000
+
+def benchmarkEnEsLookup(args: List[str]):
+    if len(args) < 2:
+        print('python benchmarks.py enEsLookup <wordListFile> <query> [<query> ...]')
+        sys.exit(1)
+
+    # the word list is in the format that EnEsLocalDictionary.fromFile() reads
+    enEsLocalDictionary = EnEsLocalDictionary.fromFile(args[0])
+    print(f'{args[0]} ({enEsLocalDictionary.getSize():,} words):')
+
+    for query in args[1:]:
+        localEntry = enEsLocalDictionary.search(query)
+        translations = None if localEntry is None else localEntry[1]
+        print(f'\t\"{query}\" -> {translations}:')
+        print(f'\t\tsearch(): {timeFunction(lambda: enEsLocalDictionary.search(query), 10000):,.1f}µs')
+        print(f'\t\tsearchPrefix(): {timeFunction(lambda: enEsLocalDictionary.searchPrefix(query), 10000):,.1f}µs')
+
+def benchmarkJishoCache(args: List[str]):
+    if len(args) != 2:
+        print('python benchmarks.py jishoCache <query> <jishoApiFile>')
+        sys.exit(1)
+
+    # the file is a recorded response from https://jisho.org/api/v1/search/words?keyword={query}
+    query = args[0]
+    jishoHelper = JishoHelper()
+
+    with open(args[1], 'rb') as file:
+        jishoResult = jishoHelper.parseApiResponse(query, file.read())
+
+    jishoCache = JishoCache(BackingDatabase(':memory:'))
+    jishoCache.set(query, jishoResult)
+
+    # a cache with room for just one result, so that every get() of the other query goes to the database
+    databaseJishoCache = JishoCache(BackingDatabase(':memory:'), maxSize = 1)
+    databaseJishoCache.set(query, jishoResult)
+    otherQuery = f'{query} {query}'
+    databaseJishoCache.set(otherQuery, jishoResult)
+
+    print(f'\"{query}\" -> \"{JishoCache.normalizeQuery(query)}\": {jishoResult.toStr()}')
+    print(f'\tnormalizeQuery(): {timeFunction(lambda: JishoCache.normalizeQuery(query), 10000):,.1f}µs')
+    print(f'\tget() from memory: {timeFunction(lambda: jishoCache.get(query), 10000):,.1f}µs')
+    print(f'\tget() from the database: {timeFunction(lambda: (databaseJishoCache.get(query), databaseJishoCache.get(otherQuery)), 1000) / 2:,.1f}µs')
+
+def benchmarkJishoParsing(args: List[str]):
+    if len(args) != 3:
+        print('python benchmarks.py jishoParsing <query> <jishoSearchPageFile> <jishoApiFile>')
+        sys.exit(1)
+
+    # the files are recorded responses from https://jisho.org/search/{query} and
+    # https://jisho.org/api/v1/search/words?keyword={query}
+    query = args[0]
+    jishoHelper = JishoHelper()
+
+    chunkSize = 8192
+    chunksRead = list()
+
+    def iterateChunks(content: bytes):
+        # mimics a streamed response's iter_content(), counting how much of it gets read
+        chunksRead.clear()
+
+        for index in range(0, len(content), chunkSize):
+            chunksRead.append(index)
+            yield content[index:index + chunkSize]
+
+    parsers = dict()
+    parsers['search page'] = (args[1], lambda content: jishoHelper.parseHtmlResponse(query, content))
+    parsers['search page stream'] = (args[1], lambda content: jishoHelper.parseHtmlStream(query, iterateChunks(content)))
+    parsers['API'] = (args[2], lambda content: jishoHelper.parseApiResponse(query, content))
+
+    for name, (payloadFile, parser) in parsers.items():
+        with open(payloadFile, 'rb') as file:
+            content = file.read()
+
+        chunksRead.clear()
+        jishoResult = parser(content)
+        bytesRead = min(len(chunksRead) * chunkSize, len(content)) if utils.hasItems(chunksRead) else len(content)
+        peakBytes = measurePeakMemory(lambda: parser(content))
+        microseconds = timeFunction(lambda: parser(content), 100)
+        print(f'{name} ({bytesRead:,} of {len(content):,} bytes read): {microseconds:,.1f}µs, {peakBytes:,} bytes peak')
+        print(f'\t{jishoResult.toStr()}')
+
+def benchmarkJmdictLookup(args: List[str]):
+    if len(args) < 2:
+        print('python benchmarks.py jmdictLookup <jmdictDatabaseFile> <query> [<query> ...]')
+        sys.exit(1)
+
+    # the database file is one that's been filled in by jmdictIngest.py
+    jmdictDatabase = JmdictDatabase(BackingDatabase(args[0]))
+    jishoHelper = JishoHelper(jmdictDatabase = jmdictDatabase)
+    print(f'{args[0]} ({jmdictDatabase.getSize():,} entries):')
+
+    for query in args[1:]:
+        entry = jmdictDatabase.getEntry(query)
+        word = None if entry is None else entry.getWord()
+        print(f'\t\"{query}\" -> \"{word}\":')
+        print(f'\t\tsearch(): {timeFunction(lambda: jishoHelper.search(query), 1000):,.1f}µs' if entry is not None else '\t\tsearch(): not in the database')
+        print(f'\t\tsearchPrefix(): {timeFunction(lambda: jishoHelper.searchPrefix(query), 1000):,.1f}µs')
+
+def benchmarkJsonDecoding(args: List[str]):
+    if not utils.hasItems(args):
+        print('python benchmarks.py jsonDecoding <payloadFile> [<payloadFile> ...]')
+        sys.exit(1)
+
+    decoders = dict()
+    decoders['json'] = json.loads
+
+    try:
+        import orjson
+        decoders['orjson'] = orjson.loads
+    except ImportError:
+        print('orjson is not installed, skipping it')
+
+    try:
+        import ujson
+        decoders['ujson'] = ujson.loads
+    except ImportError:
+        print('ujson is not installed, skipping it')
+
+    print(f'utils.loadJson() is currently using \"{utils.getJsonDecoderName()}\"')
+
+    for payloadFile in args:
+        with open(payloadFile, 'rb') as file:
+            content = file.read()
+
+        iterations = max(10, 10000000 // max(len(content), 1))
+        print(f'{payloadFile} ({len(content):,} bytes, {iterations:,} iterations):')
+
+        for name, decoder in decoders.items():
+            microseconds = timeFunction(lambda: decoder(content), iterations)
+            print(f'\t{name}: {microseconds:,.1f}µs')
+
+def benchmarkPokepediaMoveTable(args: List[str]):
+    if len(args) != 1:
+        print('python benchmarks.py pokepediaMoveTable <pokepediaDatabaseFile>')
+        sys.exit(1)
+
+    # the database file is one that's been filled in by pokepediaIngest.py
+    moves = PokepediaDatabase(BackingDatabase(args[0])).getMoves()
+    moveTable = PokepediaMoveTable(moves)
+    generation = PokepediaGeneration.GENERATION_3
+
+    def scanMoves():
+        # the same query as below, done one PokepediaMove at a time
+        results = list()
+
+        for move in moves:
+            generationMoves = [ generationMove for gen, generationMove in move.getGenerationMoves().items() if gen.value <= generation.value ]
+
+            if not utils.hasItems(generationMoves):
+                continue
+
+            generationMove = max(generationMoves, key = lambda generationMove: generationMove.getGeneration().value)
+
+            if generationMove.getElementType() is PokepediaElementType.FIRE and generationMove.getDamageClass() is PokepediaDamageClass.SPECIAL and generationMove.hasPower():
+                results.append((-generationMove.getPower(), move.getMoveId(), move))
+
+        results.sort(key = lambda result: result[:2])
+        return [ result[2] for result in results[:5] ]
+
+    def queryMoveTable():
+        return moveTable.query(
+            generation = generation,
+            elementTypes = [ PokepediaElementType.FIRE ],
+            damageClasses = [ PokepediaDamageClass.SPECIAL ],
+            limit = 5
+        )
+
+    print(f'{args[0]} ({len(moves):,} moves, {moveTable.getSize():,} table rows), top 5 special Fire moves in {generation.toStr()}:')
+    print(f'\tscan: {timeFunction(scanMoves, 100):,.1f}µs')
+    print(f'\tmove table: {timeFunction(queryMoveTable, 100):,.1f}µs')
+
+def benchmarkPokepediaNameIndex(args: List[str]):
+    if len(args) < 2:
+        print('python benchmarks.py pokepediaNameIndex <pokeApiNameListFile> <query> [<query> ...]')
+        sys.exit(1)
+
+    # the name list file is a recorded response from https://pokeapi.co/api/v2/move/?limit=100000
+    with open(args[0], 'rb') as file:
+        names = [ result['name'] for result in utils.loadJson(file.read())['results'] ]
+
+    nameIndex = PokepediaNameIndex(names)
+    print(f'{args[0]} ({nameIndex.getSize():,} names):')
+
+    for query in args[1:]:
+        bestMatch = nameIndex.getBestMatch(query)
+        microseconds = timeFunction(lambda: nameIndex.getBestMatch(query), 1000)
+        print(f'\t\"{query}\" -> \"{bestMatch}\": {microseconds:,.1f}µs')
+
+def benchmarkPokepediaEnums(args: List[str]):
+    if not utils.hasItems(args):
+        print('python benchmarks.py pokepediaEnums <pokeApiMoveFile> [<pokeApiMoveFile> ...]')
+        sys.exit(1)
+
+    lookups = dict()
+    lookups['PokepediaDamageClass.getTypeBasedDamageClass()'] = lambda: PokepediaDamageClass.getTypeBasedDamageClass(PokepediaElementType.DARK)
+    lookups['PokepediaElementType.fromStr()'] = lambda: PokepediaElementType.fromStr('water')
+    lookups['PokepediaElementType.getEmojiOrStr()'] = lambda: PokepediaElementType.STEEL.getEmojiOrStr()
+    lookups['PokepediaGeneration.fromStr()'] = lambda: PokepediaGeneration.fromStr('sword-shield')
+    lookups['PokepediaGeneration.toStr()'] = lambda: PokepediaGeneration.GENERATION_8.toStr()
+
+    for name, lookup in lookups.items():
+        print(f'{name}: {timeFunction(lookup, 100000):,.3f}µs')
+
+    # parseMove() is mostly schema decoding plus building the per-generation dictionary, which is
+    # where the enum lookups above happen once per generation
+    pokepediaRepository = PokepediaRepository()
+
+    for payloadFile in args:
+        with open(payloadFile, 'rb') as file:
+            jsonResponse = utils.loadJson(file.read())
+
+        move = pokepediaRepository.parseMove(jsonResponse)
+        print(f'{payloadFile} ({len(move.getGenerationMoves())} generations):')
+        print(f'\tparseMove(): {timeFunction(lambda: pokepediaRepository.parseMove(jsonResponse), 1000):,.1f}µs')
+        print(f'\ttoStrList(): {timeFunction(move.toStrList, 1000):,.1f}µs')
+
+def benchmarkPokepediaMoveMemory(args: List[str]):
+    if len(args) != 1:
+        print('python benchmarks.py pokepediaMoveMemory <pokepediaDatabaseFile>')
+        sys.exit(1)
+
+    # the database file is one that's been filled in by pokepediaIngest.py
+    pokepediaDatabase = PokepediaDatabase(BackingDatabase(args[0]))
+    moveNames = pokepediaDatabase.getMoveNames()
+
+    tracemalloc.start()
+    moves = [ pokepediaDatabase.getMove(moveName) for moveName in moveNames ]
+    retainedBytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    generationMoves = [ generationMove for move in moves for generationMove in move.getGenerationMoves().values() ]
+    instanceBytes = sys.getsizeof(generationMoves[0]) if utils.hasItems(generationMoves) else 0
+
+    print(f'{args[0]} ({len(moves):,} moves):')
+    print(f'\t{retainedBytes:,} bytes retained by the fully cached move list')
+    print(f'\t{len(generationMoves):,} PokepediaMoveGeneration instances of {instanceBytes:,} bytes each')
+
+def benchmarkPokepediaMoveParsing(args: List[str]):
+    if not utils.hasItems(args):
+        print('python benchmarks.py pokepediaMoveParsing <pokeApiMoveFile> [<pokeApiMoveFile> ...]')
+        sys.exit(1)
+
+    moveStreamParser = PokepediaMoveStreamParser()
+
+    if not moveStreamParser.isStreaming():
+        print('ijson is not installed, so the stream parser falls back to decoding the whole response')
+
+    parsers = dict()
+    parsers['loadJson'] = lambda content: utils.loadJson(content)
+    parsers['stream'] = lambda content: moveStreamParser.parse(io.BytesIO(content))
+
+    for payloadFile in args:
+        with open(payloadFile, 'rb') as file:
+            content = file.read()
+
+        print(f'{payloadFile} ({len(content):,} bytes):')
+
+        for name, parser in parsers.items():
+            peakBytes = measurePeakMemory(lambda: parser(content))
+            microseconds = timeFunction(lambda: parser(content), 100)
+            print(f'\t{name}: {microseconds:,.1f}µs, {peakBytes:,} bytes peak')
+
+def main():
+    benchmarks = dict()
+    benchmarks['enEsLookup'] = benchmarkEnEsLookup
+    benchmarks['jishoCache'] = benchmarkJishoCache
+    benchmarks['jishoParsing'] = benchmarkJishoParsing
+    benchmarks['jmdictLookup'] = benchmarkJmdictLookup
+    benchmarks['jsonDecoding'] = benchmarkJsonDecoding
+    benchmarks['pokepediaEnums'] = benchmarkPokepediaEnums
+    benchmarks['pokepediaMoveMemory'] = benchmarkPokepediaMoveMemory
+    benchmarks['pokepediaMoveParsing'] = benchmarkPokepediaMoveParsing
+    benchmarks['pokepediaMoveTable'] = benchmarkPokepediaMoveTable
+    benchmarks['pokepediaNameIndex'] = benchmarkPokepediaNameIndex
+
+    args = sys.argv[1:]
+
+    if not args or args[0] not in benchmarks:
+        benchmarkNames = ', '.join(benchmarks.keys())
+        print(f'python benchmarks.py <benchmark> [<args> ...] (available benchmarks: {benchmarkNames})')
+        sys.exit(1)
+
+    benchmarks[args[0]](args[1:])
+
+
+if __name__ == '__main__':
+    main()
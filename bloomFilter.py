@@ -0,0 +1,71 @@
+import hashlib
+import math
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class BloomFilter():
+
+    # A set that only remembers whether it has (probably) seen a key before, in a fixed number
+    # of bits: about 1.2 bytes per key for a 1% false positive rate. A key that was added is
+    # always found, while a key that wasn't is wrongly found falsePositiveRate of the time, as
+    # long as no more than capacity keys have been added. Keys can't be removed, only cleared
+    # all at once.
+
+    def __init__(self, capacity: int = 10000, falsePositiveRate: float = 0.01):
+        if not utils.isValidNum(capacity) or capacity < 1:
+            raise ValueError(f'capacity argument is malformed: \"{capacity}\"')
+        elif not utils.isValidNum(falsePositiveRate) or falsePositiveRate <= 0 or falsePositiveRate >= 1:
+            raise ValueError(f'falsePositiveRate argument is malformed: \"{falsePositiveRate}\"')
+
+        self.__capacity = capacity
+
+        # the standard sizing: m bits and k hashes for n keys at a false positive rate of p
+        self.__bitCount = max(8, math.ceil(-capacity * math.log(falsePositiveRate) / (math.log(2) ** 2)))
+        self.__hashCount = max(1, round(self.__bitCount / capacity * math.log(2)))
+        self.__bits = bytearray((self.__bitCount + 7) // 8)
+        self.__size = 0
+
+    def add(self, key: str):
+        if not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+
+        for index in self.__getIndexes(key):
+            self.__bits[index >> 3] |= 1 << (index & 7)
+
+        self.__size = self.__size + 1
+
+    def clear(self):
+        self.__bits = bytearray(len(self.__bits))
+        self.__size = 0
+
+    def __contains__(self, key: str) -> bool:
+        if not utils.isValidStr(key):
+            return False
+
+        return all(self.__bits[index >> 3] & (1 << (index & 7)) for index in self.__getIndexes(key))
+
+    def getByteSize(self) -> int:
+        return len(self.__bits)
+
+    def getCapacity(self) -> int:
+        return self.__capacity
+
+    def __getIndexes(self, key: str):
+        # the k indexes are derived from two halves of a single hash (Kirsch-Mitzenmacher), rather
+        # than by hashing the key k times
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size = 16).digest()
+        hash1 = int.from_bytes(digest[:8], 'little')
+        hash2 = int.from_bytes(digest[8:], 'little') | 1
+
+        return ((hash1 + index * hash2) % self.__bitCount for index in range(self.__hashCount))
+
+    def getSize(self) -> int:
+        # how many keys have been added since this filter was created or last cleared
+        return self.__size
+
+    def isFull(self) -> bool:
+        return self.__size >= self.__capacity
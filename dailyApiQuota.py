@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+
+
+class DailyApiQuota():
+
+    # Keeps a local count of how many calls have been made to an API today (in UTC), for APIs
+    # whose keys are only good for so many calls a day. The count is kept in the given
+    # BackingDatabase, so that restarting doesn't reset it. hasRemaining() turns False once
+    # there are only reserveSize calls left, so that callers can stop spending calls before
+    # the API itself starts refusing them.
+
+    def __init__(
+        self,
+        backingDatabase: BackingDatabase,
+        apiName: str,
+        dailyLimit: int,
+        reserveSize: int = 0
+    ):
+        if backingDatabase is None:
+            raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
+        elif not utils.isValidStr(apiName):
+            raise ValueError(f'apiName argument is malformed: \"{apiName}\"')
+        elif not utils.isValidNum(dailyLimit) or dailyLimit < 1:
+            raise ValueError(f'dailyLimit argument is malformed: \"{dailyLimit}\"')
+        elif not utils.isValidNum(reserveSize) or reserveSize < 0 or reserveSize >= dailyLimit:
+            raise ValueError(f'reserveSize argument is malformed: \"{reserveSize}\"')
+
+        self.__backingDatabase = backingDatabase
+        self.__apiName = apiName
+        self.__dailyLimit = dailyLimit
+        self.__reserveSize = reserveSize
+
+        # today's count is read from the database just once a day, and kept here after that
+        self.__day: str = None
+        self.__usedCount = 0
+
+        self.__initDatabaseTable()
+
+    def consume(self, count: int = 1):
+        # records that count more calls have been made today
+        if not utils.isValidNum(count) or count < 1:
+            raise ValueError(f'count argument is malformed: \"{count}\"')
+
+        self.__refresh()
+        self.__usedCount = self.__usedCount + count
+
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                INSERT OR REPLACE INTO dailyApiQuotas (apiName, day, usedCount)
+                VALUES (?, ?, ?)
+            ''',
+            (self.__apiName, self.__day, self.__usedCount)
+        )
+
+        connection.commit()
+
+    def getApiName(self) -> str:
+        return self.__apiName
+
+    def getDailyLimit(self) -> int:
+        return self.__dailyLimit
+
+    def getRemaining(self) -> int:
+        self.__refresh()
+        return max(self.__dailyLimit - self.__usedCount, 0)
+
+    def getReserveSize(self) -> int:
+        return self.__reserveSize
+
+    def getUsed(self) -> int:
+        self.__refresh()
+        return self.__usedCount
+
+    def hasRemaining(self) -> bool:
+        return self.getRemaining() > self.__reserveSize
+
+    def __initDatabaseTable(self):
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS dailyApiQuotas (
+                    apiName TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    usedCount INTEGER NOT NULL,
+                    PRIMARY KEY (apiName, day)
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.commit()
+
+    def __refresh(self):
+        day = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+        if day == self.__day:
+            return
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT usedCount FROM dailyApiQuotas
+                WHERE apiName = ? AND day = ?
+            ''',
+            (self.__apiName, day)
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+
+        self.__day = day
+        self.__usedCount = 0 if row is None else row[0]
@@ -7,40 +7,36 @@ import requests
 from requests import ConnectionError, HTTPError, Timeout
 from urllib3.exceptions import MaxRetryError, NewConnectionError
 
-import CynanBotCommon.utils as utils
-
-
-class EnEsDictionaryResult():
-
-    def __init__(self, definitions: List[str], word: str):
-        if not utils.hasItems(definitions):
-            raise ValueError(f'definitions argument is malformed: \"{definitions}\"')
-        elif not utils.isValidStr(word):
-            raise ValueError(f'word argument is malformed: \"{word}\"')
-
-        self.__definitions = definitions
-        self.__word = word
-
-    def getDefinitions(self) -> List[str]:
-        return self.__definitions
-
-    def getWord(self) -> str:
-        return self.__word
-
-    def toStr(self, delimiter: str = ', ') -> str:
-        if delimiter is None:
-            raise ValueError(f'delimiter argument is malformed: \"{delimiter}\"')
-
-        definitionsJoin = delimiter.join(self.__definitions)
-        return f'{self.__word} — {definitionsJoin}'
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.dailyApiQuota import DailyApiQuota
+    from CynanBotCommon.enEsDictionaryCache import EnEsDictionaryCache
+    from CynanBotCommon.enEsDictionaryResult import EnEsDictionaryResult
+    from CynanBotCommon.enEsLocalDictionary import EnEsLocalDictionary
+except:
+    import utils
+    from dailyApiQuota import DailyApiQuota
+    from enEsDictionaryCache import EnEsDictionaryCache
+    from enEsDictionaryResult import EnEsDictionaryResult
+    from enEsLocalDictionary import EnEsLocalDictionary
 
 
 class EnEsDictionary():
 
+    # Searches Merriam-Webster's Spanish-English dictionary API. When given an
+    # EnEsLocalDictionary, searches are answered from it first, and the API is only used for
+    # words that it doesn't have. When given an
+    # EnEsDictionaryCache, results are cached there, and the same word isn't looked up again
+    # until it expires. When given a DailyApiQuota, every call to the API is counted against it,
+    # and once it has nothing left to spare, searches are only answered from the cache.
+
     def __init__(
         self,
         merriamWebsterApiKey: str,
-        definitionsMaxSize: int = 3
+        definitionsMaxSize: int = 3,
+        enEsDictionaryCache: EnEsDictionaryCache = None,
+        enEsLocalDictionary: EnEsLocalDictionary = None,
+        merriamWebsterApiQuota: DailyApiQuota = None
     ):
         if not utils.isValidStr(merriamWebsterApiKey):
             raise ValueError(f'merriamWebsterApiKey argument is malformed: \"{merriamWebsterApiKey}\"')
@@ -49,12 +45,56 @@ class EnEsDictionary():
 
         self.__definitionsMaxSize = definitionsMaxSize
         self.__merriamWebsterApiKey = merriamWebsterApiKey
+        self.__enEsDictionaryCache = enEsDictionaryCache
+        self.__enEsLocalDictionary = enEsLocalDictionary
+        self.__merriamWebsterApiQuota = merriamWebsterApiQuota
+
+    def __createLocalResult(self, word: str, translations: List[str]) -> EnEsDictionaryResult:
+        definitions = list()
+
+        for translation in translations[:self.__definitionsMaxSize]:
+            number = locale.format_string("%d", len(definitions) + 1, grouping = True)
+            definitions.append(f'#{number} {translation}')
+
+        return EnEsDictionaryResult(
+            definitions = definitions,
+            word = word
+        )
 
     def search(self, query: str) -> EnEsDictionaryResult:
         if not utils.isValidStr(query):
             raise ValueError(f'query argument is malformed: \"{query}\"')
 
         query = query.strip()
+
+        if self.__enEsLocalDictionary is not None:
+            localEntry = self.__enEsLocalDictionary.search(query)
+
+            if localEntry is not None:
+                return self.__createLocalResult(*localEntry)
+
+        if self.__enEsDictionaryCache is not None:
+            result = self.__enEsDictionaryCache.get(query)
+
+            if result is not None:
+                return result
+
+        if self.__merriamWebsterApiQuota is not None:
+            if not self.__merriamWebsterApiQuota.hasRemaining():
+                print(f'Merriam Webster\'s daily API quota is running low ({self.__merriamWebsterApiQuota.getRemaining()} calls left), so \"{query}\" won\'t be looked up')
+                raise RuntimeError(f'Merriam Webster\'s daily API quota is running low ({self.__merriamWebsterApiQuota.getRemaining()} calls left), so \"{query}\" won\'t be looked up')
+
+            # the call counts against the quota whether or not anything comes of it
+            self.__merriamWebsterApiQuota.consume()
+
+        result = self.__searchMerriamWebster(query)
+
+        if self.__enEsDictionaryCache is not None:
+            self.__enEsDictionaryCache.set(query, result)
+
+        return result
+
+    def __searchMerriamWebster(self, query: str) -> EnEsDictionaryResult:
         print(f'Looking up \"{query}\"... ({utils.getNowTimeText()})')
 
         encodedQuery = urllib.parse.quote(query)
@@ -70,7 +110,7 @@ class EnEsDictionary():
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
             print(f'Exception occurred when attempting to decode Merriam Webster\'s response into JSON for \"{query}\": {e}')
             raise RuntimeError(f'Exception occurred when attempting to decode Merriam Webster\'s response into JSON for \"{query}\": {e}')
@@ -118,3 +158,18 @@ class EnEsDictionary():
             definitions = definitions,
             word = query
         )
+
+    def searchPrefix(self, prefix: str, maxResults: int = 5) -> List[EnEsDictionaryResult]:
+        # Returns up to maxResults words that start with the given prefix, in alphabetical order.
+        # This only ever searches the EnEsLocalDictionary, so without one there are never any
+        # results.
+        if not utils.isValidStr(prefix):
+            raise ValueError(f'prefix argument is malformed: \"{prefix}\"')
+        elif not utils.isValidNum(maxResults) or maxResults < 1:
+            raise ValueError(f'maxResults argument is malformed: \"{maxResults}\"')
+
+        if self.__enEsLocalDictionary is None:
+            return list()
+
+        localEntries = self.__enEsLocalDictionary.searchPrefix(prefix.strip(), maxResults)
+        return [ self.__createLocalResult(word, translations) for word, translations in localEntries ]
@@ -0,0 +1,169 @@
+import unicodedata
+from datetime import datetime, timedelta, timezone
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.enEsDictionaryResult import EnEsDictionaryResult
+    from CynanBotCommon.lruCache import LruCache
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from enEsDictionaryResult import EnEsDictionaryResult
+    from lruCache import LruCache
+
+
+class EnEsDictionaryCache():
+
+    # Caches EnEsDictionaryResults by normalized query (see normalizeQuery()), in an LruCache
+    # of maxSize entries in front of a table in the given BackingDatabase (if there is one).
+    # Merriam-Webster's entries hardly ever change, so results are kept for a long time, which
+    # leaves more of the API key's daily quota (see DailyApiQuota) for words that haven't been
+    # looked up yet.
+
+    # the separator between definitions in the definitions column
+    DEFINITION_SEPARATOR = '\n'
+
+    def __init__(
+        self,
+        backingDatabase: BackingDatabase = None,
+        maxSize: int = 256,
+        timeDelta: timedelta = timedelta(days = 30)
+    ):
+        if not utils.isValidNum(maxSize) or maxSize < 1:
+            raise ValueError(f'maxSize argument is malformed: \"{maxSize}\"')
+        elif timeDelta is None:
+            raise ValueError(f'timeDelta argument is malformed: \"{timeDelta}\"')
+
+        self.__backingDatabase = backingDatabase
+        self.__timeDelta = timeDelta
+        self.__databaseHitCount = 0
+        self.__results = LruCache(maxSize = maxSize)
+
+        if self.__backingDatabase is not None:
+            self.__initDatabaseTable()
+
+    def get(self, query: str) -> EnEsDictionaryResult:
+        # returns the cached result for the given query, or None if there isn't one (or it's expired)
+        key = self.normalizeQuery(query)
+        if not utils.isValidStr(key):
+            return None
+
+        result = self.__results[key]
+        if result is not None or self.__backingDatabase is None:
+            return result
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT word, definitions, expiresAt FROM enEsDictionaryCache
+                WHERE key = ? AND expiresAt > ?
+            ''',
+            (key, int(datetime.now(timezone.utc).timestamp()))
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+
+        if row is None:
+            return None
+
+        result = EnEsDictionaryResult(
+            definitions = row[1].split(self.DEFINITION_SEPARATOR),
+            word = row[0]
+        )
+
+        expiration = datetime.fromtimestamp(row[2], timezone.utc).replace(tzinfo = None)
+        self.__results.set(key, result, expiration)
+        self.__databaseHitCount = self.__databaseHitCount + 1
+
+        return result
+
+    def getDatabaseHitCount(self) -> int:
+        return self.__databaseHitCount
+
+    def getHitRate(self) -> float:
+        # the fraction of get() calls (0.0 through 1.0) that found a result, or 0.0 if there haven't been any
+        readCount = self.__results.getHitCount() + self.__results.getMissCount()
+
+        if readCount == 0:
+            return 0.0
+        else:
+            return (self.__results.getHitCount() + self.__databaseHitCount) / readCount
+
+    def getMemoryHitCount(self) -> int:
+        return self.__results.getHitCount()
+
+    def getMissCount(self) -> int:
+        return self.__results.getMissCount() - self.__databaseHitCount
+
+    def __initDatabaseTable(self):
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS enEsDictionaryCache (
+                    key TEXT NOT NULL PRIMARY KEY,
+                    word TEXT NOT NULL,
+                    definitions TEXT NOT NULL,
+                    expiresAt INTEGER NOT NULL
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.commit()
+
+    @classmethod
+    def normalizeQuery(cls, query: str) -> str:
+        # NFKC folds full-width letters and composes accents (so that "é" typed as "e" plus a
+        # combining accent is still "é"), then case and runs of whitespace are folded. Accents
+        # themselves are kept, since they tell apart Spanish words like "si" and "sí".
+        if not utils.isValidStr(query):
+            return None
+
+        return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+    def purgeExpired(self) -> int:
+        # deletes expired results from the database, returning how many there were
+        if self.__backingDatabase is None:
+            return 0
+
+        connection = self.__backingDatabase.getConnection()
+        cursor = connection.execute(
+            'DELETE FROM enEsDictionaryCache WHERE expiresAt <= ?',
+            (int(datetime.now(timezone.utc).timestamp()), )
+        )
+
+        purgeCount = cursor.rowcount
+        cursor.close()
+        connection.commit()
+
+        return purgeCount
+
+    def set(self, query: str, result: EnEsDictionaryResult):
+        if not utils.isValidStr(query):
+            raise ValueError(f'query argument is malformed: \"{query}\"')
+        elif result is None:
+            raise ValueError(f'result argument is malformed: \"{result}\"')
+
+        key = self.normalizeQuery(query)
+        expiration = datetime.utcnow() + self.__timeDelta
+        self.__results.set(key, result, expiration)
+
+        if self.__backingDatabase is None:
+            return
+
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                INSERT OR REPLACE INTO enEsDictionaryCache (key, word, definitions, expiresAt)
+                VALUES (?, ?, ?, ?)
+            ''',
+            (
+                key,
+                result.getWord(),
+                self.DEFINITION_SEPARATOR.join(result.getDefinitions()),
+                int(expiration.replace(tzinfo = timezone.utc).timestamp())
+            )
+        )
+
+        connection.commit()
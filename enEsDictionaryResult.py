@@ -0,0 +1,31 @@
+from typing import List
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class EnEsDictionaryResult():
+
+    def __init__(self, definitions: List[str], word: str):
+        if not utils.hasItems(definitions):
+            raise ValueError(f'definitions argument is malformed: \"{definitions}\"')
+        elif not utils.isValidStr(word):
+            raise ValueError(f'word argument is malformed: \"{word}\"')
+
+        self.__definitions = definitions
+        self.__word = word
+
+    def getDefinitions(self) -> List[str]:
+        return self.__definitions
+
+    def getWord(self) -> str:
+        return self.__word
+
+    def toStr(self, delimiter: str = ', ') -> str:
+        if delimiter is None:
+            raise ValueError(f'delimiter argument is malformed: \"{delimiter}\"')
+
+        definitionsJoin = delimiter.join(self.__definitions)
+        return f'{self.__word} — {definitionsJoin}'
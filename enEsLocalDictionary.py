@@ -0,0 +1,117 @@
+import gzip
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.enEsDictionaryCache import EnEsDictionaryCache
+except:
+    import utils
+    from enEsDictionaryCache import EnEsDictionaryCache
+
+
+class EnEsLocalDictionary():
+
+    # An in-memory English-Spanish dictionary, for answering the common words without going to
+    # Merriam-Webster at all. Words are normalized the same way that EnEsDictionaryCache
+    # normalizes queries, and kept in a sorted list, next to a list of each word's translations
+    # (joined into a single string, which takes far less memory than a list per word). Exact
+    # lookups are a binary search, and prefix lookups are a binary search for the start of the
+    # range of words that begin with the prefix.
+
+    # the separator between translations of the same word
+    TRANSLATION_SEPARATOR = '\n'
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        # entries are (word, translation) pairs, where a word may appear any number of times
+        if entries is None:
+            raise ValueError(f'entries argument is malformed: \"{entries}\"')
+
+        words: Dict[str, Tuple[str, List[str]]] = dict()
+
+        for word, translation in entries:
+            word = utils.cleanStr(word)
+            translation = utils.cleanStr(translation)
+            key = EnEsDictionaryCache.normalizeQuery(word)
+
+            if not utils.isValidStr(key) or not utils.isValidStr(translation):
+                continue
+
+            _, translations = words.setdefault(key, (word, list()))
+
+            if translation not in translations:
+                translations.append(translation)
+
+        self.__keys: List[str] = sorted(words)
+        self.__words: List[str] = [ words[key][0] for key in self.__keys ]
+        self.__translations: List[str] = [ self.TRANSLATION_SEPARATOR.join(words[key][1]) for key in self.__keys ]
+
+    @classmethod
+    def fromFile(cls, wordListFile: str, bidirectional: bool = True):
+        # Reads a UTF-8 word list (optionally gzipped) with one "word<tab>translation" pair per
+        # line, such as one exported from FreeDict's openly licensed eng-spa dictionary. Any
+        # further tab-separated columns are more translations of the same word, and empty lines
+        # and lines starting with "#" are skipped. If bidirectional is True, every translation
+        # can also be looked up, giving back the word that it translates.
+        if not utils.isValidStr(wordListFile):
+            raise ValueError(f'wordListFile argument is malformed: \"{wordListFile}\"')
+        elif bidirectional is None:
+            raise ValueError(f'bidirectional argument is malformed: \"{bidirectional}\"')
+
+        if wordListFile.endswith('.gz'):
+            file = gzip.open(wordListFile, 'rt', encoding = 'utf-8')
+        else:
+            file = open(wordListFile, 'r', encoding = 'utf-8')
+
+        entries: List[Tuple[str, str]] = list()
+
+        with file:
+            for line in file:
+                if not utils.isValidStr(line.strip()) or line.startswith('#'):
+                    continue
+
+                columns = line.rstrip('\r\n').split('\t')
+
+                for translation in columns[1:]:
+                    entries.append((columns[0], translation))
+
+                    if bidirectional:
+                        entries.append((translation, columns[0]))
+
+        return cls(entries)
+
+    def getSize(self) -> int:
+        return len(self.__keys)
+
+    def search(self, query: str) -> Tuple[str, List[str]]:
+        # Returns the given word as it's written in the word list along with its translations, or
+        # None if it's not in this dictionary.
+        key = EnEsDictionaryCache.normalizeQuery(query)
+        if not utils.isValidStr(key):
+            return None
+
+        index = bisect_left(self.__keys, key)
+
+        if index < len(self.__keys) and self.__keys[index] == key:
+            return self.__words[index], self.__translations[index].split(self.TRANSLATION_SEPARATOR)
+        else:
+            return None
+
+    def searchPrefix(self, prefix: str, maxResults: int = 5) -> List[Tuple[str, List[str]]]:
+        # Returns up to maxResults (word, translations) pairs for the words that start with the
+        # given prefix, in alphabetical order (so an exact match always comes first).
+        if not utils.isValidNum(maxResults) or maxResults < 1:
+            raise ValueError(f'maxResults argument is malformed: \"{maxResults}\"')
+
+        key = EnEsDictionaryCache.normalizeQuery(prefix)
+        if not utils.isValidStr(key):
+            return list()
+
+        results = list()
+        index = bisect_left(self.__keys, key)
+
+        while index < len(self.__keys) and len(results) < maxResults and self.__keys[index].startswith(key):
+            results.append((self.__words[index], self.__translations[index].split(self.TRANSLATION_SEPARATOR)))
+            index = index + 1
+
+        return results
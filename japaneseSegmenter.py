@@ -0,0 +1,187 @@
+import unicodedata
+from enum import Enum, auto
+from typing import List, Tuple
+
+# A small, dictionary-free heuristic for splitting a Japanese sentence into words worth looking
+# up. Japanese doesn't put spaces between words, but switches between writing systems often
+# enough that most word boundaries fall on a change of script: a run of kanji (plus the
+# hiragana that inflects it) is usually one word, a run of katakana is usually one loanword,
+# and runs of hiragana are mostly particles and grammar. The particles below are then used to
+# split the hiragana further. This will sometimes split or join words wrongly (e.g. "上がる" is
+# read as "上" followed by the particle "が"), which jisho.org's search is usually forgiving of.
+
+
+class CharacterType(Enum):
+
+    HIRAGANA = auto()
+    KANJI = auto()
+    KATAKANA = auto()
+    LATIN = auto()
+    OTHER = auto()
+
+
+# particles that end the hiragana following a kanji word
+OKURIGANA_PARTICLES: Tuple[str, ...] = ('は', 'が', 'を', 'に', 'へ', 'で', 'と', 'も', 'の', 'や')
+
+# particles that split a run of hiragana into separate words, longest first (this leaves out
+# "の", "も" and "で", which are part of words like "もの", "こども" and "なんで" too often)
+HIRAGANA_PARTICLES: Tuple[str, ...] = ('から', 'まで', 'より', 'は', 'が', 'を', 'に', 'へ', 'と', 'や')
+
+# the copula, which is dropped when it's all that follows a kanji word
+COPULAS: Tuple[str, ...] = ('でした', 'だった', 'です', 'だ')
+
+# sentence-ending particles that are dropped from the end of a word
+SENTENCE_ENDINGS: Tuple[str, ...] = ('よね', 'ね', 'よ')
+
+# copulas, particles and polite endings that are dropped from the end of a run of hiragana, as
+# long as what's left is still long enough to be a word
+HIRAGANA_ENDINGS: Tuple[str, ...] = COPULAS + ('ました', 'ます') + HIRAGANA_PARTICLES + SENTENCE_ENDINGS
+
+# runs of hiragana or katakana shorter than this are almost always grammar, not words
+KANA_MIN_LENGTH = 2
+
+
+def getCharacterType(character: str) -> CharacterType:
+    if 'ぁ' <= character <= 'ゖ':
+        return CharacterType.HIRAGANA
+    elif 'ァ' <= character <= 'ヺ' or character == 'ー':
+        return CharacterType.KATAKANA
+    elif '一' <= character <= '鿿' or '㐀' <= character <= '䶿' or character in '々〆ヶ':
+        return CharacterType.KANJI
+    elif ('a' <= character <= 'z') or ('A' <= character <= 'Z'):
+        return CharacterType.LATIN
+    else:
+        return CharacterType.OTHER
+
+def _getRuns(text: str) -> List[Tuple[CharacterType, str]]:
+    runs: List[Tuple[CharacterType, str]] = list()
+    runType: CharacterType = None
+    runStart = 0
+
+    for index, character in enumerate(text):
+        characterType = getCharacterType(character)
+
+        if characterType is not runType:
+            if runType is not None:
+                runs.append((runType, text[runStart:index]))
+
+            runType = characterType
+            runStart = index
+
+    if runType is not None:
+        runs.append((runType, text[runStart:]))
+
+    return runs
+
+def _splitHiragana(hiragana: str) -> List[str]:
+    # Splits a run of hiragana on its particles, keeping only the pieces that are long enough
+    # to be words. A particle only counts if it doesn't leave a piece too short to be a word
+    # on either side of it, so that words like "ともだち" aren't taken apart.
+    words = list()
+    wordStart = 0
+    index = 0
+
+    while index < len(hiragana):
+        particle = _startsWithAny(hiragana, index, HIRAGANA_PARTICLES)
+
+        if particle is not None and index - wordStart >= KANA_MIN_LENGTH and len(hiragana) - index - len(particle) >= KANA_MIN_LENGTH:
+            words.append(hiragana[wordStart:index])
+            index = index + len(particle)
+            wordStart = index
+        else:
+            index = index + 1
+
+    words.append(hiragana[wordStart:])
+
+    words = [ _removeEnding(word, HIRAGANA_ENDINGS, KANA_MIN_LENGTH) for word in words ]
+    return [ word for word in words if len(word) >= KANA_MIN_LENGTH ]
+
+def _splitOkurigana(hiragana: str) -> Tuple[str, str]:
+    # Splits the hiragana following a kanji word into the part that belongs to that word (its
+    # okurigana, e.g. the "べる" of "食べる") and whatever comes after it, which is assumed to
+    # start at the first particle. The "で" in "読んでいる" is an inflection, not a particle, and
+    # the "で" of a copula (e.g. "寒いですね") isn't one either, but does end the word.
+    for index in range(len(hiragana)):
+        if hiragana[index] == 'で' and index >= 1 and hiragana[index - 1] == 'ん':
+            continue
+
+        copula = _startsWithAny(hiragana, index, COPULAS)
+
+        if copula is not None and copula[0] == 'で':
+            return hiragana[:index], hiragana[index + len(copula):]
+
+        particle = _startsWithAny(hiragana, index, OKURIGANA_PARTICLES)
+
+        if particle is not None:
+            return hiragana[:index], hiragana[index + len(particle):]
+
+    return hiragana, ''
+
+def _removeEnding(word: str, endings: Tuple[str, ...], minLength: int) -> str:
+    # removes endings from the given word for as long as it has one (e.g. "すきだよ" becomes "すき")
+    removed = True
+
+    while removed:
+        removed = False
+
+        for ending in endings:
+            if word.endswith(ending) and len(word) - len(ending) >= minLength:
+                word = word[:-len(ending)]
+                removed = True
+                break
+
+    return word
+
+def _startsWithAny(text: str, index: int, prefixes: Tuple[str, ...]) -> str:
+    for prefix in prefixes:
+        if text.startswith(prefix, index):
+            return prefix
+
+    return None
+
+def segment(text: str) -> List[str]:
+    # Returns the words in the given text that are worth looking up, in order, duplicates
+    # included. Punctuation, digits and anything else that isn't kana, kanji or Latin letters
+    # separates words, and is never part of one.
+    if text is None:
+        raise ValueError(f'text argument is malformed: \"{text}\"')
+
+    # NFKC folds half-width katakana and full-width letters into their usual forms
+    runs = _getRuns(unicodedata.normalize('NFKC', text))
+    words = list()
+    index = 0
+
+    while index < len(runs):
+        runType, run = runs[index]
+        index = index + 1
+
+        if runType is CharacterType.KANJI:
+            if index < len(runs) and runs[index][0] is CharacterType.HIRAGANA:
+                okurigana, remainder = _splitOkurigana(runs[index][1])
+                index = index + 1
+                okurigana = _removeEnding(okurigana, SENTENCE_ENDINGS, 0)
+
+                if okurigana in COPULAS:
+                    okurigana = ''
+
+                words.append(run + okurigana)
+                words.extend(_splitHiragana(remainder))
+            else:
+                words.append(run)
+        elif runType is CharacterType.HIRAGANA:
+            # after a katakana or Latin word, a leading particle belongs to that word (e.g. the
+            # "は" in "ラーメンはおいしい"), but at the start of a sentence it's more likely to be
+            # the start of a word (e.g. "とても")
+            if index >= 2 and runs[index - 2][0] in (CharacterType.KATAKANA, CharacterType.LATIN):
+                particle = _startsWithAny(run, 0, HIRAGANA_PARTICLES)
+
+                if particle is not None:
+                    run = run[len(particle):]
+
+            words.extend(_splitHiragana(run))
+        elif runType is CharacterType.KATAKANA and len(run.strip('ー')) >= KANA_MIN_LENGTH:
+            words.append(run)
+        elif runType is CharacterType.LATIN and len(run) >= 2:
+            words.append(run)
+
+    return words
@@ -0,0 +1,184 @@
+import unicodedata
+from datetime import datetime, timedelta, timezone
+
+try:
+    import CynanBotCommon.kanaUtils as kanaUtils
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.jishoResult import JishoResult
+    from CynanBotCommon.lruCache import LruCache
+except:
+    import kanaUtils
+    import utils
+    from backingDatabase import BackingDatabase
+    from jishoResult import JishoResult
+    from lruCache import LruCache
+
+
+class JishoCache():
+
+    # Caches JishoResults by normalized query (see normalizeQuery()), so that "ﾀﾍﾞﾙ", "タベル" and
+    # "たべる" are all one lookup, as are "Taberu" and "ＴＡＢＥＲＵ". Results are kept in an
+    # LruCache of maxSize entries, in front of a table in the given BackingDatabase (if there
+    # is one) so that they outlive the process. Either way, each result expires timeDelta after
+    # it was looked up.
+
+    # the separator between definitions in the definitions column
+    DEFINITION_SEPARATOR = '\n'
+
+    def __init__(
+        self,
+        backingDatabase: BackingDatabase = None,
+        maxSize: int = 256,
+        timeDelta: timedelta = timedelta(days = 7)
+    ):
+        if not utils.isValidNum(maxSize) or maxSize < 1:
+            raise ValueError(f'maxSize argument is malformed: \"{maxSize}\"')
+        elif timeDelta is None:
+            raise ValueError(f'timeDelta argument is malformed: \"{timeDelta}\"')
+
+        self.__backingDatabase = backingDatabase
+        self.__timeDelta = timeDelta
+        self.__databaseHitCount = 0
+        self.__results = LruCache(maxSize = maxSize)
+
+        if self.__backingDatabase is not None:
+            self.__initDatabaseTable()
+
+    def get(self, query: str) -> JishoResult:
+        # returns the cached result for the given query, or None if there isn't one (or it's expired)
+        key = self.normalizeQuery(query)
+        if not utils.isValidStr(key):
+            return None
+
+        result = self.__results[key]
+        if result is not None or self.__backingDatabase is None:
+            return result
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT word, furigana, url, definitions, expiresAt FROM jishoCache
+                WHERE key = ? AND expiresAt > ?
+            ''',
+            (key, int(datetime.now(timezone.utc).timestamp()))
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+
+        if row is None:
+            return None
+
+        result = JishoResult(
+            definitions = row[3].split(self.DEFINITION_SEPARATOR),
+            furigana = row[1],
+            url = row[2],
+            word = row[0]
+        )
+
+        # the result keeps the expiration it had in the database
+        expiration = datetime.fromtimestamp(row[4], timezone.utc).replace(tzinfo = None)
+        self.__results.set(key, result, expiration)
+        self.__databaseHitCount = self.__databaseHitCount + 1
+
+        return result
+
+    def getDatabaseHitCount(self) -> int:
+        return self.__databaseHitCount
+
+    def getHitRate(self) -> float:
+        # the fraction of get() calls (0.0 through 1.0) that found a result, either in memory or
+        # in the database, or 0.0 if there haven't been any
+        readCount = self.__results.getHitCount() + self.__results.getMissCount()
+
+        if readCount == 0:
+            return 0.0
+        else:
+            return (self.__results.getHitCount() + self.__databaseHitCount) / readCount
+
+    def getMemoryHitCount(self) -> int:
+        return self.__results.getHitCount()
+
+    def getMissCount(self) -> int:
+        # get() calls that found no result in memory or in the database
+        return self.__results.getMissCount() - self.__databaseHitCount
+
+    def __initDatabaseTable(self):
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS jishoCache (
+                    key TEXT NOT NULL PRIMARY KEY,
+                    word TEXT NOT NULL,
+                    furigana TEXT,
+                    url TEXT NOT NULL,
+                    definitions TEXT NOT NULL,
+                    expiresAt INTEGER NOT NULL
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.commit()
+
+    @classmethod
+    def normalizeQuery(cls, query: str) -> str:
+        # NFKC turns full-width letters and digits into ASCII ones and half-width katakana into
+        # full-width ones, and then case and whitespace are folded and katakana becomes hiragana.
+        # Romaji is deliberately left as it is: plenty of English words are also valid romaji
+        # (e.g. "home" and "ほめ"), and jisho.org gives them different results.
+        if not utils.isValidStr(query):
+            return None
+
+        key = ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+        return kanaUtils.katakanaToHiragana(key)
+
+    def purgeExpired(self) -> int:
+        # deletes expired results from the database, returning how many there were
+        if self.__backingDatabase is None:
+            return 0
+
+        connection = self.__backingDatabase.getConnection()
+        cursor = connection.execute(
+            'DELETE FROM jishoCache WHERE expiresAt <= ?',
+            (int(datetime.now(timezone.utc).timestamp()), )
+        )
+
+        purgeCount = cursor.rowcount
+        cursor.close()
+        connection.commit()
+
+        return purgeCount
+
+    def set(self, query: str, result: JishoResult):
+        # Caches the given result under the query only. The result's own word isn't cached too,
+        # since searching for that word could well give a different first result.
+        if not utils.isValidStr(query):
+            raise ValueError(f'query argument is malformed: \"{query}\"')
+        elif result is None:
+            raise ValueError(f'result argument is malformed: \"{result}\"')
+
+        key = self.normalizeQuery(query)
+        expiration = datetime.utcnow() + self.__timeDelta
+        self.__results.set(key, result, expiration)
+
+        if self.__backingDatabase is None:
+            return
+
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                INSERT OR REPLACE INTO jishoCache (key, word, furigana, url, definitions, expiresAt)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''',
+            (
+                key,
+                result.getWord(),
+                result.getFurigana(),
+                result.getUrl(),
+                self.DEFINITION_SEPARATOR.join(result.getDefinitions()),
+                int(expiration.replace(tzinfo = timezone.utc).timestamp())
+            )
+        )
+
+        connection.commit()
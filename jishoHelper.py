@@ -1,89 +1,234 @@
 import locale
 import urllib
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from json.decoder import JSONDecodeError
+from typing import Any, Dict, Iterable, List
 
 import requests
-from lxml import html
+from lxml import etree, html
 from requests import ConnectionError, HTTPError, Timeout
+from requests.exceptions import ChunkedEncodingError
 from urllib3.exceptions import MaxRetryError, NewConnectionError
 
-import CynanBotCommon.utils as utils
+try:
+    import CynanBotCommon.japaneseSegmenter as japaneseSegmenter
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.jishoCache import JishoCache
+    from CynanBotCommon.jishoResult import JishoResult
+    from CynanBotCommon.jmdictDatabase import JmdictDatabase, JmdictEntry
+    from CynanBotCommon.responseSchema import (ResponseSchema,
+                                               ResponseSchemaError,
+                                               SchemaField, SchemaList)
+except:
+    import japaneseSegmenter
+    import utils
+    from jishoCache import JishoCache
+    from jishoResult import JishoResult
+    from jmdictDatabase import JmdictDatabase, JmdictEntry
+    from responseSchema import (ResponseSchema, ResponseSchemaError,
+                                SchemaField, SchemaList)
 
 
-class JishoResult():
+class JishoHelper():
+
+    # By default, searches go through Jisho's words API (https://jisho.org/api/v1/search/words),
+    # which returns a much smaller response than the search page, and only the first word in
+    # it is decoded. If the API can't be reached or returns something unexpected, the search
+    # falls back to scraping the HTML search page, the way this class always used to. The
+    # search page is read as a stream, and the connection is dropped as soon as enough of the
+    # page has been read (see parseHtmlStream()), unless streamHtml is False. When given a
+    # JmdictDatabase, searches are answered from it first, and jisho.org is only used for
+    # words that it doesn't have. When given a JishoCache, whatever does come from jisho.org is
+    # cached there, so that the same query (see JishoCache.normalizeQuery()) isn't looked up
+    # again until it expires.
 
     def __init__(
         self,
-        definitions: List[str],
-        furigana: str,
-        url: str,
-        word: str
+        definitionsMaxSize: int = 3,
+        jishoCache: JishoCache = None,
+        jmdictDatabase: JmdictDatabase = None,
+        streamHtml: bool = True,
+        useApi: bool = True,
+        maxConcurrentRequests: int = 4
     ):
-        if not utils.hasItems(definitions):
-            raise ValueError(f'definitions argument is malformed: \"{definitions}\"')
-        elif not utils.isValidUrl(url):
-            raise ValueError(f'url argument is malformed: \"{url}\"')
-        elif not utils.isValidStr(word):
-            raise ValueError(f'word argument is malformed: \"{word}\"')
+        if not utils.isValidNum(definitionsMaxSize) or definitionsMaxSize < 1:
+            raise ValueError(f'definitionsMaxSize argument is malformed: \"{definitionsMaxSize}\"')
+        elif not utils.isValidNum(maxConcurrentRequests) or maxConcurrentRequests < 1:
+            raise ValueError(f'maxConcurrentRequests argument is malformed: \"{maxConcurrentRequests}\"')
+        elif streamHtml is None:
+            raise ValueError(f'streamHtml argument is malformed: \"{streamHtml}\"')
+        elif useApi is None:
+            raise ValueError(f'useApi argument is malformed: \"{useApi}\"')
 
-        self.__definitions = definitions
-        self.__furigana = furigana
-        self.__url = url
-        self.__word = word
+        self.__definitionsMaxSize = definitionsMaxSize
+        self.__jishoCache = jishoCache
+        self.__jmdictDatabase = jmdictDatabase
+        self.__streamHtml = streamHtml
+        self.__useApi = useApi
 
-    def getDefinitions(self) -> List[str]:
-        return self.__definitions
+        # used to look up the words of a sentence at the same time, see searchSentence()
+        self.__executor = ThreadPoolExecutor(max_workers = maxConcurrentRequests)
 
-    def getFurigana(self) -> str:
-        return self.__furigana
+        self.__searchResponseSchema = self.__createSearchResponseSchema()
+        self.__wordSchema = self.__createWordSchema()
 
-    def getUrl(self) -> str:
-        return self.__url
+    def __addDefinition(self, definitions: List[str], definition: str):
+        number = locale.format_string("%d", len(definitions) + 1, grouping = True)
+        definitions.append(f'#{number} {definition}')
 
-    def getWord(self) -> str:
-        return self.__word
+    def __createJmdictResult(self, entry: JmdictEntry) -> JishoResult:
+        definitions = list()
 
-    def hasFurigana(self) -> bool:
-        return utils.isValidStr(self.__furigana)
+        for definition in entry.getDefinitions()[:self.__definitionsMaxSize]:
+            self.__addDefinition(definitions, definition)
 
-    def toStr(self, definitionDelimiter: str = ' ') -> str:
-        if definitionDelimiter is None:
-            raise ValueError(f'definitionDelimiter argument is malformed: \"{definitionDelimiter}\"')
+        furigana = None
+        if entry.hasKanji():
+            furigana = entry.getReading()
 
-        furigana = ''
-        if self.hasFurigana():
-            furigana = f'({self.__furigana}) '
+        return JishoResult(
+            definitions = definitions,
+            furigana = furigana,
+            url = self.__getSearchUrl(entry.getWord()),
+            word = entry.getWord()
+        )
 
-        definitions = definitionDelimiter.join(self.__definitions)
-        return f'{furigana}{self.__word} — {definitions}'
+    def __createSearchResponseSchema(self) -> ResponseSchema:
+        # Only the envelope is decoded here, the first word is decoded on its own by the word
+        # schema below, so that none of the other (up to 19) words ever have to be.
+        return ResponseSchema(
+            name = 'JishoSearchResponse',
+            fields = [
+                SchemaField('meta', ResponseSchema(
+                    name = 'JishoMeta',
+                    fields = [
+                        SchemaField('status', int)
+                    ]
+                )),
+                SchemaField('data', SchemaList(Any))
+            ]
+        )
 
+    def __createWordSchema(self) -> ResponseSchema:
+        # This schema covers only the fields that we read from each of the API's results. The API
+        # isn't formally documented, but it's the same data that the search page is built from.
+        return ResponseSchema(
+            name = 'JishoWord',
+            fields = [
+                SchemaField('japanese', SchemaList(ResponseSchema(
+                    name = 'JishoJapanese',
+                    fields = [
+                        SchemaField('word', str, optional = True),
+                        SchemaField('reading', str, optional = True)
+                    ]
+                ))),
+                SchemaField('senses', SchemaList(ResponseSchema(
+                    name = 'JishoSense',
+                    fields = [
+                        SchemaField('english_definitions', SchemaList(str))
+                    ]
+                )))
+            ]
+        )
 
-class JishoHelper():
+    def __fetch(self, query: str, requestUrl: str) -> bytes:
+        rawResponse = None
+        try:
+            rawResponse = requests.get(url = requestUrl, timeout = utils.getDefaultTimeout())
+        except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
+            print(f'Exception occurred when attempting to search Jisho for \"{query}\": {e}')
+            raise RuntimeError(f'Exception occurred when attempting to search Jisho for \"{query}\": {e}')
 
-    def __init__(self, definitionsMaxSize: int = 3):
-        if not utils.isValidNum(definitionsMaxSize) or definitionsMaxSize < 1:
-            raise ValueError(f'definitionsMaxSize argument is malformed: \"{definitionsMaxSize}\"')
+        return rawResponse.content
 
-        self.__definitionsMaxSize = definitionsMaxSize
+    def __getApiUrl(self, query: str) -> str:
+        encodedQuery = urllib.parse.quote(query)
+        return f'https://jisho.org/api/v1/search/words?keyword={encodedQuery}'
 
-    def search(self, query: str) -> JishoResult:
+    def __getSearchUrl(self, query: str) -> str:
+        encodedQuery = urllib.parse.quote(query)
+        return f'https://jisho.org/search/{encodedQuery}'
+
+    def parseApiResponse(self, query: str, content: bytes) -> JishoResult:
+        # Turns a response from Jisho's words API into a JishoResult. Network or format problems
+        # raise RuntimeError (which search() takes as a cue to fall back to the search page),
+        # while a search with no usable results raises ValueError. This is public so that
+        # benchmarks.py can compare it against parseHtmlResponse().
         if not utils.isValidStr(query):
             raise ValueError(f'query argument is malformed: \"{query}\"')
+        elif content is None:
+            raise ValueError(f'content argument is malformed: \"{content}\"')
 
-        query = query.strip()
-        print(f'Looking up \"{query}\"... ({utils.getNowTimeText()})')
+        searchResponse = None
+        try:
+            searchResponse = self.__searchResponseSchema.decode(utils.loadJson(content))
+        except (JSONDecodeError, ResponseSchemaError) as e:
+            print(f'Exception occurred when attempting to decode Jisho\'s API response for \"{query}\": {e}')
+            raise RuntimeError(f'Exception occurred when attempting to decode Jisho\'s API response for \"{query}\": {e}')
+
+        if searchResponse.meta.status != 200:
+            print(f'Jisho\'s API returned a bad status ({searchResponse.meta.status}) for \"{query}\"')
+            raise RuntimeError(f'Jisho\'s API returned a bad status ({searchResponse.meta.status}) for \"{query}\"')
+        elif not utils.hasItems(searchResponse.data):
+            print(f'Jisho\'s API returned no results for \"{query}\"')
+            raise ValueError(f'Jisho\'s API returned no results for \"{query}\"')
+
+        word = None
+        try:
+            word = self.__wordSchema.decode(searchResponse.data[0])
+        except ResponseSchemaError as e:
+            print(f'Exception occurred when attempting to decode Jisho\'s API response for \"{query}\": {e}')
+            raise RuntimeError(f'Exception occurred when attempting to decode Jisho\'s API response for \"{query}\": {e}')
+
+        if not utils.hasItems(word.japanese):
+            print(f'Exception occurred when attempting to find the word in Jisho\'s API response for \"{query}\"')
+            raise ValueError(f'Exception occurred when attempting to find the word in Jisho\'s API response for \"{query}\"')
+
+        # kana-only words have a reading but no word
+        japanese = word.japanese[0]
+        text = utils.cleanStr(japanese.word or japanese.reading or '')
+        if not utils.isValidStr(text):
+            print(f'Exception occurred when checking that Jisho\'s word is valid in query for \"{query}\"')
+            raise ValueError(f'Exception occurred when checking that Jisho\'s word is valid in query for \"{query}\"')
 
-        encodedQuery = urllib.parse.quote(query)
-        requestUrl = f'https://jisho.org/search/{encodedQuery}'
+        definitions = list()
 
-        rawResponse = None
-        try:
-            rawResponse = requests.get(url = requestUrl, timeout = utils.getDefaultTimeout())
-        except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
-            print(f'Exception occurred when attempting to search Jisho for \"{query}\": {e}')
-            raise RuntimeError(f'Exception occurred when attempting to search Jisho for \"{query}\": {e}')
+        for sense in word.senses:
+            # the search page shows each sense's definitions joined together like this
+            definition = utils.cleanStr('; '.join(sense.english_definitions))
+            if not utils.isValidStr(definition):
+                continue
+
+            self.__addDefinition(definitions, definition)
 
-        htmlTree = html.fromstring(rawResponse.content)
+            if len(definitions) >= self.__definitionsMaxSize:
+                # keep from adding tons of definitions
+                break
+
+        if not utils.hasItems(definitions):
+            print(f'Unable to find any viable definitions for \"{query}\"')
+            raise ValueError(f'Unable to find any viable definitions for \"{query}\"')
+
+        furigana = None
+        if utils.isValidStr(japanese.word) and utils.isValidStr(japanese.reading):
+            furigana = utils.cleanStr(japanese.reading)
+
+        return JishoResult(
+            definitions = definitions,
+            furigana = furigana,
+            url = self.__getSearchUrl(query),
+            word = text
+        )
+
+    def parseHtmlResponse(self, query: str, content: bytes) -> JishoResult:
+        # Turns Jisho's HTML search page into a JishoResult. This is public so that
+        # benchmarks.py can compare it against parseApiResponse().
+        if not utils.isValidStr(query):
+            raise ValueError(f'query argument is malformed: \"{query}\"')
+        elif content is None:
+            raise ValueError(f'content argument is malformed: \"{content}\"')
+
+        htmlTree = html.fromstring(content)
         if htmlTree is None:
             print(f'Exception occurred when attempting to decode Jisho\'s response for \"{query}\" into HTML tree')
             raise RuntimeError(f'Exception occurred when attempting to decode Jisho\'s response for \"{query}\" into HTML tree')
@@ -119,8 +264,7 @@ class JishoHelper():
             if not utils.isValidStr(definition):
                 continue
 
-            number = locale.format_string("%d", len(definitions) + 1, grouping = True)
-            definitions.append(f'#{number} {definition}')
+            self.__addDefinition(definitions, definition)
 
             if len(definitions) >= self.__definitionsMaxSize:
                 # keep from adding tons of definitions
@@ -138,6 +282,209 @@ class JishoHelper():
         return JishoResult(
             definitions = definitions,
             furigana = furigana,
-            url = requestUrl,
+            url = self.__getSearchUrl(query),
             word = word
         )
+
+    def parseHtmlStream(self, query: str, chunks: Iterable[bytes], encoding: str = 'utf-8') -> JishoResult:
+        # Does the same as parseHtmlResponse(), but incrementally, from chunks of the search page
+        # (e.g. a streamed response's iter_content()). It stops pulling chunks as soon as it has
+        # the first word, that word's furigana, and definitionsMaxSize definitions, and throws
+        # away every element it's finished with, so most of the page is never read or kept.
+        if not utils.isValidStr(query):
+            raise ValueError(f'query argument is malformed: \"{query}\"')
+        elif chunks is None:
+            raise ValueError(f'chunks argument is malformed: \"{chunks}\"')
+        elif not utils.isValidStr(encoding):
+            raise ValueError(f'encoding argument is malformed: \"{encoding}\"')
+
+        parser = etree.HTMLPullParser(events = ('start', 'end'), encoding = encoding)
+        captureClasses = { 'concept_light-representation', 'furigana', 'meaning-meaning' }
+        captureDepth = 0
+        hasRepresentation = False
+        word = None
+        furigana = None
+        definitions = list()
+
+        for chunk in chunks:
+            parser.feed(chunk)
+
+            for event, element in parser.read_events():
+                classes = set(element.get('class', '').split())
+
+                if event == 'start':
+                    if not classes.isdisjoint(captureClasses):
+                        captureDepth = captureDepth + 1
+
+                    continue
+
+                if 'meaning-meaning' in classes and len(definitions) < self.__definitionsMaxSize:
+                    breakUnitElements = element.xpath('.//*[contains(concat(" ", normalize-space(@class), " "), " break-unit ")]')
+                    definition = utils.cleanStr(''.join(element.itertext()))
+
+                    if not utils.hasItems(breakUnitElements) and utils.isValidStr(definition):
+                        self.__addDefinition(definitions, definition)
+                elif 'furigana' in classes and not hasRepresentation and furigana is None:
+                    furigana = utils.cleanStr(''.join(element.itertext()))
+                elif 'concept_light-representation' in classes and not hasRepresentation:
+                    hasRepresentation = True
+                    textElements = element.xpath('.//*[contains(concat(" ", normalize-space(@class), " "), " text ")]')
+
+                    if len(textElements) == 1:
+                        word = utils.cleanStr(''.join(textElements[0].itertext()))
+
+                if not classes.isdisjoint(captureClasses):
+                    captureDepth = captureDepth - 1
+
+                # elements that aren't inside of one we're still reading are no longer needed
+                if captureDepth == 0:
+                    element.clear()
+
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+
+            if hasRepresentation and len(definitions) >= self.__definitionsMaxSize:
+                break
+
+        if not hasRepresentation:
+            print(f'Exception occurred when attempting to find parent elements in Jisho\'s HTML stream in query for \"{query}\"')
+            raise ValueError(f'Exception occurred when attempting to find parent elements in Jisho\'s HTML stream in query for \"{query}\"')
+        elif not utils.isValidStr(word):
+            print(f'Exception occurred when checking that Jisho\'s word is valid in query for \"{query}\"')
+            raise ValueError(f'Exception occurred when checking that Jisho\'s word is valid in query for \"{query}\"')
+        elif not utils.hasItems(definitions):
+            print(f'Unable to find any viable definitions for \"{query}\"')
+            raise ValueError(f'Unable to find any viable definitions for \"{query}\"')
+
+        return JishoResult(
+            definitions = definitions,
+            furigana = furigana,
+            url = self.__getSearchUrl(query),
+            word = word
+        )
+
+    def search(self, query: str) -> JishoResult:
+        if not utils.isValidStr(query):
+            raise ValueError(f'query argument is malformed: \"{query}\"')
+
+        query = query.strip()
+
+        result = self.__searchLocally(query)
+        if result is not None:
+            return result
+
+        result = self.__searchJisho(query)
+
+        if self.__jishoCache is not None:
+            self.__jishoCache.set(query, result)
+
+        return result
+
+    def __searchJisho(self, query: str) -> JishoResult:
+        print(f'Looking up \"{query}\"... ({utils.getNowTimeText()})')
+
+        if self.__useApi:
+            try:
+                return self.parseApiResponse(query, self.__fetch(query, self.__getApiUrl(query)))
+            except RuntimeError as e:
+                print(f'Falling back to Jisho\'s search page for \"{query}\": {e}')
+
+        if not self.__streamHtml:
+            return self.parseHtmlResponse(query, self.__fetch(query, self.__getSearchUrl(query)))
+
+        rawResponse = None
+        try:
+            rawResponse = requests.get(url = self.__getSearchUrl(query), stream = True, timeout = utils.getDefaultTimeout())
+        except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
+            print(f'Exception occurred when attempting to search Jisho for \"{query}\": {e}')
+            raise RuntimeError(f'Exception occurred when attempting to search Jisho for \"{query}\": {e}')
+
+        try:
+            return self.parseHtmlStream(query, rawResponse.iter_content(chunk_size = 8192))
+        except (ChunkedEncodingError, ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
+            print(f'Exception occurred when attempting to read Jisho\'s search page for \"{query}\": {e}')
+            raise RuntimeError(f'Exception occurred when attempting to read Jisho\'s search page for \"{query}\": {e}')
+        finally:
+            # this drops the connection if the page wasn't read all the way through
+            rawResponse.close()
+
+    def __searchLocally(self, query: str) -> JishoResult:
+        # returns the query's result from the JmdictDatabase or the JishoCache, or None if neither has it
+        if self.__jmdictDatabase is not None:
+            entry = self.__jmdictDatabase.getEntry(query)
+
+            if entry is not None:
+                return self.__createJmdictResult(entry)
+
+        if self.__jishoCache is not None:
+            return self.__jishoCache.get(query)
+
+        return None
+
+    def searchPrefix(self, prefix: str, maxResults: int = 5) -> List[JishoResult]:
+        # Returns up to maxResults words that start with the given prefix (in kanji, kana or
+        # romaji), most common first. This only ever searches the JmdictDatabase, so without one
+        # there are never any results.
+        if not utils.isValidStr(prefix):
+            raise ValueError(f'prefix argument is malformed: \"{prefix}\"')
+        elif not utils.isValidNum(maxResults) or maxResults < 1:
+            raise ValueError(f'maxResults argument is malformed: \"{maxResults}\"')
+
+        if self.__jmdictDatabase is None:
+            return list()
+
+        entries = self.__jmdictDatabase.searchPrefix(prefix.strip(), maxResults)
+        return [ self.__createJmdictResult(entry) for entry in entries ]
+
+    def searchSentence(self, sentence: str, maxWords: int = 8) -> List[JishoResult]:
+        # Splits the given sentence into words (see japaneseSegmenter.py) and returns a result for
+        # each of the first maxWords distinct ones, in the order that they appear in. Words that
+        # can't be found are left out, so this may return fewer results than there are words.
+        # Words that aren't in the JmdictDatabase or the JishoCache are all looked up on
+        # jisho.org at the same time (up to maxConcurrentRequests of them), so a sentence takes
+        # about as long as its slowest word, rather than as long as all of its words together.
+        # The JmdictDatabase and JishoCache are only ever read and written from this thread.
+        if not utils.isValidStr(sentence):
+            raise ValueError(f'sentence argument is malformed: \"{sentence}\"')
+        elif not utils.isValidNum(maxWords) or maxWords < 1:
+            raise ValueError(f'maxWords argument is malformed: \"{maxWords}\"')
+
+        # words that are spelled differently but normalize the same (e.g. "タベル" and "たべる") are
+        # only looked up once
+        words: Dict[str, str] = dict()
+
+        for word in japaneseSegmenter.segment(sentence):
+            words.setdefault(JishoCache.normalizeQuery(word), word)
+
+            if len(words) >= maxWords:
+                break
+
+        results: Dict[str, JishoResult] = dict()
+        futures = dict()
+
+        for word in words.values():
+            result = self.__searchLocally(word)
+
+            if result is None:
+                futures[word] = self.__executor.submit(self.__searchJisho, word)
+            else:
+                results[word] = result
+
+        for word, future in futures.items():
+            try:
+                results[word] = future.result()
+            except (RuntimeError, ValueError) as e:
+                print(f'Unable to find \"{word}\" from sentence \"{sentence}\": {e}')
+                continue
+
+            if self.__jishoCache is not None:
+                self.__jishoCache.set(word, results[word])
+
+        # different words can still lead to the same result (e.g. "食べる" and "たべる")
+        sentenceResults: Dict[str, JishoResult] = dict()
+
+        for word in words.values():
+            if word in results:
+                sentenceResults.setdefault(results[word].getWord(), results[word])
+
+        return list(sentenceResults.values())
@@ -0,0 +1,277 @@
+from typing import List
+
+try:
+    import CynanBotCommon.kanaUtils as kanaUtils
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+except:
+    import kanaUtils
+    import utils
+    from backingDatabase import BackingDatabase
+
+
+class JmdictEntry():
+
+    def __init__(
+        self,
+        definitions: List[str],
+        entryId: int,
+        priority: int,
+        readings: List[str],
+        words: List[str]
+    ):
+        if not utils.hasItems(definitions):
+            raise ValueError(f'definitions argument is malformed: \"{definitions}\"')
+        elif not utils.isValidNum(entryId):
+            raise ValueError(f'entryId argument is malformed: \"{entryId}\"')
+        elif not utils.isValidNum(priority):
+            raise ValueError(f'priority argument is malformed: \"{priority}\"')
+        elif not utils.hasItems(readings):
+            raise ValueError(f'readings argument is malformed: \"{readings}\"')
+        elif words is None:
+            raise ValueError(f'words argument is malformed: \"{words}\"')
+
+        self.__definitions = definitions
+        self.__entryId = entryId
+        self.__priority = priority
+        self.__readings = readings
+        self.__words = words
+
+    def getDefinitions(self) -> List[str]:
+        # one definition per sense, with each sense's glosses joined by "; "
+        return self.__definitions
+
+    def getEntryId(self) -> int:
+        return self.__entryId
+
+    def getPriority(self) -> int:
+        # lower is more common, see JmdictDatabase.getPriority()
+        return self.__priority
+
+    def getReading(self) -> str:
+        return self.__readings[0]
+
+    def getReadings(self) -> List[str]:
+        return self.__readings
+
+    def getWord(self) -> str:
+        # the first kanji form, or the first reading for words that are only ever written in kana
+        if utils.hasItems(self.__words):
+            return self.__words[0]
+        else:
+            return self.__readings[0]
+
+    def getWords(self) -> List[str]:
+        return self.__words
+
+    def hasKanji(self) -> bool:
+        return utils.hasItems(self.__words)
+
+
+class JmdictDatabase():
+
+    # A local, indexed copy of JMdict (https://www.edrdg.org/jmdict/j_jmdict.html), so that
+    # Japanese words can be looked up without going to jisho.org. Every entry is keyed by each
+    # of its kanji forms, each of its readings and the romaji of each reading, all normalized
+    # the same way that queries are (see normalizeKey()). Lookups are primary key reads on the
+    # keys table: a single seek for an exact match, or a range scan for a prefix. Romaji only
+    # matches exactly when asked for (see getEntry()), since plenty of English words are also
+    # valid romaji (e.g. "home" and "same"). See jmdictIngest.py for how this database gets
+    # populated.
+
+    # the separator between senses in the definitions column, and between forms in the others
+    SENSE_SEPARATOR = '\n'
+    FORM_SEPARATOR = '\t'
+
+    def __init__(self, backingDatabase: BackingDatabase):
+        if backingDatabase is None:
+            raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
+
+        self.__backingDatabase = backingDatabase
+        self.__initDatabaseTables()
+
+    def addEntries(self, entries: List[JmdictEntry]):
+        if entries is None:
+            raise ValueError(f'entries argument is malformed: \"{entries}\"')
+
+        entryRows = list()
+        keyRows = set()
+
+        for entry in entries:
+            entryId = entry.getEntryId()
+
+            entryRows.append((
+                entryId,
+                self.FORM_SEPARATOR.join(entry.getWords()),
+                self.FORM_SEPARATOR.join(entry.getReadings()),
+                self.SENSE_SEPARATOR.join(entry.getDefinitions()),
+                entry.getPriority()
+            ))
+
+            keys = entry.getWords() + entry.getReadings() + [ kanaUtils.toRomaji(reading) for reading in entry.getReadings() ]
+
+            for key in keys:
+                key = self.normalizeKey(key)
+
+                if utils.isValidStr(key):
+                    keyRows.add((key, entryId, entry.getPriority()))
+
+        connection = self.__backingDatabase.getConnection()
+
+        connection.executemany(
+            '''
+                INSERT OR REPLACE INTO jmdictEntries (entryId, words, readings, definitions, priority)
+                VALUES (?, ?, ?, ?, ?)
+            ''',
+            entryRows
+        )
+
+        connection.executemany(
+            '''
+                INSERT OR REPLACE INTO jmdictKeys (key, entryId, priority)
+                VALUES (?, ?, ?)
+            ''',
+            keyRows
+        )
+
+        connection.commit()
+
+    def __createEntry(self, row) -> JmdictEntry:
+        # row is (entryId, words, readings, definitions, priority)
+        return JmdictEntry(
+            definitions = row[3].split(self.SENSE_SEPARATOR),
+            entryId = row[0],
+            priority = row[4],
+            readings = row[2].split(self.FORM_SEPARATOR),
+            words = row[1].split(self.FORM_SEPARATOR) if utils.isValidStr(row[1]) else list()
+        )
+
+    def getEntry(self, query: str, includeRomaji: bool = False) -> JmdictEntry:
+        # Returns the most common entry with a kanji form or reading that exactly matches the
+        # given query, or None if there isn't one. A query that's written in Latin letters is
+        # only looked up (as the romaji of a reading) if includeRomaji is True.
+        if includeRomaji is None:
+            raise ValueError(f'includeRomaji argument is malformed: \"{includeRomaji}\"')
+
+        key = self.normalizeKey(query)
+        if not utils.isValidStr(key):
+            return None
+        elif not includeRomaji and kanaUtils.isRomaji(query.strip()):
+            return None
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT jmdictEntries.entryId, words, readings, definitions, jmdictEntries.priority FROM jmdictKeys
+                INNER JOIN jmdictEntries ON jmdictEntries.entryId = jmdictKeys.entryId
+                WHERE key = ?
+                ORDER BY jmdictKeys.priority, jmdictKeys.entryId
+                LIMIT 1
+            ''',
+            (key, )
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+
+        if row is None:
+            return None
+        else:
+            return self.__createEntry(row)
+
+    @classmethod
+    def getPriority(cls, priorityTags: List[str]) -> int:
+        # Turns JMdict's ke_pri/re_pri tags into a single number, where lower is more common. The
+        # "nfXX" tags rank the 24,000 most frequent words in sets of 500, anything else marked
+        # as common comes after those, and words with no tags at all come last.
+        if not utils.hasItems(priorityTags):
+            return 100
+
+        priority = 49
+
+        for priorityTag in priorityTags:
+            if priorityTag.startswith('nf') and priorityTag[2:].isdigit():
+                priority = min(priority, int(priorityTag[2:]))
+
+        return priority
+
+    def getSize(self) -> int:
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute('SELECT COUNT(*) FROM jmdictEntries')
+
+        size = cursor.fetchone()[0]
+        cursor.close()
+        return size
+
+    def __initDatabaseTables(self):
+        connection = self.__backingDatabase.getConnection()
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS jmdictEntries (
+                    entryId INTEGER NOT NULL PRIMARY KEY,
+                    words TEXT NOT NULL,
+                    readings TEXT NOT NULL,
+                    definitions TEXT NOT NULL,
+                    priority INTEGER NOT NULL
+                )
+            '''
+        )
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS jmdictKeys (
+                    key TEXT NOT NULL,
+                    entryId INTEGER NOT NULL,
+                    priority INTEGER NOT NULL,
+                    PRIMARY KEY (key, entryId)
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.commit()
+
+    @classmethod
+    def normalizeKey(cls, text: str) -> str:
+        # Romaji is lowercased, and spaces, hyphens and apostrophes are dropped from it. Anything
+        # else has its katakana turned into hiragana, so that a word can be found no matter
+        # which of the two kana it's written in.
+        if not utils.isValidStr(text):
+            return None
+
+        text = text.strip()
+
+        if kanaUtils.isRomaji(text):
+            return ''.join(character for character in text.lower() if character.isalpha())
+        else:
+            return kanaUtils.katakanaToHiragana(text)
+
+    def searchPrefix(self, prefix: str, maxResults: int = 5) -> List[JmdictEntry]:
+        # Returns up to maxResults entries with a kanji form, reading or romaji reading that
+        # starts with the given prefix, most common (and then shortest) first.
+        if not utils.isValidNum(maxResults) or maxResults < 1:
+            raise ValueError(f'maxResults argument is malformed: \"{maxResults}\"')
+
+        key = self.normalizeKey(prefix)
+        if not utils.isValidStr(key):
+            return list()
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT jmdictEntries.entryId, words, readings, definitions, jmdictEntries.priority FROM (
+                    SELECT entryId, MIN(priority) AS keyPriority, MIN(LENGTH(key)) AS keyLength FROM jmdictKeys
+                    WHERE key >= ? AND key < ?
+                    GROUP BY entryId
+                    ORDER BY keyPriority, keyLength, entryId
+                    LIMIT ?
+                ) AS matches
+                INNER JOIN jmdictEntries ON jmdictEntries.entryId = matches.entryId
+                ORDER BY keyPriority, keyLength, matches.entryId
+            ''',
+            (key, f'{key}\U0010FFFF', maxResults)
+        )
+
+        entries = [ self.__createEntry(row) for row in cursor.fetchall() ]
+        cursor.close()
+        return entries
@@ -0,0 +1,106 @@
+import gzip
+import sys
+from typing import List
+
+from lxml import etree
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.jmdictDatabase import JmdictDatabase, JmdictEntry
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from jmdictDatabase import JmdictDatabase, JmdictEntry
+
+
+# This file is meant to be run by hand, separately from the others in this repository. It loads
+# JMdict (either JMdict_e or the full JMdict, optionally still gzipped, from
+# https://www.edrdg.org/wiki/index.php/JMdict-EDICT_Dictionary_Project) into a JmdictDatabase, so
+# that JishoHelper can answer most searches without going to jisho.org:
+#
+# python jmdictIngest.py <jmdictFile> [<databaseFile>]
+#
+# The file is read one entry at a time, so the whole dictionary is never held in memory.
+
+# how many entries to collect before writing them to the database
+BATCH_SIZE = 5000
+
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+def createEntry(entryElement) -> JmdictEntry:
+    words = [ element.text for element in entryElement.iterfind('k_ele/keb') if utils.isValidStr(element.text) ]
+    readings = [ element.text for element in entryElement.iterfind('r_ele/reb') if utils.isValidStr(element.text) ]
+    priorityTags = [ element.text for element in entryElement.iterfind('k_ele/ke_pri') ] + [ element.text for element in entryElement.iterfind('r_ele/re_pri') ]
+    definitions = list()
+
+    for senseElement in entryElement.iterfind('sense'):
+        # the full JMdict has glosses in several languages, and English ones have no language
+        glosses = [ element.text for element in senseElement.iterfind('gloss') if element.get(XML_LANG, 'eng') == 'eng' and utils.isValidStr(element.text) ]
+
+        if utils.hasItems(glosses):
+            definitions.append(utils.cleanStr('; '.join(glosses)))
+
+    if not utils.hasItems(readings) or not utils.hasItems(definitions):
+        return None
+
+    return JmdictEntry(
+        definitions = definitions,
+        entryId = int(entryElement.findtext('ent_seq')),
+        priority = JmdictDatabase.getPriority(priorityTags),
+        readings = readings,
+        words = words
+    )
+
+def ingest(jmdictFile: str, jmdictDatabase: JmdictDatabase):
+    if jmdictFile.endswith('.gz'):
+        file = gzip.open(jmdictFile, 'rb')
+    else:
+        file = open(jmdictFile, 'rb')
+
+    entries: List[JmdictEntry] = list()
+    entryCount = 0
+
+    with file:
+        # JMdict's DTD declares entities (e.g. "&n;") for its part of speech tags, which lxml
+        # expands from the file's internal DTD subset
+        for _, entryElement in etree.iterparse(file, tag = 'entry', huge_tree = True):
+            entry = createEntry(entryElement)
+
+            # entries are independent of each other, so each one can be thrown away once read
+            entryElement.clear()
+            while entryElement.getprevious() is not None:
+                del entryElement.getparent()[0]
+
+            if entry is None:
+                continue
+
+            entries.append(entry)
+
+            if len(entries) >= BATCH_SIZE:
+                jmdictDatabase.addEntries(entries)
+                entryCount = entryCount + len(entries)
+                entries.clear()
+                print(f'Ingested {entryCount:,} JMdict entries...')
+
+    jmdictDatabase.addEntries(entries)
+    entryCount = entryCount + len(entries)
+    print(f'Ingested {entryCount:,} JMdict entries')
+
+def main():
+    args = sys.argv[1:]
+
+    if len(args) < 1:
+        print('python jmdictIngest.py <jmdictFile> [<databaseFile>]')
+        sys.exit(1)
+
+    if len(args) >= 2:
+        backingDatabase = BackingDatabase(args[1])
+    else:
+        backingDatabase = BackingDatabase()
+
+    ingest(args[0], JmdictDatabase(backingDatabase))
+
+
+if __name__ == '__main__':
+    main()
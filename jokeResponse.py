@@ -0,0 +1,27 @@
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class JokeResponse():
+
+    def __init__(self, text: str, category: str = None, jokeId: int = None):
+        if not utils.isValidStr(text):
+            raise ValueError(f'text argument is malformed: \"{text}\"')
+
+        self.__text = text
+        self.__category = category
+        self.__jokeId = jokeId
+
+    def getCategory(self) -> str:
+        return self.__category
+
+    def getJokeId(self) -> int:
+        return self.__jokeId
+
+    def getText(self):
+        return self.__text
+
+    def toStr(self):
+        return f'{self.__text} 🥁'
@@ -0,0 +1,172 @@
+import random
+from typing import Dict, List
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.jokeResponse import JokeResponse
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from jokeResponse import JokeResponse
+
+
+class JokesDatabase():
+
+    # A local store of jokes that have already passed JokesRepository's checks, so that jokes
+    # can be told without going to JokeAPI. Within each category, jokes are numbered 0, 1, 2...
+    # in the order they were added, so a random joke is a random number below the category's
+    # size followed by a single primary key read, no matter how many jokes there are. See
+    # jokesIngest.py for how this database gets populated.
+
+    def __init__(self, backingDatabase: BackingDatabase):
+        if backingDatabase is None:
+            raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
+
+        self.__backingDatabase = backingDatabase
+
+        # lowercased category -> number of jokes in it, read from the database on first use
+        self.__categorySizes: Dict[str, int] = None
+
+        self.__initDatabaseTable()
+
+    def addJokes(self, jokes: List[JokeResponse]) -> int:
+        # Adds the given jokes, which must all have a category and an ID, and returns how many of
+        # them were new. Jokes that are already here have their text updated.
+        if jokes is None:
+            raise ValueError(f'jokes argument is malformed: \"{jokes}\"')
+
+        categorySizes = self.__getCategorySizes()
+        connection = self.__backingDatabase.getConnection()
+
+        cursor = connection.cursor()
+        cursor.execute('SELECT jokeId FROM jokes')
+        jokeIds = { row[0] for row in cursor.fetchall() }
+        cursor.close()
+
+        newRows = list()
+        updatedRows = list()
+
+        for joke in jokes:
+            if not utils.isValidStr(joke.getCategory()):
+                raise ValueError(f'joke has no category: \"{joke.getText()}\"')
+            elif not utils.isValidNum(joke.getJokeId()):
+                raise ValueError(f'joke has no ID: \"{joke.getText()}\"')
+
+            if joke.getJokeId() in jokeIds:
+                updatedRows.append((joke.getText(), joke.getJokeId()))
+                continue
+
+            category = joke.getCategory().lower()
+            categoryIndex = categorySizes.get(category, 0)
+            categorySizes[category] = categoryIndex + 1
+            jokeIds.add(joke.getJokeId())
+            newRows.append((joke.getJokeId(), joke.getCategory(), categoryIndex, joke.getText()))
+
+        connection.executemany(
+            '''
+                INSERT INTO jokes (jokeId, category, categoryIndex, text)
+                VALUES (?, ?, ?, ?)
+            ''',
+            newRows
+        )
+
+        connection.executemany('UPDATE jokes SET text = ? WHERE jokeId = ?', updatedRows)
+        connection.commit()
+
+        return len(newRows)
+
+    def __createJoke(self, row) -> JokeResponse:
+        # row is (jokeId, category, text)
+        return JokeResponse(
+            text = row[2],
+            category = row[1],
+            jokeId = row[0]
+        )
+
+    def getCategories(self) -> List[str]:
+        # returns the (lowercased) categories that have at least one joke
+        return sorted(self.__getCategorySizes())
+
+    def __getCategorySizes(self) -> Dict[str, int]:
+        if self.__categorySizes is None:
+            cursor = self.__backingDatabase.getConnection().cursor()
+            cursor.execute('SELECT LOWER(category), COUNT(*) FROM jokes GROUP BY LOWER(category)')
+            self.__categorySizes = { row[0]: row[1] for row in cursor.fetchall() }
+            cursor.close()
+
+        return self.__categorySizes
+
+    def getRandomJoke(self, category: str = None) -> JokeResponse:
+        # Returns a random joke from the given category (ignoring case), or from any category if
+        # it's None. Every joke is equally likely, and None is returned if there are no jokes.
+        categorySizes = self.__getCategorySizes()
+
+        if utils.isValidStr(category):
+            category = category.lower()
+            size = categorySizes.get(category, 0)
+
+            if size == 0:
+                return None
+
+            categoryIndex = random.randrange(size)
+        else:
+            size = sum(categorySizes.values())
+
+            if size == 0:
+                return None
+
+            # a random joke overall, found by walking the (few) categories to the one it's in
+            categoryIndex = random.randrange(size)
+
+            for category, categorySize in categorySizes.items():
+                if categoryIndex < categorySize:
+                    break
+
+                categoryIndex = categoryIndex - categorySize
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT jokeId, category, text FROM jokes
+                WHERE category = ? AND categoryIndex = ?
+            ''',
+            (category, categoryIndex)
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+
+        if row is None:
+            return None
+        else:
+            return self.__createJoke(row)
+
+    def getSize(self, category: str = None) -> int:
+        categorySizes = self.__getCategorySizes()
+
+        if utils.isValidStr(category):
+            return categorySizes.get(category.lower(), 0)
+        else:
+            return sum(categorySizes.values())
+
+    def __initDatabaseTable(self):
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS jokes (
+                    jokeId INTEGER NOT NULL PRIMARY KEY,
+                    category TEXT NOT NULL COLLATE NOCASE,
+                    categoryIndex INTEGER NOT NULL,
+                    text TEXT NOT NULL
+                )
+            '''
+        )
+
+        connection.execute(
+            '''
+                CREATE UNIQUE INDEX IF NOT EXISTS jokesCategoryIndex ON jokes (category, categoryIndex)
+            '''
+        )
+
+        connection.commit()
@@ -0,0 +1,105 @@
+import sys
+import time
+from typing import List
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.jokeResponse import JokeResponse
+    from CynanBotCommon.jokesDatabase import JokesDatabase
+    from CynanBotCommon.jokesRepository import JokesRepository
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from jokeResponse import JokeResponse
+    from jokesDatabase import JokesDatabase
+    from jokesRepository import JokesRepository
+
+
+# This file is meant to be run by hand, separately from the others in this repository. It bulk
+# loads jokes into a JokesDatabase, so that JokesRepository can tell jokes without calling
+# JokeAPI at all. Every joke goes through the same checks that JokesRepository applies to
+# jokes from JokeAPI, so the ones that fail them never make it into the database. There are
+# two supported sources:
+#
+# 1. JokeAPI itself, which is asked for batches of jokes until it stops returning new ones:
+# python jokesIngest.py api [<databaseFile>]
+#
+# 2. A JSON file of jokes in JokeAPI's format, either a list of jokes or an object with a
+# "jokes" list (like JokeAPI's own https://github.com/Sv443/JokeAPI/blob/master/jokes/jokes-en.json):
+# python jokesIngest.py file <jokesFile> [<databaseFile>]
+
+# how many batches in a row can bring no new jokes before JokeAPI is assumed to have run out
+MAX_STALE_BATCHES = 5
+
+# JokeAPI allows 120 requests per minute
+SECONDS_BETWEEN_BATCHES = 1
+
+def ingestApi(jokesRepository: JokesRepository, jokesDatabase: JokesDatabase):
+    staleBatchCount = 0
+
+    while staleBatchCount < MAX_STALE_BATCHES:
+        jokes: List[JokeResponse] = list()
+
+        try:
+            jokes = jokesRepository.fetchJokes()
+        except (RuntimeError, ValueError) as e:
+            print(f'Skipping batch of jokes: {e}')
+
+        newJokeCount = jokesDatabase.addJokes(jokes)
+
+        if newJokeCount == 0:
+            staleBatchCount = staleBatchCount + 1
+        else:
+            staleBatchCount = 0
+            print(f'Ingested {newJokeCount:,} new jokes ({jokesDatabase.getSize():,} in total)...')
+
+        time.sleep(SECONDS_BETWEEN_BATCHES)
+
+    print(f'Ingested jokes from JokeAPI ({jokesDatabase.getSize():,} in total)')
+
+def ingestFile(jokesFile: str, jokesRepository: JokesRepository, jokesDatabase: JokesDatabase):
+    with open(jokesFile, 'rb') as file:
+        jsonResponse = utils.loadJson(file.read())
+
+    if isinstance(jsonResponse, dict):
+        jsonResponse = jsonResponse.get('jokes', list())
+
+    jokes: List[JokeResponse] = list()
+
+    for jsonJoke in jsonResponse:
+        try:
+            jokes.append(jokesRepository.parseJoke(jsonJoke))
+        except ValueError:
+            # parseJoke() has already said why
+            continue
+
+    newJokeCount = jokesDatabase.addJokes(jokes)
+    print(f'Ingested {newJokeCount:,} new jokes from {len(jsonResponse):,} in \"{jokesFile}\" ({jokesDatabase.getSize():,} in total)')
+
+def main():
+    args = sys.argv[1:]
+
+    if len(args) < 1 or args[0] not in ('api', 'file') or (args[0] == 'file' and len(args) < 2):
+        print('python jokesIngest.py api [<databaseFile>]')
+        print('python jokesIngest.py file <jokesFile> [<databaseFile>]')
+        sys.exit(1)
+
+    databaseFileIndex = 1 if args[0] == 'api' else 2
+
+    if len(args) > databaseFileIndex:
+        backingDatabase = BackingDatabase(args[databaseFileIndex])
+    else:
+        backingDatabase = BackingDatabase()
+
+    jokesDatabase = JokesDatabase(backingDatabase)
+    jokesRepository = JokesRepository()
+
+    if args[0] == 'api':
+        ingestApi(jokesRepository, jokesDatabase)
+    else:
+        ingestFile(args[1], jokesRepository, jokesDatabase)
+
+
+if __name__ == '__main__':
+    main()
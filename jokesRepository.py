@@ -1,101 +1,293 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from json.decoder import JSONDecodeError
+from typing import Any, Deque, List
 
 import requests
 from requests import ConnectionError, HTTPError, Timeout
 from urllib3.exceptions import MaxRetryError, NewConnectionError
 
-import CynanBotCommon.utils as utils
-
-
-class JokeResponse():
-
-    def __init__(self, text: str):
-        if not utils.isValidStr(text):
-            raise ValueError(f'text argument is malformed: \"{text}\"')
-
-        self.__text = text
-
-    def getText(self):
-        return self.__text
-
-    def toStr(self):
-        return f'{self.__text} 🥁'
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.bloomFilter import BloomFilter
+    from CynanBotCommon.jokeResponse import JokeResponse
+    from CynanBotCommon.jokesDatabase import JokesDatabase
+    from CynanBotCommon.responseSchema import (ResponseSchema,
+                                               ResponseSchemaError,
+                                               SchemaField, SchemaList)
+except:
+    import utils
+    from bloomFilter import BloomFilter
+    from jokeResponse import JokeResponse
+    from jokesDatabase import JokesDatabase
+    from responseSchema import (ResponseSchema, ResponseSchemaError,
+                                SchemaField, SchemaList)
 
 
 class JokesRepository():
 
+    # Jokes are fetched from JokeAPI in batches of up to batchSize (using its "amount"
+    # parameter) into a pool of up to poolSize jokes that have already passed every check.
+    # fetchJoke() takes jokes from the front of the pool, and whenever the pool gets down to
+    # half full, it's topped back up on a background thread. The pool only ever blocks a caller
+    # when it's completely empty. The IDs of every joke that's been pooled are kept in a
+    # BloomFilter, so that jokes aren't repeated until JokeAPI has run out of new ones. When
+    # given a JokesDatabase, jokes are instead taken at random from it, and JokeAPI isn't used.
+
     def __init__(
         self,
         apiUrl: str = 'https://v2.jokeapi.dev/joke/Miscellaneous,Pun,Spooky,Christmas?blacklistFlags=nsfw,religious,political,racist,sexist,explicit&safe-mode',
-        cacheTimeDelta: timedelta = timedelta(minutes = 10)
+        cacheTimeDelta: timedelta = timedelta(minutes = 10),
+        batchSize: int = 10,
+        poolSize: int = 10,
+        jokesDatabase: JokesDatabase = None
     ):
         if not utils.isValidUrl(apiUrl):
             raise ValueError(f'apiUrl argument is malformed: \"{apiUrl}\"')
         elif cacheTimeDelta is None:
             raise ValueError(f'cacheTimeDelta argument is malformed: \"{cacheTimeDelta}\"')
+        elif not utils.isValidNum(batchSize) or batchSize < 1 or batchSize > 10:
+            # 10 is the most that JokeAPI will return at once
+            raise ValueError(f'batchSize argument is malformed: \"{batchSize}\"')
+        elif not utils.isValidNum(poolSize) or poolSize < 1:
+            raise ValueError(f'poolSize argument is malformed: \"{poolSize}\"')
 
         self.__apiUrl = apiUrl
         self.__cacheTime = datetime.utcnow() - cacheTimeDelta
         self.__cacheTimeDelta = cacheTimeDelta
+        self.__batchSize = batchSize
+        self.__poolSize = poolSize
+        self.__jokesDatabase = jokesDatabase
         self.__jokeResponse = None
+        self.__jokesResponseSchema = self.__createJokesResponseSchema()
+        self.__jokeSchema = self.__createJokeSchema()
+
+        # only the executor's thread adds to the pool and the seen joke IDs (see __refillPool()),
+        # while fetchJoke() only takes from the pool (after waiting on the executor if the pool
+        # is empty)
+        self.__executor = ThreadPoolExecutor(max_workers = 1)
+        self.__refillFuture: Future = None
+        self.__jokePool: Deque[JokeResponse] = deque()
+        self.__seenJokeIds = BloomFilter(capacity = 4096)
+
+    def __createJokeSchema(self) -> ResponseSchema:
+        # This schema is built from the joke format documented here:
+        # https://v2.jokeapi.dev/#joke-endpoint
+
+        flagsSchema = ResponseSchema(
+            name = 'JokeFlags',
+            fields = [
+                SchemaField('explicit', bool),
+                SchemaField('nsfw', bool),
+                SchemaField('political', bool),
+                SchemaField('racist', bool),
+                SchemaField('religious', bool),
+                SchemaField('sexist', bool)
+            ]
+        )
+
+        return ResponseSchema(
+            name = 'Joke',
+            fields = [
+                SchemaField('error', bool, optional = True, default = False),
+                SchemaField('safe', bool, optional = True, default = False),
+                SchemaField('flags', flagsSchema),
+                SchemaField('id', int),
+                SchemaField('category', str),
+                SchemaField('type', str),
+                SchemaField('delivery', str, optional = True),
+                SchemaField('joke', str, optional = True),
+                SchemaField('setup', str, optional = True)
+            ]
+        )
+
+    def __createJokesResponseSchema(self) -> ResponseSchema:
+        # A request for more than one joke returns them in a "jokes" list. Each one is decoded on
+        # its own by the joke schema above, so that one malformed joke doesn't cost the rest.
+        return ResponseSchema(
+            name = 'Jokes',
+            fields = [
+                SchemaField('error', bool, optional = True, default = True),
+                SchemaField('jokes', SchemaList(Any), optional = True, default = list())
+            ]
+        )
+
+    def fetchJoke(self, category: str = None) -> JokeResponse:
+        # Jokes from a given category (e.g. "Pun") are always a new random joke from that category,
+        # and are only available from a JokesDatabase.
+        if utils.isValidStr(category):
+            return self.__takeDatabaseJoke(category)
 
-    def fetchJoke(self) -> JokeResponse:
         if self.__cacheTime + self.__cacheTimeDelta < datetime.utcnow() or self.__jokeResponse is None:
-            self.__jokeResponse = self.__refreshJoke()
+            if self.__jokesDatabase is None:
+                self.__jokeResponse = self.__takeJoke()
+            else:
+                self.__jokeResponse = self.__takeDatabaseJoke(None)
+
             self.__cacheTime = datetime.utcnow()
 
         return self.__jokeResponse
 
-    def __refreshJoke(self) -> JokeResponse:
-        print(f'Refreshing joke... ({utils.getNowTimeText()})')
+    def fetchJokes(self) -> List[JokeResponse]:
+        # Fetches a single batch of jokes from JokeAPI, leaving out any that don't pass every
+        # check. This is public so that jokesIngest.py can fill a JokesDatabase with it.
+        print(f'Refreshing jokes... ({utils.getNowTimeText()})')
+
+        requestUrl = self.__apiUrl
+        if self.__batchSize >= 2:
+            separator = '&' if '?' in requestUrl else '?'
+            requestUrl = f'{requestUrl}{separator}amount={self.__batchSize}'
 
         rawResponse = None
 
         try:
-            rawResponse = requests.get(url = self.__apiUrl, timeout = utils.getDefaultTimeout())
+            rawResponse = requests.get(url = requestUrl, timeout = utils.getDefaultTimeout())
         except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
-            print(f'Exception occurred when attempting to fetch new joke: {e}')
-            raise RuntimeError(f'Exception occurred when attempting to fetch new joke: {e}')
+            print(f'Exception occurred when attempting to fetch new jokes: {e}')
+            raise RuntimeError(f'Exception occurred when attempting to fetch new jokes: {e}')
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
-            print(f'Exception occurred when attempting to decode joke\'s response into JSON: {e}')
-            raise RuntimeError(f'Exception occurred when attempting to decode joke\'s response into JSON: {e}')
+            print(f'Exception occurred when attempting to decode jokes\' response into JSON: {e}')
+            raise RuntimeError(f'Exception occurred when attempting to decode jokes\' response into JSON: {e}')
+
+        if not isinstance(jsonResponse, dict) or 'jokes' not in jsonResponse:
+            # JokeAPI returns a lone joke (rather than a list of them) when asked for only one
+            return [ self.parseJoke(jsonResponse) ]
+
+        jokesResponse = None
+        try:
+            jokesResponse = self.__jokesResponseSchema.decode(jsonResponse)
+        except ResponseSchemaError as e:
+            print(f'Rejecting jokes due to malformed response: {e}')
+            raise ValueError(f'Rejecting jokes due to malformed response: {e}')
+
+        if jokesResponse.error:
+            print(f'Rejecting jokes due to bad \"error\" value: {jsonResponse}')
+            raise ValueError(f'Rejecting jokes due to bad \"error\" value: {jsonResponse}')
+
+        jokes = list()
 
-        if utils.getBoolFromDict(jsonResponse, 'error', True):
+        for jsonJoke in jokesResponse.jokes:
+            try:
+                jokes.append(self.parseJoke(jsonJoke))
+            except ValueError:
+                # parseJoke() has already said why
+                continue
+
+        return jokes
+
+    def parseJoke(self, jsonResponse) -> JokeResponse:
+        # Turns a single joke in JokeAPI's format (https://v2.jokeapi.dev/#joke-endpoint) into a
+        # JokeResponse, raising ValueError if it's malformed or doesn't pass every check. This is
+        # public so that jokesIngest.py can check jokes read from a file the same way.
+        joke = None
+        try:
+            joke = self.__jokeSchema.decode(jsonResponse)
+        except ResponseSchemaError as e:
+            print(f'Rejecting joke due to malformed response: {e}')
+            raise ValueError(f'Rejecting joke due to malformed response: {e}')
+
+        if joke.error:
             print(f'Rejecting joke due to bad \"error\" value: {jsonResponse}')
             raise ValueError(f'Rejecting joke due to bad \"error\" value: {jsonResponse}')
-        elif utils.getBoolFromDict(jsonResponse, 'safe', False):
+        elif not joke.safe:
             print(f'Rejecting joke due to bad \"safe\" value: {jsonResponse}')
             raise ValueError(f'Rejecting joke due to bad \"safe\" value: {jsonResponse}')
 
-        flagsJson = jsonResponse['flags']
-        isExplicit = flagsJson['explicit']
-        isNsfw = flagsJson['nsfw']
-        isPolitical = flagsJson['political']
-        isRacist = flagsJson['racist']
-        isReligious = flagsJson['religious']
-        isSexist = flagsJson['sexist']
+        flags = joke.flags
 
-        if isExplicit or isNsfw or isPolitical or isRacist or isReligious or isSexist:
+        if flags.explicit or flags.nsfw or flags.political or flags.racist or flags.religious or flags.sexist:
             print(f'Rejecting joke due to one or more bad flags: {jsonResponse}')
             raise ValueError(f'Rejecting joke due to one or more bad flags: {jsonResponse}')
 
         jokeText = None
 
-        if jsonResponse['type'] == 'twopart':
-            setup = utils.cleanStr(jsonResponse['setup'])
-            delivery = utils.cleanStr(jsonResponse['delivery'])
+        if joke.type == 'twopart':
+            setup = utils.cleanStr(joke.setup)
+            delivery = utils.cleanStr(joke.delivery)
             jokeText = f'{setup} {delivery}'
-        elif jsonResponse['type'] == 'single':
-            jokeText = utils.cleanStr(jsonResponse['joke'])
+        elif joke.type == 'single':
+            jokeText = utils.cleanStr(joke.joke)
         else:
             print(f'Rejecting joke due to unknown \"type\": {jsonResponse}')
             raise ValueError(f'Rejecting joke due to unknown \"type\": {jsonResponse}')
 
         return JokeResponse(
-            text = jokeText
+            text = jokeText,
+            category = joke.category,
+            jokeId = joke.id
         )
+
+    def __refillPool(self):
+        # fetches batches of jokes until the pool is full, or until a batch brings no new jokes
+        while len(self.__jokePool) < self.__poolSize:
+            jokes = self.fetchJokes()
+            newJokeCount = 0
+
+            for joke in jokes:
+                # the rest of the batch isn't marked as seen, so it can still be told later
+                if len(self.__jokePool) >= self.__poolSize:
+                    break
+
+                jokeId = str(joke.getJokeId())
+
+                if jokeId in self.__seenJokeIds:
+                    continue
+
+                self.__seenJokeIds.add(jokeId)
+                self.__jokePool.append(joke)
+                newJokeCount = newJokeCount + 1
+
+            if newJokeCount == 0:
+                if utils.hasItems(jokes):
+                    # every joke that JokeAPI has to offer (or a false positive's worth of
+                    # them) has already been told, so start over
+                    print('Every joke in this batch has been seen before, forgetting seen jokes')
+                    self.__seenJokeIds.clear()
+
+                break
+            elif self.__seenJokeIds.isFull():
+                self.__seenJokeIds.clear()
+
+    def __refillPoolInBackground(self):
+        try:
+            self.__refillPool()
+        except (RuntimeError, ValueError) as e:
+            print(f'Exception occurred when attempting to refill the joke pool: {e}')
+
+    def __takeDatabaseJoke(self, category: str) -> JokeResponse:
+        if self.__jokesDatabase is None:
+            raise RuntimeError(f'Jokes from a given category (\"{category}\") require a JokesDatabase')
+
+        jokeResponse = self.__jokesDatabase.getRandomJoke(category)
+
+        if jokeResponse is None:
+            print(f'Unable to find any jokes in category \"{category}\"')
+            raise ValueError(f'Unable to find any jokes in category \"{category}\"')
+
+        return jokeResponse
+
+    def __takeJoke(self) -> JokeResponse:
+        if not utils.hasItems(self.__jokePool):
+            if self.__refillFuture is not None:
+                self.__refillFuture.result()
+
+            if not utils.hasItems(self.__jokePool):
+                # this refill also happens on the executor's thread, but unlike a background
+                # refill, any exception it raises is raised here too
+                self.__executor.submit(self.__refillPool).result()
+
+        if not utils.hasItems(self.__jokePool):
+            print('Unable to find any new jokes')
+            raise ValueError('Unable to find any new jokes')
+
+        jokeResponse = self.__jokePool.popleft()
+
+        if len(self.__jokePool) <= self.__poolSize // 2 and (self.__refillFuture is None or self.__refillFuture.done()):
+            self.__refillFuture = self.__executor.submit(self.__refillPoolInBackground)
+
+        return jokeResponse
@@ -0,0 +1,179 @@
+from typing import Dict
+
+# Conversions between katakana, hiragana and (Hepburn) romaji, for normalizing Japanese
+# dictionary keys and queries. Romaji is always lowercase, and every table below is built just
+# once, when this module is imported.
+
+# katakana and hiragana are laid out identically in Unicode, just this far apart
+KATAKANA_OFFSET = ord('ァ') - ord('ぁ')
+
+HIRAGANA_TO_ROMAJI: Dict[str, str] = {
+    'あ': 'a', 'い': 'i', 'う': 'u', 'え': 'e', 'お': 'o',
+    'か': 'ka', 'き': 'ki', 'く': 'ku', 'け': 'ke', 'こ': 'ko',
+    'が': 'ga', 'ぎ': 'gi', 'ぐ': 'gu', 'げ': 'ge', 'ご': 'go',
+    'さ': 'sa', 'し': 'shi', 'す': 'su', 'せ': 'se', 'そ': 'so',
+    'ざ': 'za', 'じ': 'ji', 'ず': 'zu', 'ぜ': 'ze', 'ぞ': 'zo',
+    'た': 'ta', 'ち': 'chi', 'つ': 'tsu', 'て': 'te', 'と': 'to',
+    'だ': 'da', 'ぢ': 'ji', 'づ': 'zu', 'で': 'de', 'ど': 'do',
+    'な': 'na', 'に': 'ni', 'ぬ': 'nu', 'ね': 'ne', 'の': 'no',
+    'は': 'ha', 'ひ': 'hi', 'ふ': 'fu', 'へ': 'he', 'ほ': 'ho',
+    'ば': 'ba', 'び': 'bi', 'ぶ': 'bu', 'べ': 'be', 'ぼ': 'bo',
+    'ぱ': 'pa', 'ぴ': 'pi', 'ぷ': 'pu', 'ぺ': 'pe', 'ぽ': 'po',
+    'ま': 'ma', 'み': 'mi', 'む': 'mu', 'め': 'me', 'も': 'mo',
+    'や': 'ya', 'ゆ': 'yu', 'よ': 'yo',
+    'ら': 'ra', 'り': 'ri', 'る': 'ru', 'れ': 're', 'ろ': 'ro',
+    'わ': 'wa', 'ゐ': 'wi', 'ゑ': 'we', 'を': 'wo', 'ん': 'n',
+    'ゔ': 'vu',
+    'ぁ': 'a', 'ぃ': 'i', 'ぅ': 'u', 'ぇ': 'e', 'ぉ': 'o',
+    'ゃ': 'ya', 'ゅ': 'yu', 'ょ': 'yo', 'ゎ': 'wa',
+    'きゃ': 'kya', 'きゅ': 'kyu', 'きょ': 'kyo',
+    'ぎゃ': 'gya', 'ぎゅ': 'gyu', 'ぎょ': 'gyo',
+    'しゃ': 'sha', 'しゅ': 'shu', 'しぇ': 'she', 'しょ': 'sho',
+    'じゃ': 'ja', 'じゅ': 'ju', 'じぇ': 'je', 'じょ': 'jo',
+    'ちゃ': 'cha', 'ちゅ': 'chu', 'ちぇ': 'che', 'ちょ': 'cho',
+    'ぢゃ': 'ja', 'ぢゅ': 'ju', 'ぢょ': 'jo',
+    'にゃ': 'nya', 'にゅ': 'nyu', 'にょ': 'nyo',
+    'ひゃ': 'hya', 'ひゅ': 'hyu', 'ひょ': 'hyo',
+    'びゃ': 'bya', 'びゅ': 'byu', 'びょ': 'byo',
+    'ぴゃ': 'pya', 'ぴゅ': 'pyu', 'ぴょ': 'pyo',
+    'みゃ': 'mya', 'みゅ': 'myu', 'みょ': 'myo',
+    'りゃ': 'rya', 'りゅ': 'ryu', 'りょ': 'ryo',
+    'ふぁ': 'fa', 'ふぃ': 'fi', 'ふぇ': 'fe', 'ふぉ': 'fo',
+    'ゔぁ': 'va', 'ゔぃ': 'vi', 'ゔぇ': 've', 'ゔぉ': 'vo',
+    'てぃ': 'ti', 'でぃ': 'di', 'とぅ': 'tu', 'どぅ': 'du',
+    'うぃ': 'wi', 'うぇ': 'we', 'うぉ': 'wo'
+}
+
+# the reverse of the table above, plus the common non-Hepburn spellings
+ROMAJI_TO_HIRAGANA: Dict[str, str] = {
+    **{ romaji: kana for kana, romaji in reversed(HIRAGANA_TO_ROMAJI.items()) if kana[0] not in 'ぁぃぅぇぉゃゅょゎ' },
+    'a': 'あ', 'i': 'い', 'u': 'う', 'e': 'え', 'o': 'お', 'n': 'ん', 'n\'': 'ん',
+    'si': 'し', 'ti': 'ち', 'tu': 'つ', 'hu': 'ふ', 'zi': 'じ', 'di': 'ぢ', 'du': 'づ',
+    'sya': 'しゃ', 'syu': 'しゅ', 'syo': 'しょ',
+    'tya': 'ちゃ', 'tyu': 'ちゅ', 'tyo': 'ちょ',
+    'zya': 'じゃ', 'zyu': 'じゅ', 'zyo': 'じょ',
+    'jya': 'じゃ', 'jyu': 'じゅ', 'jyo': 'じょ',
+    'wo': 'を', 'wi': 'ゐ', 'we': 'ゑ'
+}
+
+ROMAJI_MAX_LENGTH = max(len(romaji) for romaji in ROMAJI_TO_HIRAGANA)
+
+
+def hiraganaToRomaji(text: str) -> str:
+    # Anything that isn't hiragana (including katakana, see katakanaToHiragana()) is left as-is.
+    # A small "っ" doubles the next consonant, a long vowel mark repeats the previous vowel, and
+    # "ん" is written as "n'" before a vowel or "y" (so that "きんえん" is "kin'en", not "kinen").
+    if text is None:
+        raise ValueError(f'text argument is malformed: \"{text}\"')
+
+    romaji = list()
+    doubleNext = False
+    index = 0
+
+    while index < len(text):
+        character = text[index]
+
+        if character == 'っ':
+            doubleNext = True
+            index = index + 1
+            continue
+
+        syllable = HIRAGANA_TO_ROMAJI.get(text[index:index + 2])
+
+        if syllable is None:
+            syllable = HIRAGANA_TO_ROMAJI.get(character)
+            index = index + 1
+        else:
+            index = index + 2
+
+        if syllable is None:
+            if character == 'ー' and len(romaji) >= 1 and romaji[-1][-1] in 'aeiou':
+                syllable = romaji[-1][-1]
+            else:
+                syllable = character
+
+        if syllable[0] in 'aeiouy' and len(romaji) >= 1 and romaji[-1] == 'n':
+            romaji[-1] = 'n\''
+
+        if doubleNext:
+            if syllable[0] in 'bcdfghjklmpqrstvwxyz':
+                # Hepburn writes "っち" as "tchi"
+                syllable = ('t' if syllable.startswith('ch') else syllable[0]) + syllable
+
+            doubleNext = False
+
+        romaji.append(syllable)
+
+    return ''.join(romaji)
+
+def isKana(text: str) -> bool:
+    if not isinstance(text, str) or len(text) == 0:
+        return False
+
+    return all('ぁ' <= character <= 'ゖ' or 'ァ' <= character <= 'ヺ' or character == 'ー' for character in text)
+
+def isRomaji(text: str) -> bool:
+    if not isinstance(text, str) or len(text) == 0:
+        return False
+
+    return all(('a' <= character <= 'z') or ('A' <= character <= 'Z') or character in ' -\'' for character in text)
+
+def katakanaToHiragana(text: str) -> str:
+    if text is None:
+        raise ValueError(f'text argument is malformed: \"{text}\"')
+
+    return ''.join(chr(ord(character) - KATAKANA_OFFSET) if 'ァ' <= character <= 'ヶ' else character for character in text)
+
+def romajiToHiragana(text: str) -> str:
+    # Converts as much of the (lowercased) text as possible, leaving anything that doesn't
+    # spell out a kana as-is. Doubled consonants become a small "っ", "n" becomes "ん" when it
+    # can't start the next syllable, and "nn" becomes "ん" (keeping the second "n" if it starts
+    # the next syllable, so that "konnichiha" is "こんにちは").
+    if text is None:
+        raise ValueError(f'text argument is malformed: \"{text}\"')
+
+    text = text.lower()
+    hiragana = list()
+    index = 0
+
+    while index < len(text):
+        character = text[index]
+
+        if character in 'bcdfghjkmpqrstvwyz' and index + 1 < len(text) and text[index + 1] == character:
+            hiragana.append('っ')
+            index = index + 1
+            continue
+        elif character == 't' and text.startswith('tch', index):
+            hiragana.append('っ')
+            index = index + 1
+            continue
+        elif character == 'n' and index + 1 < len(text) and text[index + 1] == 'n':
+            hiragana.append('ん')
+
+            if index + 2 < len(text) and text[index + 2] in 'aeiouy':
+                index = index + 1
+            else:
+                index = index + 2
+
+            continue
+        elif character == 'n' and (index + 1 >= len(text) or text[index + 1] not in 'aeiouy\''):
+            hiragana.append('ん')
+            index = index + 1
+            continue
+
+        for length in range(min(ROMAJI_MAX_LENGTH, len(text) - index), 0, -1):
+            kana = ROMAJI_TO_HIRAGANA.get(text[index:index + length])
+
+            if kana is not None:
+                hiragana.append(kana)
+                index = index + length
+                break
+        else:
+            hiragana.append(character)
+            index = index + 1
+
+    return ''.join(hiragana)
+
+def toRomaji(text: str) -> str:
+    # converts both katakana and hiragana into romaji
+    return hiraganaToRomaji(katakanaToHiragana(text))
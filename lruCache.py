@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class LruCache():
+
+    # A size-bounded dict that throws away its least recently used key once it's full. Like
+    # TimedDict, a missing key reads as None rather than raising KeyError, and if a timeDelta
+    # is given then keys also read as None once that long has passed since they were set.
+    # Every read counts as either a hit or a miss, see getHitRate().
+
+    def __init__(self, maxSize: int = 256, timeDelta: timedelta = None):
+        if not utils.isValidNum(maxSize) or maxSize < 1:
+            raise ValueError(f'maxSize argument is malformed: \"{maxSize}\"')
+
+        self.__maxSize = maxSize
+        self.__timeDelta = timeDelta
+        self.__hitCount = 0
+        self.__missCount = 0
+
+        # key -> (value, expiration time or None)
+        self.__entries = OrderedDict()
+
+    def clear(self):
+        self.__entries.clear()
+
+    def __contains__(self, key) -> bool:
+        entry = self.__entries.get(key)
+        return entry is not None and not self.__isExpired(entry)
+
+    def __delitem__(self, key):
+        self.__entries.pop(key, None)
+
+    def __getitem__(self, key):
+        entry = self.__entries.get(key)
+
+        if entry is None:
+            self.__missCount = self.__missCount + 1
+            return None
+        elif self.__isExpired(entry):
+            del self.__entries[key]
+            self.__missCount = self.__missCount + 1
+            return None
+
+        self.__entries.move_to_end(key)
+        self.__hitCount = self.__hitCount + 1
+        return entry[0]
+
+    def getHitCount(self) -> int:
+        return self.__hitCount
+
+    def getHitRate(self) -> float:
+        # the fraction of reads (0.0 through 1.0) that found a value, or 0.0 if there haven't been any
+        readCount = self.__hitCount + self.__missCount
+
+        if readCount == 0:
+            return 0.0
+        else:
+            return self.__hitCount / readCount
+
+    def getMaxSize(self) -> int:
+        return self.__maxSize
+
+    def getMissCount(self) -> int:
+        return self.__missCount
+
+    def __isExpired(self, entry) -> bool:
+        return entry[1] is not None and datetime.utcnow() > entry[1]
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def set(self, key, value, expiration: datetime = None):
+        # Does the same as "cache[key] = value", except that the key expires at the given
+        # (UTC) time, rather than timeDelta from now.
+        self.__entries[key] = (value, expiration)
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__maxSize:
+            self.__entries.popitem(last = False)
+
+    def __setitem__(self, key, value):
+        expiration = None
+        if self.__timeDelta is not None:
+            expiration = datetime.utcnow() + self.__timeDelta
+
+        self.set(key, value, expiration)
@@ -0,0 +1,70 @@
+from enum import Enum, auto
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+except:
+    import utils
+    from pokepediaElementType import PokepediaElementType
+
+
+class PokepediaDamageClass(Enum):
+
+    PHYSICAL = auto()
+    SPECIAL = auto()
+    STATUS = auto()
+
+    @classmethod
+    def fromStr(cls, text: str):
+        if not utils.isValidStr(text):
+            raise ValueError(f'text argument is malformed: \"{text}\"')
+
+        damageClass = _DAMAGE_CLASSES_BY_STR.get(text)
+
+        if damageClass is None:
+            raise ValueError(f'unknown PokepediaDamageClass: \"{text}\"')
+
+        return damageClass
+
+    # gen 1-3 have damage classes based off element type
+    @classmethod
+    def getTypeBasedDamageClass(cls, elementType: PokepediaElementType):
+        if elementType is None:
+            raise ValueError(f'elementType argument is malformed: \"{elementType}\"')
+
+        damageClass = _TYPE_BASED_DAMAGE_CLASSES.get(elementType)
+
+        if damageClass is None:
+            raise ValueError(f'unknown PokepediaElementType: \"{elementType}\"')
+
+        return damageClass
+
+    def toStr(self) -> str:
+        return _DAMAGE_CLASS_STRS[self]
+
+
+# lookup tables for fromStr(), getTypeBasedDamageClass() and toStr(), built at import time
+
+_DAMAGE_CLASSES_BY_STR = { damageClass.name.lower(): damageClass for damageClass in PokepediaDamageClass }
+
+_DAMAGE_CLASS_STRS = { damageClass: damageClass.name.title() for damageClass in PokepediaDamageClass }
+
+_TYPE_BASED_DAMAGE_CLASSES = {
+    PokepediaElementType.NORMAL: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.FIGHTING: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.FLYING: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.POISON: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.GROUND: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.ROCK: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.BUG: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.GHOST: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.STEEL: PokepediaDamageClass.PHYSICAL,
+    PokepediaElementType.FIRE: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.WATER: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.GRASS: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.ELECTRIC: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.PSYCHIC: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.ICE: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.DRAGON: PokepediaDamageClass.SPECIAL,
+    PokepediaElementType.DARK: PokepediaDamageClass.SPECIAL
+}
@@ -0,0 +1,389 @@
+from datetime import datetime, timezone
+from typing import Collection, Dict, List, Tuple
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.pokepediaDamageClass import PokepediaDamageClass
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaMove import PokepediaMove
+    from CynanBotCommon.pokepediaMoveGeneration import PokepediaMoveGeneration
+    from CynanBotCommon.pokepediaPokemon import PokepediaPokemon
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from pokepediaDamageClass import PokepediaDamageClass
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaMove import PokepediaMove
+    from pokepediaMoveGeneration import PokepediaMoveGeneration
+    from pokepediaPokemon import PokepediaPokemon
+
+
+class PokepediaDatabase():
+
+    # A local, indexed copy of the move and Pokemon data that PokepediaRepository would otherwise
+    # fetch from PokeAPI. Moves are stored already reduced to their per-generation stats (the same
+    # shape that PokepediaRepository builds from PokeAPI's "past_values"), so a lookup is just two
+    # primary key reads. See pokepediaIngest.py for how this database gets populated.
+
+    def __init__(self, backingDatabase: BackingDatabase):
+        if backingDatabase is None:
+            raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
+
+        self.__backingDatabase = backingDatabase
+        self.__initDatabaseTables()
+
+    def addLearnsets(self, learnsets: Collection[Tuple[int, int]], commit: bool = True):
+        # learnsets is a collection of (moveId, pokedexId) pairs
+        if learnsets is None:
+            raise ValueError(f'learnsets argument is malformed: \"{learnsets}\"')
+        elif commit is None:
+            raise ValueError(f'commit argument is malformed: \"{commit}\"')
+
+        connection = self.__backingDatabase.getConnection()
+
+        connection.executemany(
+            '''
+                INSERT OR IGNORE INTO pokepediaLearnsets (moveId, pokedexId)
+                VALUES (?, ?)
+            ''',
+            learnsets
+        )
+
+        if commit:
+            connection.commit()
+
+    def addMove(self, move: PokepediaMove, commit: bool = True):
+        if move is None:
+            raise ValueError(f'move argument is malformed: \"{move}\"')
+        elif commit is None:
+            raise ValueError(f'commit argument is malformed: \"{commit}\"')
+
+        connection = self.__backingDatabase.getConnection()
+        rawName = move.getRawName()
+
+        connection.execute(
+            '''
+                INSERT OR REPLACE INTO pokepediaMoves (rawName, moveId, description, name, updatedTime)
+                VALUES (?, ?, ?, ?, ?)
+            ''',
+            (rawName, move.getMoveId(), move.getDescription(), move.getName(), self.__getNowTimestamp())
+        )
+
+        connection.execute('DELETE FROM pokepediaMoveGenerations WHERE rawName = ?', (rawName, ))
+
+        rows = list()
+        for moveGeneration in move.getGenerationMoves().values():
+            rows.append((
+                rawName,
+                moveGeneration.getGeneration().name,
+                moveGeneration.getAccuracy(),
+                moveGeneration.getPower(),
+                moveGeneration.getPp(),
+                moveGeneration.getDamageClass().name,
+                moveGeneration.getElementType().name
+            ))
+
+        connection.executemany(
+            '''
+                INSERT INTO pokepediaMoveGenerations (rawName, generation, accuracy, power, pp, damageClass, elementType)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''',
+            rows
+        )
+
+        learnedByPokedexIds = move.getLearnedByPokedexIds()
+
+        if learnedByPokedexIds is not None:
+            connection.execute('DELETE FROM pokepediaLearnsets WHERE moveId = ?', (move.getMoveId(), ))
+            self.addLearnsets([ (move.getMoveId(), pokedexId) for pokedexId in learnedByPokedexIds ], commit = False)
+
+        if commit:
+            connection.commit()
+
+    def addMoves(self, moves: List[PokepediaMove]):
+        if moves is None:
+            raise ValueError(f'moves argument is malformed: \"{moves}\"')
+
+        for move in moves:
+            self.addMove(move, commit = False)
+
+        self.__backingDatabase.getConnection().commit()
+
+    def addPokemon(self, pokemon: PokepediaPokemon, commit: bool = True):
+        if pokemon is None:
+            raise ValueError(f'pokemon argument is malformed: \"{pokemon}\"')
+        elif commit is None:
+            raise ValueError(f'commit argument is malformed: \"{commit}\"')
+
+        connection = self.__backingDatabase.getConnection()
+        rawName = pokemon.getRawName()
+
+        connection.execute(
+            '''
+                INSERT OR REPLACE INTO pokepediaPokemon (rawName, pokedexId, name, updatedTime)
+                VALUES (?, ?, ?, ?)
+            ''',
+            (rawName, pokemon.getPokedexId(), pokemon.getName(), self.__getNowTimestamp())
+        )
+
+        connection.execute('DELETE FROM pokepediaPokemonGenerations WHERE rawName = ?', (rawName, ))
+
+        rows = list()
+        for generation, elementTypes in pokemon.getGenerationElementTypes().items():
+            rows.append((
+                rawName,
+                generation.name,
+                ','.join(elementType.name for elementType in elementTypes)
+            ))
+
+        connection.executemany(
+            '''
+                INSERT INTO pokepediaPokemonGenerations (rawName, generation, elementTypes)
+                VALUES (?, ?, ?)
+            ''',
+            rows
+        )
+
+        if commit:
+            connection.commit()
+
+    def addPokemons(self, pokemons: List[PokepediaPokemon]):
+        if pokemons is None:
+            raise ValueError(f'pokemons argument is malformed: \"{pokemons}\"')
+
+        for pokemon in pokemons:
+            self.addPokemon(pokemon, commit = False)
+
+        self.__backingDatabase.getConnection().commit()
+
+    def __createMoveGeneration(self, row) -> PokepediaMoveGeneration:
+        # row is (generation, accuracy, power, pp, damageClass, elementType)
+        return PokepediaMoveGeneration(
+            accuracy = row[1],
+            power = row[2],
+            pp = row[3],
+            damageClass = PokepediaDamageClass[row[4]],
+            elementType = PokepediaElementType[row[5]],
+            generation = PokepediaGeneration[row[0]]
+        )
+
+    def getLearnsets(self) -> List[Tuple[int, int]]:
+        # returns every (moveId, pokedexId) pair, sorted by move ID and then by Pokedex ID
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute('SELECT moveId, pokedexId FROM pokepediaLearnsets ORDER BY moveId, pokedexId')
+
+        learnsets = cursor.fetchall()
+        cursor.close()
+        return learnsets
+
+    def getMove(self, rawName: str) -> PokepediaMove:
+        if not utils.isValidStr(rawName):
+            raise ValueError(f'rawName argument is malformed: \"{rawName}\"')
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT rawName, moveId, description, name FROM pokepediaMoves
+                WHERE rawName = ?
+            ''',
+            (rawName, )
+        )
+
+        moveRow = cursor.fetchone()
+        if moveRow is None:
+            cursor.close()
+            return None
+
+        cursor.execute(
+            '''
+                SELECT generation, accuracy, power, pp, damageClass, elementType FROM pokepediaMoveGenerations
+                WHERE rawName = ?
+            ''',
+            (moveRow[0], )
+        )
+
+        generationMoves = dict()
+
+        for row in cursor.fetchall():
+            moveGeneration = self.__createMoveGeneration(row)
+            generationMoves[moveGeneration.getGeneration()] = moveGeneration
+
+        cursor.close()
+
+        return PokepediaMove(
+            generationMoves = generationMoves,
+            moveId = moveRow[1],
+            description = moveRow[2],
+            name = moveRow[3],
+            rawName = moveRow[0]
+        )
+
+    def getMoves(self) -> List[PokepediaMove]:
+        # loads every move with just two queries, rather than two per move like getMove()
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT rawName, generation, accuracy, power, pp, damageClass, elementType FROM pokepediaMoveGenerations
+            '''
+        )
+
+        generationMoves = dict()
+
+        for row in cursor.fetchall():
+            moveGeneration = self.__createMoveGeneration(row[1:])
+            generationMoves.setdefault(row[0].lower(), dict())[moveGeneration.getGeneration()] = moveGeneration
+
+        cursor.execute('SELECT rawName, moveId, description, name FROM pokepediaMoves')
+
+        moves = list()
+
+        for row in cursor.fetchall():
+            moves.append(PokepediaMove(
+                generationMoves = generationMoves.get(row[0].lower()),
+                moveId = row[1],
+                description = row[2],
+                name = row[3],
+                rawName = row[0]
+            ))
+
+        cursor.close()
+        return moves
+
+    def getMoveNames(self) -> List[str]:
+        return self.__getNames('pokepediaMoves')
+
+    def getMoveUpdatedTimes(self) -> Dict[str, int]:
+        return self.__getUpdatedTimes('pokepediaMoves')
+
+    def __getNames(self, tableName: str) -> List[str]:
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(f'SELECT rawName FROM {tableName}')
+
+        names = [ row[0] for row in cursor.fetchall() ]
+        cursor.close()
+        return names
+
+    def __getNowTimestamp(self) -> int:
+        return int(datetime.now(timezone.utc).timestamp())
+
+    def getPokemon(self, rawName: str) -> PokepediaPokemon:
+        if not utils.isValidStr(rawName):
+            raise ValueError(f'rawName argument is malformed: \"{rawName}\"')
+
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT rawName, pokedexId, name FROM pokepediaPokemon
+                WHERE rawName = ?
+            ''',
+            (rawName, )
+        )
+
+        pokemonRow = cursor.fetchone()
+        if pokemonRow is None:
+            cursor.close()
+            return None
+
+        cursor.execute(
+            '''
+                SELECT generation, elementTypes FROM pokepediaPokemonGenerations
+                WHERE rawName = ?
+            ''',
+            (pokemonRow[0], )
+        )
+
+        generationElementTypes = dict()
+
+        for row in cursor.fetchall():
+            generationElementTypes[PokepediaGeneration[row[0]]] = [ PokepediaElementType[elementType] for elementType in row[1].split(',') ]
+
+        cursor.close()
+
+        return PokepediaPokemon(
+            generationElementTypes = generationElementTypes,
+            pokedexId = pokemonRow[1],
+            name = pokemonRow[2],
+            rawName = pokemonRow[0]
+        )
+
+    def getPokemonNames(self) -> List[str]:
+        return self.__getNames('pokepediaPokemon')
+
+    def getPokemonUpdatedTimes(self) -> Dict[str, int]:
+        return self.__getUpdatedTimes('pokepediaPokemon')
+
+    def __getUpdatedTimes(self, tableName: str) -> Dict[str, int]:
+        # returns when each row was last written, as a UTC timestamp in seconds
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(f'SELECT rawName, updatedTime FROM {tableName}')
+
+        updatedTimes = { row[0]: row[1] for row in cursor.fetchall() }
+        cursor.close()
+        return updatedTimes
+
+    def __initDatabaseTables(self):
+        connection = self.__backingDatabase.getConnection()
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS pokepediaLearnsets (
+                    moveId INTEGER NOT NULL,
+                    pokedexId INTEGER NOT NULL,
+                    PRIMARY KEY (moveId, pokedexId)
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS pokepediaMoves (
+                    rawName TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
+                    moveId INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    updatedTime INTEGER NOT NULL
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS pokepediaMoveGenerations (
+                    rawName TEXT NOT NULL COLLATE NOCASE,
+                    generation TEXT NOT NULL,
+                    accuracy INTEGER,
+                    power INTEGER,
+                    pp INTEGER NOT NULL,
+                    damageClass TEXT NOT NULL,
+                    elementType TEXT NOT NULL,
+                    PRIMARY KEY (rawName, generation)
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS pokepediaPokemon (
+                    rawName TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
+                    pokedexId INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    updatedTime INTEGER NOT NULL
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS pokepediaPokemonGenerations (
+                    rawName TEXT NOT NULL COLLATE NOCASE,
+                    generation TEXT NOT NULL,
+                    elementTypes TEXT NOT NULL,
+                    PRIMARY KEY (rawName, generation)
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.commit()
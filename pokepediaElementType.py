@@ -0,0 +1,77 @@
+from enum import Enum, auto
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class PokepediaElementType(Enum):
+
+    BUG = auto()
+    DARK = auto()
+    DRAGON = auto()
+    ELECTRIC = auto()
+    FAIRY = auto()
+    FIGHTING = auto()
+    FIRE = auto()
+    FLYING = auto()
+    GHOST = auto()
+    GRASS = auto()
+    GROUND = auto()
+    ICE = auto()
+    NORMAL = auto()
+    POISON = auto()
+    PSYCHIC = auto()
+    ROCK = auto()
+    STEEL = auto()
+    WATER = auto()
+
+    @classmethod
+    def fromStr(cls, text: str):
+        if not utils.isValidStr(text):
+            raise ValueError(f'text argument is malformed: \"{text}\"')
+
+        elementType = _ELEMENT_TYPES_BY_STR.get(text)
+
+        if elementType is None:
+            raise ValueError(f'unknown PokepediaElementType: \"{text}\"')
+
+        return elementType
+
+    def getEmoji(self) -> str:
+        return _ELEMENT_TYPE_EMOJIS.get(self)
+
+    def getEmojiOrStr(self) -> str:
+        emoji = self.getEmoji()
+
+        if utils.isValidStr(emoji):
+            return emoji
+        else:
+            return self.toStr()
+
+    def toStr(self) -> str:
+        return _ELEMENT_TYPE_STRS[self]
+
+
+# Lookup tables for the methods above. These are built just once, when this module is imported,
+# and live outside of the class because Enum would otherwise turn them into members.
+
+_ELEMENT_TYPES_BY_STR = { elementType.name.lower(): elementType for elementType in PokepediaElementType }
+
+_ELEMENT_TYPE_EMOJIS = {
+    PokepediaElementType.BUG: '🐛',
+    PokepediaElementType.DRAGON: '🐲',
+    PokepediaElementType.ELECTRIC: '⚡',
+    PokepediaElementType.FIGHTING: '🥊',
+    PokepediaElementType.FIRE: '🔥',
+    PokepediaElementType.FLYING: '🐦',
+    PokepediaElementType.GHOST: '👻',
+    PokepediaElementType.GRASS: '🍃',
+    PokepediaElementType.ICE: '❄',
+    PokepediaElementType.POISON: '🧪',
+    PokepediaElementType.PSYCHIC: '🧠',
+    PokepediaElementType.WATER: '🌊'
+}
+
+_ELEMENT_TYPE_STRS = { elementType: elementType.name.title() for elementType in PokepediaElementType }
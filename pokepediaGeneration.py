@@ -0,0 +1,83 @@
+from enum import Enum, auto
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class PokepediaGeneration(Enum):
+
+    GENERATION_1 = auto()
+    GENERATION_2 = auto()
+    GENERATION_3 = auto()
+    GENERATION_4 = auto()
+    GENERATION_5 = auto()
+    GENERATION_6 = auto()
+    GENERATION_7 = auto()
+    GENERATION_8 = auto()
+
+    @classmethod
+    def fromStr(cls, text: str):
+        if not utils.isValidStr(text):
+            raise ValueError(f'text argument is malformed: \"{text}\"')
+
+        return _GENERATIONS_BY_STR.get(text, cls.GENERATION_1)
+
+    @classmethod
+    def fromKnownStr(cls, text: str):
+        # Like fromStr(), but returns None for any name that isn't listed below (e.g. a newer
+        # generation like "generation-ix", or its version groups), rather than calling it Gen 1.
+        if not utils.isValidStr(text):
+            raise ValueError(f'text argument is malformed: \"{text}\"')
+
+        return _GENERATIONS_BY_STR.get(text)
+
+    @classmethod
+    def getNewest(cls):
+        return _NEWEST_GENERATION
+
+    def isEarlyGeneration(self) -> bool:
+        return self in _EARLY_GENERATIONS
+
+    def toStr(self) -> str:
+        return _GENERATION_STRS[self]
+
+
+# Version group and generation names from PokeAPI. Anything that isn't listed here is treated
+# as Gen 1 by fromStr(), and as unknown by fromKnownStr().
+
+_GENERATIONS_BY_STR = {
+    'red-blue': PokepediaGeneration.GENERATION_1,
+    'yellow': PokepediaGeneration.GENERATION_1,
+    'generation-i': PokepediaGeneration.GENERATION_1,
+    'gold-silver': PokepediaGeneration.GENERATION_2,
+    'crystal': PokepediaGeneration.GENERATION_2,
+    'generation-ii': PokepediaGeneration.GENERATION_2,
+    'ruby-sapphire': PokepediaGeneration.GENERATION_3,
+    'emerald': PokepediaGeneration.GENERATION_3,
+    'firered-leafgreen': PokepediaGeneration.GENERATION_3,
+    'generation-iii': PokepediaGeneration.GENERATION_3,
+    'diamond-pearl': PokepediaGeneration.GENERATION_4,
+    'platinum': PokepediaGeneration.GENERATION_4,
+    'heartgold-soulsilver': PokepediaGeneration.GENERATION_4,
+    'generation-iv': PokepediaGeneration.GENERATION_4,
+    'black-white': PokepediaGeneration.GENERATION_5,
+    'black-2-white-2': PokepediaGeneration.GENERATION_5,
+    'generation-v': PokepediaGeneration.GENERATION_5,
+    'x-y': PokepediaGeneration.GENERATION_6,
+    'omega-ruby-alpha-sapphire': PokepediaGeneration.GENERATION_6,
+    'generation-vi': PokepediaGeneration.GENERATION_6,
+    'sun-moon': PokepediaGeneration.GENERATION_7,
+    'ultra-sun-ultra-moon': PokepediaGeneration.GENERATION_7,
+    'generation-vii': PokepediaGeneration.GENERATION_7,
+    'sword-shield': PokepediaGeneration.GENERATION_8,
+    'brilliant-diamond-shining-pearl': PokepediaGeneration.GENERATION_8,
+    'generation-viii': PokepediaGeneration.GENERATION_8
+}
+
+_NEWEST_GENERATION = list(PokepediaGeneration)[-1]
+
+_EARLY_GENERATIONS = frozenset({ PokepediaGeneration.GENERATION_1, PokepediaGeneration.GENERATION_2, PokepediaGeneration.GENERATION_3 })
+
+_GENERATION_STRS = { generation: f'G{index}' for index, generation in enumerate(PokepediaGeneration, start = 1) }
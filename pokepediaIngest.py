@@ -0,0 +1,264 @@
+import csv
+import os
+import sys
+from typing import Dict, Iterator, List
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.pokepediaDatabase import PokepediaDatabase
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaPokemon import PokepediaPokemon
+    from CynanBotCommon.pokepediaRepository import PokepediaRepository
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from pokepediaDatabase import PokepediaDatabase
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaPokemon import PokepediaPokemon
+    from pokepediaRepository import PokepediaRepository
+
+
+# This file is meant to be run by hand, separately from the others in this repository. It bulk
+# loads Pokemon move and Pokemon data into a PokepediaDatabase, so that PokepediaRepository can
+# answer most searches without calling PokeAPI at all. There are two supported sources:
+#
+# 1. The CSV files that PokeAPI is built from (https://github.com/PokeAPI/pokeapi/tree/master/data/v2/csv):
+# python pokepediaIngest.py csv <csvDirectory> [<databaseFile>]
+#
+# 2. A directory of move responses that were previously recorded from https://pokeapi.co/api/v2/move/{name}/
+# python pokepediaIngest.py crawl <jsonDirectory> [<databaseFile>]
+
+ENGLISH_LANGUAGE_ID = '9'
+
+def iterateCsv(csvDirectory: str, fileName: str) -> Iterator[Dict[str, str]]:
+    # for CSV files that are too big to comfortably read all at once
+    with open(os.path.join(csvDirectory, fileName), 'r', encoding = 'utf-8', newline = '') as file:
+        yield from csv.DictReader(file)
+
+def readCsv(csvDirectory: str, fileName: str) -> List[Dict[str, str]]:
+    return list(iterateCsv(csvDirectory, fileName))
+
+def readIdentifiers(csvDirectory: str, fileName: str) -> Dict[str, str]:
+    return { row['id']: row['identifier'] for row in readCsv(csvDirectory, fileName) }
+
+def toIntOrNone(text: str) -> int:
+    if utils.isValidStr(text):
+        return int(text)
+    else:
+        return None
+
+def createMoveJson(
+    moveRow: Dict[str, str],
+    names: List[Dict],
+    flavorTexts: List[Dict],
+    changelogRows: List[Dict[str, str]],
+    damageClasses: Dict[str, str],
+    generations: Dict[str, str],
+    types: Dict[str, str],
+    versionGroups: Dict[str, str]
+) -> Dict:
+    # builds up the same shape of JSON that https://pokeapi.co/api/v2/move/{name}/ returns, so
+    # that it can be reduced by the exact same code that PokepediaRepository uses
+    pastValues = list()
+
+    for changelogRow in changelogRows:
+        typeId = changelogRow['type_id']
+
+        pastValues.append({
+            'accuracy': toIntOrNone(changelogRow['accuracy']),
+            'power': toIntOrNone(changelogRow['power']),
+            'pp': toIntOrNone(changelogRow['pp']),
+            'type': { 'name': types[typeId] } if utils.isValidStr(typeId) else None,
+            'version_group': { 'name': versionGroups[changelogRow['changed_in_version_group_id']] }
+        })
+
+    return {
+        'id': int(moveRow['id']),
+        'name': moveRow['identifier'],
+        'accuracy': toIntOrNone(moveRow['accuracy']),
+        'power': toIntOrNone(moveRow['power']),
+        'pp': toIntOrNone(moveRow['pp']),
+        'damage_class': { 'name': damageClasses[moveRow['damage_class_id']] },
+        'generation': { 'name': generations[moveRow['generation_id']] },
+        'type': { 'name': types[moveRow['type_id']] },
+        'flavor_text_entries': flavorTexts,
+        'names': names,
+        'past_values': pastValues
+    }
+
+def ingestCsvLearnsets(csvDirectory: str, pokepediaDatabase: PokepediaDatabase):
+    # pokemon_moves.csv lists every way that every Pokemon (including alternate forms) learns
+    # every move in every version group, so it's reduced down to distinct (moveId, pokedexId)
+    # pairs, with alternate forms counted as their species
+    versionGroupGenerations = { row['id']: int(row['generation_id']) for row in readCsv(csvDirectory, 'version_groups.csv') }
+    generationCount = len(PokepediaGeneration)
+    pokemonSpeciesIds = { row['id']: int(row['species_id']) for row in readCsv(csvDirectory, 'pokemon.csv') }
+    learnsets = set()
+
+    for row in iterateCsv(csvDirectory, 'pokemon_moves.csv'):
+        if versionGroupGenerations[row['version_group_id']] <= generationCount:
+            learnsets.add((int(row['move_id']), pokemonSpeciesIds[row['pokemon_id']]))
+
+    pokepediaDatabase.addLearnsets(sorted(learnsets))
+    print(f'Ingested {len(learnsets)} Pokemon learnset entries')
+
+def ingestCsvMoves(csvDirectory: str, pokepediaDatabase: PokepediaDatabase):
+    damageClasses = readIdentifiers(csvDirectory, 'move_damage_classes.csv')
+    generations = readIdentifiers(csvDirectory, 'generations.csv')
+    types = readIdentifiers(csvDirectory, 'types.csv')
+    versionGroups = readIdentifiers(csvDirectory, 'version_groups.csv')
+
+    generationCount = len(PokepediaGeneration)
+
+    names = dict()
+    for row in readCsv(csvDirectory, 'move_names.csv'):
+        if row['local_language_id'] == ENGLISH_LANGUAGE_ID:
+            names.setdefault(row['move_id'], list()).append({ 'name': row['name'], 'language': { 'name': 'en' } })
+
+    flavorTexts = dict()
+    for row in sorted(readCsv(csvDirectory, 'move_flavor_text.csv'), key = lambda row: int(row['version_group_id'])):
+        if row['language_id'] == ENGLISH_LANGUAGE_ID:
+            flavorTexts.setdefault(row['move_id'], list()).append({ 'flavor_text': row['flavor_text'], 'language': { 'name': 'en' } })
+
+    # changes from generations that PokepediaGeneration doesn't have yet are kept, since they hold
+    # the values that the known generations had (see PokepediaRepository.parseMove())
+    changelogs = dict()
+    for row in sorted(readCsv(csvDirectory, 'move_changelog.csv'), key = lambda row: int(row['changed_in_version_group_id'])):
+        changelogs.setdefault(row['move_id'], list()).append(row)
+
+    pokepediaRepository = PokepediaRepository()
+    moves = list()
+
+    for moveRow in readCsv(csvDirectory, 'moves.csv'):
+        moveId = moveRow['id']
+
+        if int(moveRow['generation_id']) > generationCount or types[moveRow['type_id']] in ('shadow', 'unknown'):
+            continue
+
+        moveJson = createMoveJson(
+            moveRow = moveRow,
+            names = names.get(moveId, list()),
+            flavorTexts = flavorTexts.get(moveId, list()),
+            changelogRows = changelogs.get(moveId, list()),
+            damageClasses = damageClasses,
+            generations = generations,
+            types = types,
+            versionGroups = versionGroups
+        )
+
+        try:
+            moves.append(pokepediaRepository.parseMove(moveJson))
+        except (RuntimeError, ValueError) as e:
+            print(f'Skipping Pokemon move \"{moveRow["identifier"]}\": {e}')
+
+    pokepediaDatabase.addMoves(moves)
+    print(f'Ingested {len(moves)} Pokemon move(s)')
+
+def ingestCsvPokemon(csvDirectory: str, pokepediaDatabase: PokepediaDatabase):
+    generations = list(PokepediaGeneration)
+
+    elementTypes = dict()
+    for typeId, identifier in readIdentifiers(csvDirectory, 'types.csv').items():
+        try:
+            elementTypes[typeId] = PokepediaElementType.fromStr(identifier)
+        except ValueError:
+            # the shadow and unknown types have no PokepediaElementType
+            pass
+
+    speciesGenerationIds = { row['id']: int(row['generation_id']) for row in readCsv(csvDirectory, 'pokemon_species.csv') }
+    speciesNames = { row['pokemon_species_id']: row['name'] for row in readCsv(csvDirectory, 'pokemon_species_names.csv') if row['local_language_id'] == ENGLISH_LANGUAGE_ID }
+
+    currentTypes = dict()
+    for row in sorted(readCsv(csvDirectory, 'pokemon_types.csv'), key = lambda row: int(row['slot'])):
+        currentTypes.setdefault(row['pokemon_id'], list()).append(elementTypes.get(row['type_id']))
+
+    pastTypeRows = dict()
+    for row in sorted(readCsv(csvDirectory, 'pokemon_types_past.csv'), key = lambda row: int(row['slot'])):
+        pastTypeRows.setdefault(row['pokemon_id'], dict()).setdefault(int(row['generation_id']), list()).append(elementTypes.get(row['type_id']))
+
+    # Past types are the ones a Pokemon had up to and including the given generation, so past
+    # types from a generation that PokepediaGeneration doesn't have yet were still had in the
+    # newest one it does have, unless that generation has past types of its own
+    pastTypes = dict()
+    for pokemonId, typesByGenerationId in pastTypeRows.items():
+        for generationId in sorted(typesByGenerationId):
+            generation = generations[min(generationId, len(generations)) - 1]
+            pastTypes.setdefault(pokemonId, dict()).setdefault(generation, typesByGenerationId[generationId])
+
+    pokepediaRepository = PokepediaRepository()
+    pokemons = list()
+
+    for pokemonRow in readCsv(csvDirectory, 'pokemon.csv'):
+        pokemonId = pokemonRow['id']
+        speciesId = pokemonRow['species_id']
+        speciesGenerationId = speciesGenerationIds[speciesId]
+
+        if speciesGenerationId > len(generations) or None in currentTypes.get(pokemonId, [ None ]):
+            continue
+
+        if pokemonRow['is_default'] == '1' and speciesId in speciesNames:
+            name = speciesNames[speciesId]
+        else:
+            name = pokemonRow['identifier'].replace('-', ' ').title()
+
+        pokemons.append(PokepediaPokemon(
+            generationElementTypes = pokepediaRepository.createGenerationElementTypes(
+                speciesGeneration = generations[speciesGenerationId - 1],
+                currentElementTypes = currentTypes[pokemonId],
+                pastElementTypes = pastTypes.get(pokemonId, dict())
+            ),
+            pokedexId = int(speciesId),
+            name = name,
+            rawName = pokemonRow['identifier']
+        ))
+
+    pokepediaDatabase.addPokemons(pokemons)
+    print(f'Ingested {len(pokemons)} Pokemon')
+
+def ingestCrawledMoves(jsonDirectory: str, pokepediaDatabase: PokepediaDatabase):
+    pokepediaRepository = PokepediaRepository()
+    moves = list()
+
+    for fileName in sorted(os.listdir(jsonDirectory)):
+        if not fileName.endswith('.json'):
+            continue
+
+        with open(os.path.join(jsonDirectory, fileName), 'rb') as file:
+            jsonResponse = utils.loadJson(file.read())
+
+        try:
+            moves.append(pokepediaRepository.parseMove(jsonResponse))
+        except (RuntimeError, ValueError) as e:
+            print(f'Skipping Pokemon move file \"{fileName}\": {e}')
+
+    pokepediaDatabase.addMoves(moves)
+    print(f'Ingested {len(moves)} Pokemon move(s)')
+
+def main():
+    args = sys.argv[1:]
+
+    if len(args) < 2 or args[0] not in ('csv', 'crawl') or not os.path.isdir(args[1]):
+        print('python pokepediaIngest.py csv <csvDirectory> [<databaseFile>]')
+        print('python pokepediaIngest.py crawl <jsonDirectory> [<databaseFile>]')
+        sys.exit(1)
+
+    if len(args) >= 3:
+        backingDatabase = BackingDatabase(args[2])
+    else:
+        backingDatabase = BackingDatabase()
+
+    pokepediaDatabase = PokepediaDatabase(backingDatabase)
+
+    if args[0] == 'csv':
+        ingestCsvMoves(args[1], pokepediaDatabase)
+        ingestCsvPokemon(args[1], pokepediaDatabase)
+        ingestCsvLearnsets(args[1], pokepediaDatabase)
+    else:
+        ingestCrawledMoves(args[1], pokepediaDatabase)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+from typing import Collection, List, Tuple
+
+import numpy as np
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaDatabase import PokepediaDatabase
+except:
+    import utils
+    from pokepediaDatabase import PokepediaDatabase
+
+
+class PokepediaLearnsetIndex():
+
+    # An inverted index of which Pokemon can learn which moves, in both directions. Each direction
+    # is stored the way a compressed sparse row matrix is: a sorted array of keys (move IDs, or
+    # Pokedex IDs), an array of offsets, and one flat sorted array of values, where the values for
+    # keys[i] are values[offsets[i]:offsets[i + 1]]. Finding a key is a binary search, checking
+    # a single move or Pokemon is another binary search within its (sorted) values, and "learns
+    # all of these" queries are intersections of sorted arrays. Every array is 32-bit, so even
+    # the full set of PokeAPI learnsets takes up well under a megabyte.
+
+    def __init__(self, learnsets: Collection[Tuple[int, int]]):
+        # learnsets is a collection of (moveId, pokedexId) pairs, duplicates are fine
+        if learnsets is None:
+            raise ValueError(f'learnsets argument is malformed: \"{learnsets}\"')
+
+        pairs = np.array(list(learnsets), dtype = np.int32).reshape(-1, 2)
+
+        # np.unique() sorts the pairs by move ID and then by Pokedex ID
+        pairs = np.unique(pairs, axis = 0)
+        self.__moveKeys, self.__moveOffsets, self.__moveValues = self.__createIndex(pairs[:, 0], pairs[:, 1])
+
+        pairs = pairs[np.lexsort((pairs[:, 0], pairs[:, 1]))]
+        self.__pokedexKeys, self.__pokedexOffsets, self.__pokedexValues = self.__createIndex(pairs[:, 1], pairs[:, 0])
+
+    def canLearn(self, pokedexId: int, moveId: int) -> bool:
+        if not utils.isValidNum(pokedexId):
+            raise ValueError(f'pokedexId argument is malformed: \"{pokedexId}\"')
+        elif not utils.isValidNum(moveId):
+            raise ValueError(f'moveId argument is malformed: \"{moveId}\"')
+
+        pokedexIds = self.__getValues(self.__moveKeys, self.__moveOffsets, self.__moveValues, moveId)
+        index = np.searchsorted(pokedexIds, pokedexId)
+        return bool(index < len(pokedexIds) and pokedexIds[index] == pokedexId)
+
+    def __createIndex(self, keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # keys must already be sorted, and values sorted within each key
+        uniqueKeys, starts = np.unique(keys, return_index = True)
+        offsets = np.append(starts, len(keys)).astype(np.int32)
+        values = np.ascontiguousarray(values, dtype = np.int32)
+
+        for array in (uniqueKeys, offsets, values):
+            array.flags.writeable = False
+
+        return uniqueKeys, offsets, values
+
+    @classmethod
+    def fromDatabase(cls, pokepediaDatabase: PokepediaDatabase):
+        if pokepediaDatabase is None:
+            raise ValueError(f'pokepediaDatabase argument is malformed: \"{pokepediaDatabase}\"')
+
+        return cls(pokepediaDatabase.getLearnsets())
+
+    def getByteSize(self) -> int:
+        arrays = [
+            self.__moveKeys, self.__moveOffsets, self.__moveValues,
+            self.__pokedexKeys, self.__pokedexOffsets, self.__pokedexValues
+        ]
+
+        return sum(array.nbytes for array in arrays)
+
+    def getMoveIds(self, pokedexId: int) -> np.ndarray:
+        # returns the sorted IDs of every move that the given Pokemon can learn
+        if not utils.isValidNum(pokedexId):
+            raise ValueError(f'pokedexId argument is malformed: \"{pokedexId}\"')
+
+        return self.__getValues(self.__pokedexKeys, self.__pokedexOffsets, self.__pokedexValues, pokedexId)
+
+    def getMoveIdsForAll(self, pokedexIds: List[int]) -> np.ndarray:
+        # returns the sorted IDs of every move that all of the given Pokemon can learn
+        if not utils.hasItems(pokedexIds):
+            raise ValueError(f'pokedexIds argument is malformed: \"{pokedexIds}\"')
+
+        return self.__intersect([ self.getMoveIds(pokedexId) for pokedexId in pokedexIds ])
+
+    def getPokedexIds(self, moveId: int) -> np.ndarray:
+        # returns the sorted Pokedex IDs of every Pokemon that can learn the given move
+        if not utils.isValidNum(moveId):
+            raise ValueError(f'moveId argument is malformed: \"{moveId}\"')
+
+        return self.__getValues(self.__moveKeys, self.__moveOffsets, self.__moveValues, moveId)
+
+    def getPokedexIdsForAll(self, moveIds: List[int]) -> np.ndarray:
+        # returns the sorted Pokedex IDs of every Pokemon that can learn all of the given moves
+        if not utils.hasItems(moveIds):
+            raise ValueError(f'moveIds argument is malformed: \"{moveIds}\"')
+
+        return self.__intersect([ self.getPokedexIds(moveId) for moveId in moveIds ])
+
+    def getSize(self) -> int:
+        return len(self.__moveValues)
+
+    def __getValues(self, keys: np.ndarray, offsets: np.ndarray, values: np.ndarray, key: int) -> np.ndarray:
+        index = np.searchsorted(keys, key)
+
+        if index < len(keys) and keys[index] == key:
+            return values[offsets[index]:offsets[index + 1]]
+        else:
+            return values[0:0]
+
+    def __intersect(self, arrays: List[np.ndarray]) -> np.ndarray:
+        # starting from the smallest array keeps every intermediate result as small as possible
+        arrays = sorted(arrays, key = len)
+        result = arrays[0]
+
+        for array in arrays[1:]:
+            if len(result) == 0:
+                break
+
+            result = np.intersect1d(result, array, assume_unique = True)
+
+        return result
@@ -0,0 +1,87 @@
+from typing import Dict, List
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaMoveGeneration import PokepediaMoveGeneration
+except:
+    import utils
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaMoveGeneration import PokepediaMoveGeneration
+
+
+class PokepediaMove():
+
+    def __init__(
+        self,
+        generationMoves: Dict[PokepediaGeneration, PokepediaMoveGeneration],
+        moveId: int,
+        description: str,
+        name: str,
+        rawName: str,
+        learnedByPokedexIds: List[int] = None
+    ):
+        if not utils.hasItems(generationMoves):
+            raise ValueError(f'generationMoves argument is malformed: \"{generationMoves}\"')
+        elif not utils.isValidNum(moveId):
+            raise ValueError(f'moveId argument is malformed: \"{moveId}\"')
+        elif not utils.isValidStr(description):
+            raise ValueError(f'description argument is malformed: \"{description}\"')
+        elif not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+        elif not utils.isValidStr(rawName):
+            raise ValueError(f'rawName argument is malformed: \"{rawName}\"')
+
+        self.__generationMoves = generationMoves
+        self.__moveId = moveId
+        self.__description = description
+        self.__name = name
+        self.__rawName = rawName
+
+        # The Pokedex IDs of every Pokemon that can learn this move, or None when they aren't
+        # known. They're only kept until the move is written to a PokepediaDatabase (see
+        # PokepediaLearnsetIndex), so moves read back from one don't have them.
+        self.__learnedByPokedexIds = learnedByPokedexIds
+
+    def getDescription(self) -> str:
+        return self.__description
+
+    def getGenerationMoves(self) -> Dict[PokepediaGeneration, PokepediaMoveGeneration]:
+        return self.__generationMoves
+
+    def getLearnedByPokedexIds(self) -> List[int]:
+        return self.__learnedByPokedexIds
+
+    def getMoveId(self) -> int:
+        return self.__moveId
+
+    def getName(self) -> str:
+        return self.__name
+
+    def getRawName(self) -> str:
+        return self.__rawName
+
+    def toStr(self, delimiter: str = '; ') -> str:
+        if delimiter is None:
+            raise ValueError(f'delimiter argument is malformed: \"{delimiter}\"')
+
+        genMoveStrings = list()
+
+        for gen in PokepediaGeneration:
+            if gen in self.__generationMoves:
+                genMove = self.__generationMoves[gen]
+                genMoveStrings.append(genMove.toStr())
+
+        genMoveString = delimiter.join(genMoveStrings)
+        return f'{self.getName()} — {genMoveString}'
+
+    def toStrList(self) -> List[str]:
+        genMoveStrings = list()
+        genMoveStrings.append(f'{self.getName()} — {self.getDescription()}')
+
+        for gen in PokepediaGeneration:
+            if gen in self.__generationMoves:
+                genMove = self.__generationMoves[gen]
+                genMoveStrings.append(genMove.toStr())
+
+        return genMoveStrings
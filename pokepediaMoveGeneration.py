@@ -0,0 +1,96 @@
+import locale
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaDamageClass import PokepediaDamageClass
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+except:
+    import utils
+    from pokepediaDamageClass import PokepediaDamageClass
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+
+
+class PokepediaMoveGeneration():
+
+    # There's one of these for every generation of every move, so __slots__ keeps each one small.
+
+    __slots__ = ('__accuracy', '__power', '__pp', '__damageClass', '__elementType', '__generation')
+
+    def __init__(
+        self,
+        accuracy: int,
+        power: int,
+        pp: int,
+        damageClass: PokepediaDamageClass,
+        elementType: PokepediaElementType,
+        generation: PokepediaGeneration
+    ):
+        if not utils.isValidNum(pp):
+            raise ValueError(f'pp argument is malformed: \"{pp}\"')
+        elif damageClass is None:
+            raise ValueError(f'damageClass argument is malformed: \"{damageClass}\"')
+        elif elementType is None:
+            raise ValueError(f'elementType argument is malformed: \"{elementType}\"')
+        elif generation is None:
+            raise ValueError(f'generation argument is malformed: \"{generation}\"')
+
+        self.__accuracy = accuracy
+        self.__power = power
+        self.__pp = pp
+        self.__damageClass = damageClass
+        self.__elementType = elementType
+        self.__generation = generation
+
+    def getAccuracy(self) -> int:
+        return self.__accuracy
+
+    def getAccuracyStr(self) -> str:
+        if self.hasAccuracy():
+            formattedAccuracy = locale.format_string("%d", self.__accuracy, grouping = True)
+            return f'{formattedAccuracy}%'
+        else:
+            raise RuntimeError(f'This PokepediaGenerationMove ({self}) does not have an accuracy value!')
+
+    def getDamageClass(self) -> PokepediaDamageClass:
+        return self.__damageClass
+
+    def getElementType(self) -> PokepediaElementType:
+        return self.__elementType
+
+    def getGeneration(self) -> PokepediaGeneration:
+        return self.__generation
+
+    def getPower(self) -> int:
+        return self.__power
+
+    def getPowerStr(self) -> str:
+        if self.hasPower():
+            return locale.format_string("%d", self.__power, grouping = True)
+        else:
+            raise RuntimeError(f'This PokepediaGenerationMove ({self}) does not have a power value!')
+
+    def getPp(self) -> int:
+        return self.__pp
+
+    def getPpStr(self) -> str:
+        formattedPp = locale.format_string("%d", self.__pp, grouping = True)
+        return f'{formattedPp}pp'
+
+    def hasAccuracy(self) -> bool:
+        return utils.isValidNum(self.__accuracy)
+
+    def hasPower(self) -> bool:
+        return utils.isValidNum(self.__power)
+
+    def toStr(self) -> str:
+        powerStr = ''
+        if self.hasPower():
+            powerStr = f'💪 {self.getPowerStr()}, '
+
+        accuracyStr = ''
+        if self.hasAccuracy():
+            accuracyStr = f'🎯 {self.getAccuracyStr()}, '
+
+        return f'{self.__generation.toStr()}: {powerStr}{accuracyStr}{self.getPpStr()}, {self.__elementType.getEmojiOrStr().lower()} type, {self.__damageClass.toStr().lower()}'
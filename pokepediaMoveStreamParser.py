@@ -0,0 +1,130 @@
+from json.decoder import JSONDecodeError
+from typing import Dict, List
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+# ijson lets us read a response body as a stream of parse events instead of decoding the whole
+# thing, but it's an optional dependency, so we fall back to decoding the whole body when it's
+# not installed.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class PokepediaMoveStreamParser():
+
+    # PokeAPI move responses are mostly made up of arrays that PokepediaRepository never reads
+    # ("machines", "contest_combos", and "flavor_text_entries" and "names" in every language).
+    # This parser reads a move response as a stream and builds up a much smaller dictionary, in
+    # the same shape as the original response, holding only the fields that
+    # PokepediaRepository.parseMove() uses. Only the first English entry of each of
+    # "flavor_text_entries" and "names" is kept (that's all parseMove() looks at), and of
+    # "learned_by_pokemon", only each entry's URL is kept. The whole response is still read,
+    # since PokeAPI orders its keys alphabetically and "type" is one of the very last.
+
+    def __init__(self):
+        self.__scalarPrefixes = { 'accuracy', 'id', 'name', 'power', 'pp' }
+        self.__namedResourcePrefixes = { 'damage_class.name', 'generation.name', 'type.name' }
+        self.__scalarEvents = { 'boolean', 'double', 'integer', 'null', 'number', 'string' }
+
+    def __isEnglish(self, item: Dict) -> bool:
+        language = item.get('language')
+        return isinstance(language, dict) and language.get('name') == 'en'
+
+    def isStreaming(self) -> bool:
+        return ijson is not None
+
+    def parse(self, stream) -> Dict:
+        # Takes a binary file-like object (e.g. a requests response's "raw" stream) and raises
+        # JSONDecodeError if it doesn't contain valid JSON, the same as utils.loadJson() does.
+        if stream is None:
+            raise ValueError(f'stream argument is malformed: \"{stream}\"')
+
+        if ijson is None:
+            return self.__trim(utils.loadJson(stream.read()))
+
+        result = dict()
+        flavorTextEntries: List[Dict] = list()
+        names: List[Dict] = list()
+        pastValues: List[Dict] = list()
+        arrays = {
+            'flavor_text_entries.item': flavorTextEntries,
+            'names.item': names,
+            'past_values.item': pastValues
+        }
+
+        learnedByPokemon: List[Dict] = list()
+
+        builder = None
+        builderPrefix = None
+
+        try:
+            # a small read buffer keeps the peak memory use well below the size of the response
+            for prefix, event, value in ijson.parse(stream, buf_size = 4096, use_float = True):
+                if builder is not None:
+                    builder.event(event, value)
+
+                    if event == 'end_map' and prefix == builderPrefix:
+                        item = builder.value
+                        builder = None
+
+                        if builderPrefix == 'past_values.item' or (not utils.hasItems(arrays[builderPrefix]) and self.__isEnglish(item)):
+                            arrays[builderPrefix].append(item)
+                elif event == 'start_map' and prefix in arrays:
+                    # there's no point building any more entries once an English one is found
+                    if prefix == 'past_values.item' or not utils.hasItems(arrays[prefix]):
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        builderPrefix = prefix
+                elif event == 'start_array' and prefix in ('flavor_text_entries', 'names'):
+                    result[prefix] = arrays[f'{prefix}.item']
+                elif event == 'start_array' and prefix == 'learned_by_pokemon':
+                    learnedByPokemon = list()
+                elif event == 'end_array' and prefix == 'learned_by_pokemon':
+                    result[prefix] = learnedByPokemon
+                elif event == 'string' and prefix == 'learned_by_pokemon.item.url':
+                    learnedByPokemon.append({ 'url': value })
+                elif event == 'end_array' and prefix == 'past_values':
+                    # unlike the other arrays, every entry of this one is needed
+                    result[prefix] = pastValues
+                elif event in self.__scalarEvents:
+                    if prefix in self.__scalarPrefixes:
+                        result[prefix] = value
+                    elif prefix in self.__namedResourcePrefixes:
+                        result[prefix.split('.')[0]] = { 'name': value }
+        except ijson.JSONError as e:
+            raise JSONDecodeError(str(e), '', 0)
+
+        return result
+
+    def __trim(self, jsonResponse: Dict) -> Dict:
+        if not isinstance(jsonResponse, dict):
+            return jsonResponse
+
+        result = dict()
+
+        for key in self.__scalarPrefixes:
+            if key in jsonResponse:
+                result[key] = jsonResponse[key]
+
+        for prefix in self.__namedResourcePrefixes:
+            key = prefix.split('.')[0]
+
+            if isinstance(jsonResponse.get(key), dict):
+                result[key] = { 'name': jsonResponse[key].get('name') }
+
+        for key in ('flavor_text_entries', 'names'):
+            if isinstance(jsonResponse.get(key), list):
+                result[key] = [ item for item in jsonResponse[key] if isinstance(item, dict) and self.__isEnglish(item) ][:1]
+
+        if isinstance(jsonResponse.get('learned_by_pokemon'), list):
+            result['learned_by_pokemon'] = [ { 'url': item.get('url') } for item in jsonResponse['learned_by_pokemon'] if isinstance(item, dict) ]
+
+        if 'past_values' in jsonResponse:
+            result['past_values'] = jsonResponse['past_values']
+
+        return result
@@ -0,0 +1,315 @@
+from enum import Enum, auto
+from typing import Collection, Dict, List
+
+import numpy as np
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaDamageClass import PokepediaDamageClass
+    from CynanBotCommon.pokepediaDatabase import PokepediaDatabase
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaMove import PokepediaMove
+except:
+    import utils
+    from pokepediaDamageClass import PokepediaDamageClass
+    from pokepediaDatabase import PokepediaDatabase
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaMove import PokepediaMove
+
+
+class PokepediaMoveTableSortKey(Enum):
+
+    ACCURACY = auto()
+    POWER = auto()
+    PP = auto()
+
+
+class PokepediaMoveTableResult():
+
+    def __init__(
+        self,
+        accuracy: int,
+        power: int,
+        pp: int,
+        damageClass: PokepediaDamageClass,
+        elementType: PokepediaElementType,
+        generation: PokepediaGeneration,
+        moveId: int,
+        name: str,
+        rawName: str
+    ):
+        if damageClass is None:
+            raise ValueError(f'damageClass argument is malformed: \"{damageClass}\"')
+        elif elementType is None:
+            raise ValueError(f'elementType argument is malformed: \"{elementType}\"')
+        elif generation is None:
+            raise ValueError(f'generation argument is malformed: \"{generation}\"')
+        elif not utils.isValidNum(moveId):
+            raise ValueError(f'moveId argument is malformed: \"{moveId}\"')
+        elif not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+        elif not utils.isValidStr(rawName):
+            raise ValueError(f'rawName argument is malformed: \"{rawName}\"')
+
+        self.__accuracy = accuracy
+        self.__power = power
+        self.__pp = pp
+        self.__damageClass = damageClass
+        self.__elementType = elementType
+        self.__generation = generation
+        self.__moveId = moveId
+        self.__name = name
+        self.__rawName = rawName
+
+    def getAccuracy(self) -> int:
+        return self.__accuracy
+
+    def getDamageClass(self) -> PokepediaDamageClass:
+        return self.__damageClass
+
+    def getElementType(self) -> PokepediaElementType:
+        return self.__elementType
+
+    def getGeneration(self) -> PokepediaGeneration:
+        return self.__generation
+
+    def getMoveId(self) -> int:
+        return self.__moveId
+
+    def getName(self) -> str:
+        return self.__name
+
+    def getPower(self) -> int:
+        return self.__power
+
+    def getPp(self) -> int:
+        return self.__pp
+
+    def getRawName(self) -> str:
+        return self.__rawName
+
+    def hasAccuracy(self) -> bool:
+        return utils.isValidNum(self.__accuracy)
+
+    def hasPower(self) -> bool:
+        return utils.isValidNum(self.__power)
+
+    def toStr(self) -> str:
+        powerStr = ''
+        if self.hasPower():
+            powerStr = f', {self.__power} power'
+
+        accuracyStr = ''
+        if self.hasAccuracy():
+            accuracyStr = f', {self.__accuracy}% accuracy'
+
+        return f'{self.__name} ({self.__elementType.toStr()}, {self.__damageClass.toStr()}{powerStr}{accuracyStr}, {self.__pp} PP)'
+
+
+class PokepediaMoveTable():
+
+    # A columnar, in-memory copy of every move's stats in every generation, for answering queries
+    # like "the five strongest special Fire moves in Gen 3" without walking every PokepediaMove.
+    # There's one row per move per generation that the move exists in, holding the stats that
+    # were in effect in that generation (PokepediaMove only stores the generations in which its
+    # stats changed, so each generation in between repeats the most recent change). Rows are
+    # grouped by generation, so a query only ever looks at one contiguous slice of each column.
+    # Power and accuracy are NaN for moves that don't have them, so those moves never pass a
+    # power or accuracy filter, and always sort last.
+
+    def __init__(self, moves: List[PokepediaMove]):
+        if moves is None:
+            raise ValueError(f'moves argument is malformed: \"{moves}\"')
+
+        self.__damageClasses = list(PokepediaDamageClass)
+        self.__elementTypes = list(PokepediaElementType)
+        self.__generations = list(PokepediaGeneration)
+
+        self.__moves = sorted(moves, key = lambda move: move.getMoveId())
+        self.__createColumns()
+
+    @classmethod
+    def fromDatabase(cls, pokepediaDatabase: PokepediaDatabase):
+        if pokepediaDatabase is None:
+            raise ValueError(f'pokepediaDatabase argument is malformed: \"{pokepediaDatabase}\"')
+
+        return cls(pokepediaDatabase.getMoves())
+
+    def __createCodes(self, values: Collection, allValues: List) -> np.ndarray:
+        if not utils.hasItems(values):
+            return None
+
+        return np.array([ allValues.index(value) for value in set(values) ], dtype = np.int8)
+
+    def __createColumns(self):
+        damageClassIndexes = { damageClass: index for index, damageClass in enumerate(self.__damageClasses) }
+        elementTypeIndexes = { elementType: index for index, elementType in enumerate(self.__elementTypes) }
+
+        accuracies = list()
+        powers = list()
+        pps = list()
+        damageClasses = list()
+        elementTypes = list()
+        moveIndexes = list()
+        generationOffsets: Dict[PokepediaGeneration, int] = dict()
+
+        for generation in self.__generations:
+            generationOffsets[generation] = len(moveIndexes)
+
+            for moveIndex, move in enumerate(self.__moves):
+                generationMove = self.__getGenerationMove(move, generation)
+
+                if generationMove is None:
+                    continue
+
+                accuracies.append(generationMove.getAccuracy() if generationMove.hasAccuracy() else np.nan)
+                powers.append(generationMove.getPower() if generationMove.hasPower() else np.nan)
+                pps.append(generationMove.getPp())
+                damageClasses.append(damageClassIndexes[generationMove.getDamageClass()])
+                elementTypes.append(elementTypeIndexes[generationMove.getElementType()])
+                moveIndexes.append(moveIndex)
+
+        self.__accuracies = np.array(accuracies, dtype = np.float32)
+        self.__powers = np.array(powers, dtype = np.float32)
+        self.__pps = np.array(pps, dtype = np.int16)
+        self.__damageClassCodes = np.array(damageClasses, dtype = np.int8)
+        self.__elementTypeCodes = np.array(elementTypes, dtype = np.int8)
+        self.__moveIndexes = np.array(moveIndexes, dtype = np.int32)
+        self.__moveIds = np.array([ move.getMoveId() for move in self.__moves ], dtype = np.int32)[self.__moveIndexes]
+
+        self.__generationSlices: Dict[PokepediaGeneration, slice] = dict()
+        for index, generation in enumerate(self.__generations):
+            if index + 1 < len(self.__generations):
+                end = generationOffsets[self.__generations[index + 1]]
+            else:
+                end = len(moveIndexes)
+
+            self.__generationSlices[generation] = slice(generationOffsets[generation], end)
+
+    def __createResult(self, row: int, generation: PokepediaGeneration) -> PokepediaMoveTableResult:
+        move = self.__moves[self.__moveIndexes[row]]
+        accuracy = self.__accuracies[row]
+        power = self.__powers[row]
+
+        return PokepediaMoveTableResult(
+            accuracy = None if np.isnan(accuracy) else int(accuracy),
+            power = None if np.isnan(power) else int(power),
+            pp = int(self.__pps[row]),
+            damageClass = self.__damageClasses[self.__damageClassCodes[row]],
+            elementType = self.__elementTypes[self.__elementTypeCodes[row]],
+            generation = generation,
+            moveId = move.getMoveId(),
+            name = move.getName(),
+            rawName = move.getRawName()
+        )
+
+    def __getGenerationMove(self, move: PokepediaMove, generation: PokepediaGeneration):
+        # the stats in effect in the given generation are those from the most recent generation
+        # (at or before it) in which they changed, or None if the move didn't exist yet
+        generationMoves = move.getGenerationMoves()
+        generationIndex = self.__generations.index(generation)
+
+        for index in range(generationIndex, -1, -1):
+            if self.__generations[index] in generationMoves:
+                return generationMoves[self.__generations[index]]
+
+        return None
+
+    def getSize(self, generation: PokepediaGeneration = None) -> int:
+        if generation is None:
+            return len(self.__moveIndexes)
+
+        generationSlice = self.__generationSlices[generation]
+        return generationSlice.stop - generationSlice.start
+
+    def query(
+        self,
+        generation: PokepediaGeneration,
+        elementTypes: Collection[PokepediaElementType] = None,
+        damageClasses: Collection[PokepediaDamageClass] = None,
+        minPower: int = None,
+        maxPower: int = None,
+        minAccuracy: int = None,
+        minPp: int = None,
+        sortKey: PokepediaMoveTableSortKey = PokepediaMoveTableSortKey.POWER,
+        descending: bool = True,
+        limit: int = None
+    ) -> List[PokepediaMoveTableResult]:
+        # Returns the moves that pass every given filter in the given generation, sorted by
+        # sortKey (ties are broken by move ID). Filters that are None aren't applied.
+        if generation is None:
+            raise ValueError(f'generation argument is malformed: \"{generation}\"')
+        elif minPower is not None and not utils.isValidNum(minPower):
+            raise ValueError(f'minPower argument is malformed: \"{minPower}\"')
+        elif maxPower is not None and not utils.isValidNum(maxPower):
+            raise ValueError(f'maxPower argument is malformed: \"{maxPower}\"')
+        elif minAccuracy is not None and not utils.isValidNum(minAccuracy):
+            raise ValueError(f'minAccuracy argument is malformed: \"{minAccuracy}\"')
+        elif minPp is not None and not utils.isValidNum(minPp):
+            raise ValueError(f'minPp argument is malformed: \"{minPp}\"')
+        elif sortKey is None:
+            raise ValueError(f'sortKey argument is malformed: \"{sortKey}\"')
+        elif descending is None:
+            raise ValueError(f'descending argument is malformed: \"{descending}\"')
+        elif limit is not None and (not utils.isValidNum(limit) or limit < 1):
+            raise ValueError(f'limit argument is malformed: \"{limit}\"')
+
+        generationSlice = self.__generationSlices[generation]
+        accuracies = self.__accuracies[generationSlice]
+        powers = self.__powers[generationSlice]
+        pps = self.__pps[generationSlice]
+
+        mask = np.ones(len(pps), dtype = bool)
+
+        elementTypeCodes = self.__createCodes(elementTypes, self.__elementTypes)
+        if elementTypeCodes is not None:
+            mask &= np.isin(self.__elementTypeCodes[generationSlice], elementTypeCodes)
+
+        damageClassCodes = self.__createCodes(damageClasses, self.__damageClasses)
+        if damageClassCodes is not None:
+            mask &= np.isin(self.__damageClassCodes[generationSlice], damageClassCodes)
+
+        # comparisons against NaN are always False, so moves without power or accuracy drop out
+        if minPower is not None:
+            mask &= powers >= minPower
+
+        if maxPower is not None:
+            mask &= powers <= maxPower
+
+        if minAccuracy is not None:
+            mask &= accuracies >= minAccuracy
+
+        if minPp is not None:
+            mask &= pps >= minPp
+
+        rows = np.flatnonzero(mask)
+
+        if sortKey is PokepediaMoveTableSortKey.ACCURACY:
+            values = accuracies[rows]
+        elif sortKey is PokepediaMoveTableSortKey.POWER:
+            values = powers[rows]
+        else:
+            values = pps[rows].astype(np.float32)
+
+        if descending:
+            values = -values
+
+        # NaN has to be replaced so that it sorts last regardless of direction
+        values = np.where(np.isnan(values), np.inf, values)
+
+        if limit is not None and limit < len(rows):
+            # only the top rows need a full sort, so partition them out first (taking every row
+            # that ties with the last one, so that the move ID tie-break below stays correct)
+            threshold = np.partition(values, limit - 1)[limit - 1]
+            topRows = np.flatnonzero(values <= threshold)
+            rows = rows[topRows]
+            values = values[topRows]
+
+        order = np.lexsort((self.__moveIds[generationSlice][rows], values))
+
+        if limit is not None:
+            order = order[:limit]
+
+        return [ self.__createResult(generationSlice.start + row, generation) for row in rows[order] ]
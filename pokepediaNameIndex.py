@@ -0,0 +1,163 @@
+import heapq
+from bisect import bisect_left
+from typing import Dict, List
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class PokepediaNameIndex():
+
+    # An in-memory index over PokeAPI names (e.g. "thunder-punch") that tolerates typos. Names are
+    # reduced to a key of just their lowercase letters and digits, so "Thunder Punch", "thunderpunch"
+    # and "thunder-punch" all resolve the same way. Exact keys are a single dictionary lookup. For
+    # anything else, the trigrams of the key pick out a handful of candidates, and only those are
+    # ranked by edit distance, so a search never has to compare against every name.
+
+    def __init__(self, names: List[str], candidateCount: int = 16):
+        if names is None:
+            raise ValueError(f'names argument is malformed: \"{names}\"')
+        elif not utils.isValidNum(candidateCount) or candidateCount < 1:
+            raise ValueError(f'candidateCount argument is malformed: \"{candidateCount}\"')
+
+        self.__candidateCount = candidateCount
+        self.__names = list()
+        self.__keys = list()
+        self.__keysToNames: Dict[str, str] = dict()
+
+        for name in names:
+            key = self.__toKey(name)
+
+            if utils.isValidStr(key) and key not in self.__keysToNames:
+                self.__keysToNames[key] = name
+                self.__names.append(name)
+                self.__keys.append(key)
+
+        self.__sortedKeys = sorted(self.__keys)
+        self.__trigrams = self.__createTrigrams()
+
+    def autocomplete(self, prefix: str, maxResults: int = 5) -> List[str]:
+        if not utils.isValidNum(maxResults) or maxResults < 1:
+            raise ValueError(f'maxResults argument is malformed: \"{maxResults}\"')
+
+        prefix = self.__toKey(prefix)
+        if not utils.isValidStr(prefix):
+            return list()
+
+        results = list()
+        index = bisect_left(self.__sortedKeys, prefix)
+
+        while index < len(self.__sortedKeys) and len(results) < maxResults:
+            key = self.__sortedKeys[index]
+
+            if not key.startswith(prefix):
+                break
+
+            results.append(self.__keysToNames[key])
+            index = index + 1
+
+        return results
+
+    def __createTrigrams(self) -> Dict[str, List[int]]:
+        trigrams = dict()
+
+        for index, key in enumerate(self.__keys):
+            for trigram in self.__getTrigrams(key):
+                trigrams.setdefault(trigram, list()).append(index)
+
+        return trigrams
+
+    def getBestMatch(self, name: str) -> str:
+        # Returns the exact match for the given name if there is one, otherwise the closest name
+        # that is within a reasonable number of typos, otherwise None.
+        key = self.__toKey(name)
+        if not utils.isValidStr(key):
+            return None
+        elif key in self.__keysToNames:
+            return self.__keysToNames[key]
+
+        matches = self.__rank(key, 1)
+
+        if utils.hasItems(matches) and matches[0][0] <= self.__getMaxDistance(key):
+            return self.__names[matches[0][1]]
+        else:
+            return None
+
+    def __getDistance(self, first: str, second: str, maxDistance: int) -> int:
+        # Levenshtein distance, abandoned early (returning maxDistance + 1) once every cell in a
+        # row exceeds maxDistance, as no later row could then come in under it
+        if abs(len(first) - len(second)) > maxDistance:
+            return maxDistance + 1
+
+        previousRow = list(range(len(second) + 1))
+
+        for i, firstChar in enumerate(first, start = 1):
+            currentRow = [ i ]
+
+            for j, secondChar in enumerate(second, start = 1):
+                currentRow.append(min(
+                    previousRow[j] + 1,
+                    currentRow[j - 1] + 1,
+                    previousRow[j - 1] + (firstChar != secondChar)
+                ))
+
+            if min(currentRow) > maxDistance:
+                return maxDistance + 1
+
+            previousRow = currentRow
+
+        return previousRow[-1]
+
+    def __getMaxDistance(self, key: str) -> int:
+        # allows one typo for every four characters, but always at least one
+        return max(1, len(key) // 4)
+
+    def getSize(self) -> int:
+        return len(self.__names)
+
+    def __getTrigrams(self, key: str) -> List[str]:
+        padded = f'^{key}$'
+        return [ padded[index:index + 3] for index in range(len(padded) - 2) ]
+
+    def hasName(self, name: str) -> bool:
+        return self.__toKey(name) in self.__keysToNames
+
+    def __rank(self, key: str, maxResults: int) -> List:
+        sharedCounts = dict()
+
+        for trigram in set(self.__getTrigrams(key)):
+            for index in self.__trigrams.get(trigram, tuple()):
+                sharedCounts[index] = sharedCounts.get(index, 0) + 1
+
+        candidates = heapq.nlargest(self.__candidateCount, sharedCounts.items(), key = lambda item: item[1])
+        maxDistance = max(len(key), 1)
+        results = list()
+
+        for index, sharedCount in candidates:
+            distance = self.__getDistance(key, self.__keys[index], maxDistance)
+
+            if distance <= maxDistance:
+                results.append((distance, index, -sharedCount))
+
+        results.sort(key = lambda result: (result[0], result[2], len(self.__keys[result[1]])))
+        return results[:maxResults]
+
+    def search(self, name: str, maxResults: int = 5) -> List[str]:
+        # Returns up to maxResults names, closest first. Unlike getBestMatch(), this doesn't apply
+        # a typo limit, which makes it suitable for "did you mean" suggestions.
+        if not utils.isValidNum(maxResults) or maxResults < 1:
+            raise ValueError(f'maxResults argument is malformed: \"{maxResults}\"')
+
+        key = self.__toKey(name)
+        if not utils.isValidStr(key):
+            return list()
+
+        return [ self.__names[index] for _, index, _ in self.__rank(key, maxResults) ]
+
+    def __toKey(self, name: str) -> str:
+        if not utils.isValidStr(name):
+            return None
+
+        return ''.join(character for character in name.lower() if character.isalnum())
@@ -0,0 +1,64 @@
+import locale
+from typing import Dict, List
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+except:
+    import utils
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+
+
+class PokepediaPokemon():
+
+    def __init__(
+        self,
+        generationElementTypes: Dict[PokepediaGeneration, List[PokepediaElementType]],
+        pokedexId: int,
+        name: str,
+        rawName: str
+    ):
+        if not utils.hasItems(generationElementTypes):
+            raise ValueError(f'generationElementTypes argument is malformed: \"{generationElementTypes}\"')
+        elif not utils.isValidNum(pokedexId):
+            raise ValueError(f'pokedexId argument is malformed: \"{pokedexId}\"')
+        elif not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+        elif not utils.isValidStr(rawName):
+            raise ValueError(f'rawName argument is malformed: \"{rawName}\"')
+
+        self.__generationElementTypes = generationElementTypes
+        self.__pokedexId = pokedexId
+        self.__name = name
+        self.__rawName = rawName
+
+    def getGenerationElementTypes(self) -> Dict[PokepediaGeneration, List[PokepediaElementType]]:
+        return self.__generationElementTypes
+
+    def getName(self) -> str:
+        return self.__name
+
+    def getPokedexId(self) -> int:
+        return self.__pokedexId
+
+    def getPokedexIdStr(self) -> str:
+        return locale.format_string("%d", self.__pokedexId, grouping = True)
+
+    def getRawName(self) -> str:
+        return self.__rawName
+
+    def toStr(self, delimiter: str = '; ') -> str:
+        if delimiter is None:
+            raise ValueError(f'delimiter argument is malformed: \"{delimiter}\"')
+
+        genTypeStrings = list()
+
+        for gen in PokepediaGeneration:
+            if gen in self.__generationElementTypes:
+                elementTypesStr = '/'.join(elementType.toStr() for elementType in self.__generationElementTypes[gen])
+                genTypeStrings.append(f'{gen.toStr()}: {elementTypesStr}')
+
+        genTypeString = delimiter.join(genTypeStrings)
+        return f'{self.getName()} (#{self.getPokedexIdStr()}) — {genTypeString}'
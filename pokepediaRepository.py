@@ -1,5 +1,5 @@
-import locale
-from enum import Enum, auto
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from json.decoder import JSONDecodeError
 from typing import Dict, List
 
@@ -9,517 +9,402 @@ from urllib3.exceptions import MaxRetryError, NewConnectionError
 
 try:
     import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaDamageClass import PokepediaDamageClass
+    from CynanBotCommon.pokepediaDatabase import PokepediaDatabase
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaMove import PokepediaMove
+    from CynanBotCommon.pokepediaMoveGeneration import PokepediaMoveGeneration
+    from CynanBotCommon.pokepediaMoveStreamParser import \
+        PokepediaMoveStreamParser
+    from CynanBotCommon.pokepediaNameIndex import PokepediaNameIndex
+    from CynanBotCommon.pokepediaPokemon import PokepediaPokemon
+    from CynanBotCommon.responseSchema import (ResponseSchema,
+                                               ResponseSchemaError,
+                                               SchemaField, SchemaList)
+    from CynanBotCommon.timedDict import TimedDict
 except:
     import utils
+    from pokepediaDamageClass import PokepediaDamageClass
+    from pokepediaDatabase import PokepediaDatabase
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaMove import PokepediaMove
+    from pokepediaMoveGeneration import PokepediaMoveGeneration
+    from pokepediaMoveStreamParser import PokepediaMoveStreamParser
+    from pokepediaNameIndex import PokepediaNameIndex
+    from pokepediaPokemon import PokepediaPokemon
+    from responseSchema import (ResponseSchema, ResponseSchemaError,
+                                SchemaField, SchemaList)
+    from timedDict import TimedDict
 
 
-class PokepediaElementType(Enum):
-
-    BUG = auto()
-    DARK = auto()
-    DRAGON = auto()
-    ELECTRIC = auto()
-    FAIRY = auto()
-    FIGHTING = auto()
-    FIRE = auto()
-    FLYING = auto()
-    GHOST = auto()
-    GRASS = auto()
-    GROUND = auto()
-    ICE = auto()
-    NORMAL = auto()
-    POISON = auto()
-    PSYCHIC = auto()
-    ROCK = auto()
-    STEEL = auto()
-    WATER = auto()
-
-    @classmethod
-    def fromStr(cls, text: str):
-        if not utils.isValidStr(text):
-            raise ValueError(f'text argument is malformed: \"{text}\"')
-
-        if text == 'bug':
-            return cls.BUG
-        elif text == 'dark':
-            return cls.DARK
-        elif text == 'dragon':
-            return cls.DRAGON
-        elif text == 'electric':
-            return cls.ELECTRIC
-        elif text == 'fairy':
-            return cls.FAIRY
-        elif text == 'fighting':
-            return cls.FIGHTING
-        elif text == 'fire':
-            return cls.FIRE
-        elif text == 'flying':
-            return cls.FLYING
-        elif text == 'ghost':
-            return cls.GHOST
-        elif text == 'grass':
-            return cls.GRASS
-        elif text == 'ground':
-            return cls.GROUND
-        elif text == 'ice':
-            return cls.ICE
-        elif text == 'normal':
-            return cls.NORMAL
-        elif text == 'poison':
-            return cls.POISON
-        elif text == 'psychic':
-            return cls.PSYCHIC
-        elif text == 'rock':
-            return cls.ROCK
-        elif text == 'steel':
-            return cls.STEEL
-        elif text == 'water':
-            return cls.WATER
-        else:
-            raise ValueError(f'unknown PokepediaElementType: \"{text}\'')
-
-    def getEmoji(self) -> str:
-        if self is PokepediaElementType.BUG:
-            return '🐛'
-        elif self is PokepediaElementType.DRAGON:
-            return '🐲'
-        elif self is PokepediaElementType.ELECTRIC:
-            return '⚡'
-        elif self is PokepediaElementType.FIGHTING:
-            return '🥊'
-        elif self is PokepediaElementType.FIRE:
-            return '🔥'
-        elif self is PokepediaElementType.FLYING:
-            return '🐦'
-        elif self is PokepediaElementType.GHOST:
-            return '👻'
-        elif self is PokepediaElementType.GRASS:
-            return '🍃'
-        elif self is PokepediaElementType.ICE:
-            return '❄'
-        elif self is PokepediaElementType.POISON:
-            return '🧪'
-        elif self is PokepediaElementType.PSYCHIC:
-            return '🧠'
-        elif self is PokepediaElementType.WATER:
-            return '🌊'
-        else:
-            return None
-
-    def getEmojiOrStr(self) -> str:
-        emoji = self.getEmoji()
-
-        if utils.isValidStr(emoji):
-            return emoji
-        else:
-            return self.toStr()
-
-    def toStr(self) -> str:
-        if self is PokepediaElementType.BUG:
-            return 'Bug'
-        elif self is PokepediaElementType.DARK:
-            return 'Dark'
-        elif self is PokepediaElementType.DRAGON:
-            return 'Dragon'
-        elif self is PokepediaElementType.ELECTRIC:
-            return 'Electric'
-        elif self is PokepediaElementType.FAIRY:
-            return 'Fairy'
-        elif self is PokepediaElementType.FIGHTING:
-            return 'Fighting'
-        elif self is PokepediaElementType.FIRE:
-            return 'Fire'
-        elif self is PokepediaElementType.FLYING:
-            return 'Flying'
-        elif self is PokepediaElementType.GHOST:
-            return 'Ghost'
-        elif self is PokepediaElementType.GRASS:
-            return 'Grass'
-        elif self is PokepediaElementType.GROUND:
-            return 'Ground'
-        elif self is PokepediaElementType.ICE:
-            return 'Ice'
-        elif self is PokepediaElementType.NORMAL:
-            return 'Normal'
-        elif self is PokepediaElementType.POISON:
-            return 'Poison'
-        elif self is PokepediaElementType.PSYCHIC:
-            return 'Psychic'
-        elif self is PokepediaElementType.ROCK:
-            return 'Rock'
-        elif self is PokepediaElementType.STEEL:
-            return 'Steel'
-        elif self is PokepediaElementType.WATER:
-            return 'Water'
-        else:
-            raise RuntimeError(f'unknown PokepediaElementType: \"{self}\"')
-
-
-class PokepediaDamageClass(Enum):
-
-    PHYSICAL = auto()
-    SPECIAL = auto()
-    STATUS = auto()
-
-    @classmethod
-    def fromStr(cls, text: str):
-        if not utils.isValidStr(text):
-            raise ValueError(f'text argument is malformed: \"{text}\"')
-
-        if text == 'physical':
-            return cls.PHYSICAL
-        elif text == 'special':
-            return cls.SPECIAL
-        elif text == 'status':
-            return cls.STATUS
-        else:
-            raise ValueError(f'unknown PokepediaDamageClass: \"{text}\"')
-
-    # gen 1-3 have damage classes based off element type
-    @classmethod
-    def getTypeBasedDamageClass(cls, elementType: PokepediaElementType):
-        if elementType is None:
-            raise ValueError(f'elementType argument is malformed: \"{elementType}\"')
-
-        physicalList = [ PokepediaElementType.NORMAL, PokepediaElementType.FIGHTING, PokepediaElementType.FLYING, PokepediaElementType.POISON, PokepediaElementType.GROUND, PokepediaElementType.ROCK, PokepediaElementType.BUG, PokepediaElementType.GHOST, PokepediaElementType.STEEL ]
-        specialList = [ PokepediaElementType.FIRE, PokepediaElementType.WATER, PokepediaElementType.GRASS, PokepediaElementType.ELECTRIC, PokepediaElementType.PSYCHIC, PokepediaElementType.ICE, PokepediaElementType.DRAGON, PokepediaElementType.DARK ]
-
-        if elementType in physicalList:
-            return cls.PHYSICAL
-        elif elementType in specialList:
-            return cls.SPECIAL
-        else:
-            raise ValueError(f'unknown PokepediaElementType: \"{elementType}\"')
-
-    def toStr(self) -> str:
-        if self is PokepediaDamageClass.PHYSICAL:
-            return 'Physical'
-        elif self is PokepediaDamageClass.SPECIAL:
-            return 'Special'
-        elif self is PokepediaDamageClass.STATUS:
-            return 'Status'
-        else:
-            raise RuntimeError(f'unknown PokepediaDamageClass: \"{self}\"')
-
-
-class PokepediaGeneration(Enum):
-
-    GENERATION_1 = auto()
-    GENERATION_2 = auto()
-    GENERATION_3 = auto()
-    GENERATION_4 = auto()
-    GENERATION_5 = auto()
-    GENERATION_6 = auto()
-    GENERATION_7 = auto()
-    GENERATION_8 = auto()
-
-    @classmethod
-    def fromStr(cls, text: str):
-        if not utils.isValidStr(text):
-            raise ValueError(f'text argument is malformed: \"{text}\"')
-
-        if text == 'gold-silver' or text == 'crystal' or text == 'generation-ii':
-            return cls.GENERATION_2
-        elif text == 'ruby-sapphire' or text == 'emerald' or text == 'firered-leafgreen' or text == 'generation-iii':
-            return cls.GENERATION_3
-        elif text == 'diamond-pearl' or text == 'platinum' or text == 'heartgold-soulsilver' or text == 'generation-iv':
-            return cls.GENERATION_4
-        elif text == 'black-white' or text == 'black-2-white-2' or text == 'generation-v':
-            return cls.GENERATION_5
-        elif text == 'x-y' or text == 'omega-ruby-alpha-sapphire' or text == 'generation-vi':
-            return cls.GENERATION_6
-        elif text == 'sun-moon' or text == 'ultra-sun-ultra-moon' or text == 'generation-vii':
-            return cls.GENERATION_7
-        elif text == 'sword-shield' or text == 'brilliant-diamond-shining-pearl' or text == 'generation-viii':
-            return cls.GENERATION_8
-        else:
-            return cls.GENERATION_1
-
-    def isEarlyGeneration(self) -> bool:
-        return self is PokepediaGeneration.GENERATION_1 or self is PokepediaGeneration.GENERATION_2 or self is PokepediaGeneration.GENERATION_3
-
-    def toStr(self) -> str:
-        if self is PokepediaGeneration.GENERATION_1:
-            return 'G1'
-        elif self is PokepediaGeneration.GENERATION_2:
-            return 'G2'
-        elif self is PokepediaGeneration.GENERATION_3:
-            return 'G3'
-        elif self is PokepediaGeneration.GENERATION_4:
-            return 'G4'
-        elif self is PokepediaGeneration.GENERATION_5:
-            return 'G5'
-        elif self is PokepediaGeneration.GENERATION_6:
-            return 'G6'
-        elif self is PokepediaGeneration.GENERATION_7:
-            return 'G7'
-        elif self is PokepediaGeneration.GENERATION_8:
-            return 'G8'
-        else:
-            raise RuntimeError(f'unknown PokepediaGeneration: \"{self}\"')
-
-
-class PokepediaMoveGeneration():
+class PokepediaRepository():
 
     def __init__(
         self,
-        accuracy: int,
-        power: int,
-        pp: int,
-        damageClass: PokepediaDamageClass,
-        elementType: PokepediaElementType,
-        generation: PokepediaGeneration
+        pokepediaDatabase: PokepediaDatabase = None,
+        streamMoveResponses: bool = False,
+        maxConcurrentRequests: int = 2,
+        nameIndexRetryTimeDelta: timedelta = timedelta(minutes = 10)
     ):
-        if not utils.isValidNum(pp):
-            raise ValueError(f'pp argument is malformed: \"{pp}\"')
-        elif damageClass is None:
-            raise ValueError(f'damageClass argument is malformed: \"{damageClass}\"')
-        elif elementType is None:
-            raise ValueError(f'elementType argument is malformed: \"{elementType}\"')
-        elif generation is None:
-            raise ValueError(f'generation argument is malformed: \"{generation}\"')
-
-        self.__accuracy = accuracy
-        self.__power = power
-        self.__pp = pp
-        self.__damageClass = damageClass
-        self.__elementType = elementType
-        self.__generation = generation
-
-    def getAccuracy(self) -> int:
-        return self.__accuracy
-
-    def getAccuracyStr(self) -> str:
-        if self.hasAccuracy():
-            formattedAccuracy = locale.format_string("%d", self.__accuracy, grouping = True)
-            return f'{formattedAccuracy}%'
+        if streamMoveResponses is None:
+            raise ValueError(f'streamMoveResponses argument is malformed: \"{streamMoveResponses}\"')
+        elif not utils.isValidNum(maxConcurrentRequests) or maxConcurrentRequests < 2:
+            raise ValueError(f'maxConcurrentRequests argument is malformed: \"{maxConcurrentRequests}\"')
+        elif nameIndexRetryTimeDelta is None:
+            raise ValueError(f'nameIndexRetryTimeDelta argument is malformed: \"{nameIndexRetryTimeDelta}\"')
+
+        self.__pokepediaDatabase = pokepediaDatabase
+        self.__moveStreamParser: PokepediaMoveStreamParser = None
+
+        if streamMoveResponses:
+            self.__moveStreamParser = PokepediaMoveStreamParser()
+
+        # used to fetch the PokeAPI resources that make up a single Pokemon at the same time
+        self.__executor = ThreadPoolExecutor(max_workers = maxConcurrentRequests)
+
+        self.__moveSchema = self.__createMoveSchema()
+        self.__pokemonSchema = self.__createPokemonSchema()
+        self.__pokemonSpeciesSchema = self.__createPokemonSpeciesSchema()
+        self.__namedResourceListSchema = self.__createNamedResourceListSchema()
+        self.__moveNameIndex: PokepediaNameIndex = None
+        self.__pokemonNameIndex: PokepediaNameIndex = None
+
+        # when a name listing can't be fetched, it isn't tried again (by any search) until this
+        # much time has passed, so that searches don't each wait out PokeAPI's timeout
+        self.__nameIndexRetryTimes = TimedDict(timeDelta = nameIndexRetryTimeDelta)
+
+    def autocompleteMoves(self, prefix: str, maxResults: int = 5) -> List[str]:
+        moveNameIndex = self.__getMoveNameIndex()
+
+        if moveNameIndex is None:
+            return list()
         else:
-            raise RuntimeError(f'This PokepediaGenerationMove ({self}) does not have an accuracy value!')
-
-    def getDamageClass(self) -> PokepediaDamageClass:
-        return self.__damageClass
+            return moveNameIndex.autocomplete(prefix, maxResults)
 
-    def getElementType(self) -> PokepediaElementType:
-        return self.__elementType
+    def autocompletePokemon(self, prefix: str, maxResults: int = 5) -> List[str]:
+        pokemonNameIndex = self.__getPokemonNameIndex()
 
-    def getGeneration(self) -> PokepediaGeneration:
-        return self.__generation
-
-    def getPower(self) -> int:
-        return self.__power
-
-    def getPowerStr(self) -> str:
-        if self.hasPower():
-            return locale.format_string("%d", self.__power, grouping = True)
+        if pokemonNameIndex is None:
+            return list()
         else:
-            raise RuntimeError(f'This PokepediaGenerationMove ({self}) does not have a power value!')
-
-    def getPp(self) -> int:
-        return self.__pp
+            return pokemonNameIndex.autocomplete(prefix, maxResults)
 
-    def getPpStr(self) -> str:
-        formattedPp = locale.format_string("%d", self.__pp, grouping = True)
-        return f'{formattedPp}pp'
+    def __correctName(self, nameIndex: PokepediaNameIndex, name: str, description: str) -> str:
+        # When there's no name index (PokeAPI's name listing couldn't be fetched), the name is
+        # used as-is, just like it was before name indexes existed.
+        if nameIndex is None:
+            return name
 
-    def hasAccuracy(self) -> bool:
-        return utils.isValidNum(self.__accuracy)
+        bestMatch = nameIndex.getBestMatch(name)
+        if utils.isValidStr(bestMatch):
+            return bestMatch
 
-    def hasPower(self) -> bool:
-        return utils.isValidNum(self.__power)
+        suggestions = nameIndex.search(name)
 
-    def toStr(self) -> str:
-        powerStr = ''
-        if self.hasPower():
-            powerStr = f'💪 {self.getPowerStr()}, '
-
-        accuracyStr = ''
-        if self.hasAccuracy():
-            accuracyStr = f'🎯 {self.getAccuracyStr()}, '
-
-        return f'{self.__generation.toStr()}: {powerStr}{accuracyStr}{self.getPpStr()}, {self.__elementType.getEmojiOrStr().lower()} type, {self.__damageClass.toStr().lower()}'
-
-
-class PokepediaMove():
+        if utils.hasItems(suggestions):
+            suggestionsStr = ', '.join(suggestions)
+            raise ValueError(f'can\'t find {description} \"{name}\", did you mean one of: {suggestionsStr}?')
+        else:
+            raise ValueError(f'can\'t find {description} \"{name}\"')
 
-    def __init__(
+    def createGenerationElementTypes(
         self,
-        generationMoves: Dict[PokepediaGeneration, PokepediaMoveGeneration],
-        moveId: int,
-        description: str,
-        name: str,
-        rawName: str
-    ):
-        if not utils.hasItems(generationMoves):
-            raise ValueError(f'generationMoves argument is malformed: \"{generationMoves}\"')
-        elif not utils.isValidNum(moveId):
-            raise ValueError(f'moveId argument is malformed: \"{moveId}\"')
-        elif not utils.isValidStr(description):
-            raise ValueError(f'description argument is malformed: \"{description}\"')
-        elif not utils.isValidStr(name):
-            raise ValueError(f'name argument is malformed: \"{name}\"')
-        elif not utils.isValidStr(rawName):
-            raise ValueError(f'rawName argument is malformed: \"{rawName}\"')
-
-        self.__generationMoves = generationMoves
-        self.__moveId = moveId
-        self.__description = description
-        self.__name = name
-        self.__rawName = rawName
-
-    def getDescription(self) -> str:
-        return self.__description
-
-    def getGenerationMoves(self) -> Dict[PokepediaGeneration, PokepediaMoveGeneration]:
-        return self.__generationMoves
-
-    def getMoveId(self) -> int:
-        return self.__moveId
+        speciesGeneration: PokepediaGeneration,
+        currentElementTypes: List[PokepediaElementType],
+        pastElementTypes: Dict[PokepediaGeneration, List[PokepediaElementType]]
+    ) -> Dict[PokepediaGeneration, List[PokepediaElementType]]:
+        # A Pokemon's past types are keyed by the last generation in which it had them (this is
+        # how PokeAPI's "past_types" works). This walks forward from the generation the Pokemon
+        # was introduced in, and only keeps a generation if its types differ from the generation
+        # before it. This is public so that pokepediaIngest.py can reduce Pokemon types exactly
+        # the same way that searchPokemon() does.
+        if speciesGeneration is None:
+            raise ValueError(f'speciesGeneration argument is malformed: \"{speciesGeneration}\"')
+        elif not utils.hasItems(currentElementTypes):
+            raise ValueError(f'currentElementTypes argument is malformed: \"{currentElementTypes}\"')
+        elif pastElementTypes is None:
+            raise ValueError(f'pastElementTypes argument is malformed: \"{pastElementTypes}\"')
+
+        generations = list(PokepediaGeneration)
+        generationElementTypes = dict()
+        previousElementTypes = None
+
+        for generation in generations[generations.index(speciesGeneration):]:
+            elementTypes = currentElementTypes
+
+            for pastGeneration in generations[generations.index(generation):]:
+                if pastGeneration in pastElementTypes:
+                    elementTypes = pastElementTypes[pastGeneration]
+                    break
+
+            if elementTypes != previousElementTypes:
+                generationElementTypes[generation] = elementTypes
+
+            previousElementTypes = elementTypes
+
+        return generationElementTypes
+
+    def __createNameIndex(self, resource: str, localNames: List[str]) -> PokepediaNameIndex:
+        # returns None if the names can't be fetched, or if they recently couldn't be
+        if not self.__nameIndexRetryTimes.isReady(resource):
+            return None
 
-    def getName(self) -> str:
-        return self.__name
+        print(f'Fetching PokeAPI \"{resource}\" names...')
 
-    def getRawName(self) -> str:
-        return self.__rawName
+        rawResponse = None
+        try:
+            rawResponse = requests.get(
+                url = f'https://pokeapi.co/api/v2/{resource}/?limit=100000',
+                timeout = utils.getDefaultTimeout()
+            )
+        except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
+            print(f'Exception occurred when attempting to fetch PokeAPI \"{resource}\" names: {e}')
+            self.__nameIndexRetryTimes.update(resource)
+            return None
 
-    def toStr(self, delimiter: str = '; ') -> str:
-        if delimiter is None:
-            raise ValueError(f'delimiter argument is malformed: \"{delimiter}\"')
+        namedResourceList = None
+        try:
+            namedResourceList = self.__namedResourceListSchema.decode(utils.loadJson(rawResponse.content))
+        except (JSONDecodeError, ResponseSchemaError) as e:
+            print(f'Exception occurred when attempting to read PokeAPI \"{resource}\" names: {e}')
+            self.__nameIndexRetryTimes.update(resource)
+            return None
 
-        genMoveStrings = list()
+        names = [ namedResource.name for namedResource in namedResourceList.results ]
+        names.extend(localNames)
+        return PokepediaNameIndex(names)
 
-        for gen in PokepediaGeneration:
-            if gen in self.__generationMoves:
-                genMove = self.__generationMoves[gen]
-                genMoveStrings.append(genMove.toStr())
+    def __createMoveSchema(self) -> ResponseSchema:
+        # This schema covers only the fields that we read from the move format documented here:
+        # https://pokeapi.co/docs/v2#moves
 
-        genMoveString = delimiter.join(genMoveStrings)
-        return f'{self.getName()} — {genMoveString}'
+        namedResourceSchema = ResponseSchema(
+            name = 'PokeApiNamedResource',
+            fields = [
+                SchemaField('name', str)
+            ]
+        )
 
-    def toStrList(self) -> List[str]:
-        genMoveStrings = list()
-        genMoveStrings.append(f'{self.getName()} — {self.getDescription()}')
+        return ResponseSchema(
+            name = 'PokeApiMove',
+            fields = [
+                SchemaField('id', int),
+                SchemaField('name', str),
+                SchemaField('accuracy', int, optional = True),
+                SchemaField('power', int, optional = True),
+                SchemaField('pp', int),
+                SchemaField('damage_class', namedResourceSchema),
+                SchemaField('generation', namedResourceSchema),
+                SchemaField('type', namedResourceSchema),
+                SchemaField('flavor_text_entries', SchemaList(ResponseSchema(
+                    name = 'PokeApiFlavorText',
+                    fields = [
+                        SchemaField('flavor_text', str),
+                        SchemaField('language', namedResourceSchema)
+                    ]
+                ))),
+                SchemaField('names', SchemaList(ResponseSchema(
+                    name = 'PokeApiName',
+                    fields = [
+                        SchemaField('name', str),
+                        SchemaField('language', namedResourceSchema)
+                    ]
+                ))),
+                SchemaField('past_values', SchemaList(ResponseSchema(
+                    name = 'PokeApiPastMoveStatValues',
+                    fields = [
+                        SchemaField('accuracy', int, optional = True),
+                        SchemaField('power', int, optional = True),
+                        SchemaField('pp', int, optional = True),
+                        SchemaField('type', namedResourceSchema, optional = True),
+                        SchemaField('version_group', namedResourceSchema)
+                    ]
+                )), optional = True, default = tuple()),
+                SchemaField('learned_by_pokemon', SchemaList(ResponseSchema(
+                    name = 'PokeApiResource',
+                    fields = [
+                        SchemaField('url', str)
+                    ]
+                )), optional = True)
+            ]
+        )
 
-        for gen in PokepediaGeneration:
-            if gen in self.__generationMoves:
-                genMove = self.__generationMoves[gen]
-                genMoveStrings.append(genMove.toStr())
+    def __createPokemonSchema(self) -> ResponseSchema:
+        # This schema covers only the fields that we read from the Pokemon format documented here:
+        # https://pokeapi.co/docs/v2#pokemon
 
-        return genMoveStrings
+        namedResourceSchema = ResponseSchema(
+            name = 'PokeApiNamedResource',
+            fields = [
+                SchemaField('name', str),
+                SchemaField('url', str)
+            ]
+        )
 
+        typeSlotSchema = ResponseSchema(
+            name = 'PokeApiPokemonType',
+            fields = [
+                SchemaField('slot', int),
+                SchemaField('type', namedResourceSchema)
+            ]
+        )
 
-class PokepediaPokemon():
+        return ResponseSchema(
+            name = 'PokeApiPokemon',
+            fields = [
+                SchemaField('id', int),
+                SchemaField('name', str),
+                SchemaField('is_default', bool),
+                SchemaField('species', namedResourceSchema),
+                SchemaField('types', SchemaList(typeSlotSchema)),
+                SchemaField('past_types', SchemaList(ResponseSchema(
+                    name = 'PokeApiPokemonTypePast',
+                    fields = [
+                        SchemaField('generation', namedResourceSchema),
+                        SchemaField('types', SchemaList(typeSlotSchema))
+                    ]
+                )), optional = True, default = tuple())
+            ]
+        )
 
-    def __init__(
-        self,
-        generationElementTypes: Dict[PokepediaGeneration, PokepediaElementType],
-        pokedexId: int,
-        name: str
-    ):
-        if not utils.hasItems(generationElementTypes):
-            raise ValueError(f'generationElementTypes argument is malformed: \"{generationElementTypes}\"')
-        elif not utils.isValidNum(pokedexId):
-            raise ValueError(f'pokedexId argument is malformed: \"{pokedexId}\"')
-        elif not utils.isValidStr(name):
-            raise ValueError(f'name argument is malformed: \"{name}\"')
+    def __createPokemonSpeciesSchema(self) -> ResponseSchema:
+        # This schema covers only the fields that we read from the Pokemon species format
+        # documented here: https://pokeapi.co/docs/v2#pokemon-species
 
-        self.__generationElementTypes = generationElementTypes
-        self.__pokedexId = pokedexId
-        self.__name = name
+        namedResourceSchema = ResponseSchema(
+            name = 'PokeApiNamedResource',
+            fields = [
+                SchemaField('name', str)
+            ]
+        )
 
-    def getGenerationElementTypes(self) -> Dict[PokepediaGeneration, PokepediaElementType]:
-        return self.__generationElementTypes
+        return ResponseSchema(
+            name = 'PokeApiPokemonSpecies',
+            fields = [
+                SchemaField('id', int),
+                SchemaField('name', str),
+                SchemaField('generation', namedResourceSchema),
+                SchemaField('names', SchemaList(ResponseSchema(
+                    name = 'PokeApiName',
+                    fields = [
+                        SchemaField('name', str),
+                        SchemaField('language', namedResourceSchema)
+                    ]
+                )))
+            ]
+        )
 
-    def getName(self) -> str:
-        return self.__name
+    def __createNamedResourceListSchema(self) -> ResponseSchema:
+        # https://pokeapi.co/docs/v2#resource-listspagination-section
+        return ResponseSchema(
+            name = 'PokeApiNamedResourceList',
+            fields = [
+                SchemaField('results', SchemaList(ResponseSchema(
+                    name = 'PokeApiNamedResource',
+                    fields = [
+                        SchemaField('name', str)
+                    ]
+                )))
+            ]
+        )
 
-    def getPokedexId(self) -> int:
-        return self.__pokedexId
+    def __getEnDescription(self, moveResponse) -> str:
+        if moveResponse is None:
+            raise ValueError(f'moveResponse argument is malformed: \"{moveResponse}\"')
 
-    def getPokedexIdStr(self) -> str:
-        return locale.format_string("%d", self.__pokedexId, grouping = True)
+        flavorTextEntries = moveResponse.flavor_text_entries
+        if not utils.hasItems(flavorTextEntries):
+            raise ValueError(f'\"flavor_text_entries\" field in JSON response is null or empty: {moveResponse}')
 
+        for flavorTextEntry in flavorTextEntries:
+            if flavorTextEntry.language.name == 'en':
+                return utils.cleanStr(flavorTextEntry.flavor_text)
 
-class PokepediaRepository():
+        raise RuntimeError(f'can\'t find \"en\" language name in \"flavor_text_entries\" field: {moveResponse}')
 
-    def __init__(self):
-        pass
+    def __getEnName(self, moveResponse) -> str:
+        if moveResponse is None:
+            raise ValueError(f'moveResponse argument is malformed: \"{moveResponse}\"')
 
-    def __getEnDescription(self, jsonResponse: Dict) -> str:
-        if not utils.hasItems(jsonResponse):
-            raise ValueError(f'jsonResponse argument is malformed: \"{jsonResponse}\"')
+        names = moveResponse.names
+        if not utils.hasItems(names):
+            raise ValueError(f'\"names\" field in JSON response is null or empty: {moveResponse}')
 
-        flavorTextEntries = jsonResponse.get('flavor_text_entries')
-        if not utils.hasItems(flavorTextEntries):
-            raise ValueError(f'\"flavor_text_entries\" field in JSON response is null or empty: {jsonResponse}')
+        for name in names:
+            if name.language.name == 'en':
+                return utils.cleanStr(name.name.title())
 
-        for flavorTextEntry in flavorTextEntries:
-            if flavorTextEntry['language']['name'] == 'en':
-                return utils.cleanStr(flavorTextEntry['flavor_text'])
+        raise RuntimeError(f'can\'t find \"en\" language name in \"names\" field: {moveResponse}')
 
-        raise RuntimeError(f'can\'t find \"en\" language name in \"flavor_text_entries\" field: {jsonResponse}')
+    def __getLearnedByPokedexIds(self, moveResponse) -> List[int]:
+        if moveResponse.learned_by_pokemon is None:
+            return None
 
-    def __getEnName(self, jsonResponse: Dict) -> str:
-        if not utils.hasItems(jsonResponse):
-            raise ValueError(f'jsonResponse argument is malformed: \"{jsonResponse}\"')
+        pokedexIds = list()
 
-        names = jsonResponse.get('names')
-        if not utils.hasItems(names):
-            raise ValueError(f'\"names\" field in JSON response is null or empty: {jsonResponse}')
+        for resource in moveResponse.learned_by_pokemon:
+            # e.g. https://pokeapi.co/api/v2/pokemon/25/
+            pokemonId = int(resource.url.rstrip('/').split('/')[-1])
 
-        for name in names:
-            if name['language']['name'] == 'en':
-                return utils.cleanStr(name['name'].title())
+            # Alternate forms have IDs starting from 10001 rather than their species' Pokedex ID,
+            # and they almost always share their species' learnset, so they're left out.
+            if pokemonId <= 10000:
+                pokedexIds.append(pokemonId)
 
-        raise RuntimeError(f'can\'t find \"en\" language name in \"names\" field: {jsonResponse}')
+        return pokedexIds
 
-    def __getMoveGenerationDictionary(self, jsonResponse: Dict) -> Dict[PokepediaGeneration, PokepediaMoveGeneration]:
-        if not utils.hasItems(jsonResponse):
-            raise ValueError(f'jsonResponse argument is malformed: \"{jsonResponse}\"')
+    def __getMoveGenerationDictionary(self, moveResponse) -> Dict[PokepediaGeneration, PokepediaMoveGeneration]:
+        if moveResponse is None:
+            raise ValueError(f'moveResponse argument is malformed: \"{moveResponse}\"')
 
         moveGenerationDictionary = dict()
 
         # begin with current gen stats
-        accuracy = jsonResponse['accuracy']
-        power = jsonResponse['power']
-        pp = jsonResponse['pp']
-        damageClass = PokepediaDamageClass.fromStr(jsonResponse['damage_class']['name'])
-        elementType = PokepediaElementType.fromStr(jsonResponse['type']['name'])
+        accuracy = moveResponse.accuracy
+        power = moveResponse.power
+        pp = moveResponse.pp
+        damageClass = PokepediaDamageClass.fromStr(moveResponse.damage_class.name)
+        elementType = PokepediaElementType.fromStr(moveResponse.type.name)
         move = None
 
-        pastValues = jsonResponse['past_values']
+        pastValues = moveResponse.past_values
 
         # iterate backwards and insert to dictionary once a gen is found. then 'un-patch' for
-        # previous gens
+        # previous gens. The stats from before a change in a gen that PokepediaGeneration doesn't
+        # have yet are still the ones that the known gens had, so those changes are only un-patched
         for pastValue in reversed(pastValues):
-            generation = PokepediaGeneration.fromStr(pastValue['version_group']['name'])
-
-            if damageClass is not PokepediaDamageClass.STATUS and generation.isEarlyGeneration():
-                damageClass = PokepediaDamageClass.getTypeBasedDamageClass(elementType)
-
-            move = PokepediaMoveGeneration(
-                accuracy = accuracy,
-                power = power,
-                pp = pp,
-                damageClass = damageClass,
-                elementType = elementType,
-                generation = generation
-            )
+            generation = PokepediaGeneration.fromKnownStr(pastValue.version_group.name)
+
+            if generation is not None:
+                if damageClass is not PokepediaDamageClass.STATUS and generation.isEarlyGeneration():
+                    damageClass = PokepediaDamageClass.getTypeBasedDamageClass(elementType)
 
-            moveGenerationDictionary[generation] = move
+                move = PokepediaMoveGeneration(
+                    accuracy = accuracy,
+                    power = power,
+                    pp = pp,
+                    damageClass = damageClass,
+                    elementType = elementType,
+                    generation = generation
+                )
 
-            if utils.isValidNum(pastValue.get('accuracy')):
-                accuracy = pastValue['accuracy']
+                moveGenerationDictionary[generation] = move
 
-            if utils.isValidNum(pastValue.get('power')):
-                power = pastValue['power']
+            if utils.isValidNum(pastValue.accuracy):
+                accuracy = pastValue.accuracy
 
-            if utils.isValidNum(pastValue.get('pp')):
-                pp = pastValue['pp']
+            if utils.isValidNum(pastValue.power):
+                power = pastValue.power
 
-            if pastValue.get('type') is not None:
-                elementType = PokepediaElementType.fromStr(pastValue['type']['name'])
+            if utils.isValidNum(pastValue.pp):
+                pp = pastValue.pp
 
-        generation = PokepediaGeneration.fromStr(jsonResponse['generation']['name'])
+            if pastValue.type is not None:
+                elementType = PokepediaElementType.fromStr(pastValue.type.name)
+
+        generation = PokepediaGeneration.fromStr(moveResponse.generation.name)
 
         if damageClass is not PokepediaDamageClass.STATUS and generation.isEarlyGeneration():
             damageClass = PokepediaDamageClass.getTypeBasedDamageClass(elementType)
@@ -593,19 +478,20 @@ class PokepediaRepository():
 
         return moveGenerationDictionary
 
-    def searchMoves(self, name: str) -> PokepediaMove:
+    def fetchMove(self, name: str) -> PokepediaMove:
+        # Fetches a move straight from PokeAPI, by its exact PokeAPI name, without reading from
+        # or writing to the local database. Most callers should use searchMoves() instead.
         if not utils.isValidStr(name):
             raise ValueError(f'name argument is malformed: \"{name}\"')
 
-        name = utils.cleanStr(name)
-        name = name.replace(' ', '-')
         print(f'Searching for Pokemon move \"{name}\"...')
 
         rawResponse = None
         try:
             rawResponse = requests.get(
                 url = f'https://pokeapi.co/api/v2/move/{name}/',
-                timeout = utils.getDefaultTimeout()
+                timeout = utils.getDefaultTimeout(),
+                stream = self.__moveStreamParser is not None
             )
         except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
             print(f'Exception occurred when attempting to fetch Pokemon move \"{name}\": {e}')
@@ -613,45 +499,257 @@ class PokepediaRepository():
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            if self.__moveStreamParser is None:
+                jsonResponse = utils.loadJson(rawResponse.content)
+            else:
+                # without this, urllib3 hands back the body still gzipped
+                rawResponse.raw.decode_content = True
+                jsonResponse = self.__moveStreamParser.parse(rawResponse.raw)
         except JSONDecodeError as e:
             print(f'Exception occurred when attempting to decode Pokemon move response into JSON for \"{name}\": {e}')
             raise RuntimeError(f'Exception occurred when attempting to decode Pokemon move response into JSON for \"{name}\": {e}')
+        finally:
+            rawResponse.close()
 
-        return PokepediaMove(
-            generationMoves = self.__getMoveGenerationDictionary(jsonResponse),
-            moveId = utils.getIntFromDict(jsonResponse, 'id'),
-            description = self.__getEnDescription(jsonResponse),
-            name = self.__getEnName(jsonResponse),
-            rawName = jsonResponse['name']
-        )
+        move = None
+        try:
+            move = self.parseMove(jsonResponse)
+        except ResponseSchemaError as e:
+            print(f'Exception occurred when attempting to read Pokemon move response for \"{name}\": {e}')
+            raise ValueError(f'Exception occurred when attempting to read Pokemon move response for \"{name}\": {e}')
 
-    def searchPokemon(self, name: str) -> PokepediaPokemon:
+        return move
+
+    def fetchPokemon(self, name: str) -> PokepediaPokemon:
+        # Fetches a Pokemon straight from PokeAPI, by its exact PokeAPI name, without reading from
+        # or writing to the local database. Most callers should use searchPokemon() instead.
         if not utils.isValidStr(name):
             raise ValueError(f'name argument is malformed: \"{name}\"')
 
-        name = utils.cleanStr(name)
-        name = name.replace(' ', '-')
         print(f'Searching for Pokemon \"{name}\"...')
 
+        # A Pokemon's species usually has the same name as the Pokemon itself, so both are
+        # requested at the same time. For the forms where it doesn't (e.g. "deoxys-attack"), the
+        # species is fetched afterwards from the URL given in the Pokemon's response.
+        pokemonFuture = self.__executor.submit(
+            self.__fetchPokeApiResource,
+            f'https://pokeapi.co/api/v2/pokemon/{name}/',
+            self.__pokemonSchema,
+            f'Pokemon \"{name}\"'
+        )
+
+        speciesFuture = self.__executor.submit(
+            self.__fetchPokeApiResource,
+            f'https://pokeapi.co/api/v2/pokemon-species/{name}/',
+            self.__pokemonSpeciesSchema,
+            f'Pokemon species \"{name}\"'
+        )
+
+        pokemonResponse = pokemonFuture.result()
+
+        speciesResponse = None
+        try:
+            speciesResponse = speciesFuture.result()
+        except (RuntimeError, ValueError):
+            pass
+
+        if speciesResponse is None or speciesResponse.name != pokemonResponse.species.name:
+            speciesResponse = self.__fetchPokeApiResource(
+                pokemonResponse.species.url,
+                self.__pokemonSpeciesSchema,
+                f'Pokemon species \"{pokemonResponse.species.name}\"'
+            )
+
+        return PokepediaPokemon(
+            generationElementTypes = self.__getPokemonGenerationElementTypes(pokemonResponse, speciesResponse),
+            pokedexId = speciesResponse.id,
+            name = self.__getPokemonName(pokemonResponse, speciesResponse),
+            rawName = pokemonResponse.name
+        )
+
+    def __fetchPokeApiResource(self, url: str, schema: ResponseSchema, description: str):
         rawResponse = None
         try:
             rawResponse = requests.get(
-                url = f'https://pokeapi.co/api/v2/pokemon/{name}/',
+                url = url,
                 timeout = utils.getDefaultTimeout()
             )
         except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
-            print(f'Exception occurred when attempting to fetch Pokemon \"{name}\": {e}')
-            raise RuntimeError(f'Exception occurred when attempting to fetch Pokemon \"{name}\": {e}')
+            print(f'Exception occurred when attempting to fetch {description}: {e}')
+            raise RuntimeError(f'Exception occurred when attempting to fetch {description}: {e}')
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
-            print(f'Exception occurred when attempting to decode Pokemon response into JSON for \"{name}\": {e}')
-            raise RuntimeError(f'Exception occurred when attempting to decode Pokemon response into JSON for \"{name}\": {e}')
+            print(f'Exception occurred when attempting to decode {description} response into JSON: {e}')
+            raise RuntimeError(f'Exception occurred when attempting to decode {description} response into JSON: {e}')
 
-        # TODO
-        return PokepediaPokemon(
-            name = jsonResponse['name'].title()
+        try:
+            return schema.decode(jsonResponse)
+        except ResponseSchemaError as e:
+            print(f'Exception occurred when attempting to read {description} response: {e}')
+            raise ValueError(f'Exception occurred when attempting to read {description} response: {e}')
+
+    def __getMoveNameIndex(self) -> PokepediaNameIndex:
+        if self.__moveNameIndex is None:
+            localNames = list()
+
+            if self.__pokepediaDatabase is not None:
+                localNames = self.__pokepediaDatabase.getMoveNames()
+
+            self.__moveNameIndex = self.__createNameIndex('move', localNames)
+
+        return self.__moveNameIndex
+
+    def __getPokemonGenerationElementTypes(self, pokemonResponse, speciesResponse) -> Dict[PokepediaGeneration, List[PokepediaElementType]]:
+        if pokemonResponse is None:
+            raise ValueError(f'pokemonResponse argument is malformed: \"{pokemonResponse}\"')
+        elif speciesResponse is None:
+            raise ValueError(f'speciesResponse argument is malformed: \"{speciesResponse}\"')
+
+        # PokepediaGeneration.fromStr() would call a species from a newer generation than it
+        # knows about Gen 1, giving it types that didn't exist yet, so it's rejected instead
+        speciesGeneration = PokepediaGeneration.fromKnownStr(speciesResponse.generation.name)
+
+        if speciesGeneration is None:
+            raise ValueError(f'Pokemon \"{pokemonResponse.name}\" is from a generation that PokepediaGeneration doesn\'t have yet: \"{speciesResponse.generation.name}\"')
+
+        pastElementTypes = dict()
+        newerPastElementTypes = list()
+
+        for pastType in pokemonResponse.past_types:
+            generation = PokepediaGeneration.fromKnownStr(pastType.generation.name)
+
+            if generation is None:
+                newerPastElementTypes.append(self.__getPokemonElementTypes(pastType.types))
+            else:
+                pastElementTypes[generation] = self.__getPokemonElementTypes(pastType.types)
+
+        # Past types are the ones a Pokemon had up to and including the given generation, so past
+        # types from a newer generation were still had in the newest generation that's known,
+        # unless it has past types of its own. PokeAPI lists past types oldest first.
+        if utils.hasItems(newerPastElementTypes):
+            pastElementTypes.setdefault(PokepediaGeneration.getNewest(), newerPastElementTypes[0])
+
+        return self.createGenerationElementTypes(
+            speciesGeneration = speciesGeneration,
+            currentElementTypes = self.__getPokemonElementTypes(pokemonResponse.types),
+            pastElementTypes = pastElementTypes
         )
+
+    def __getPokemonElementTypes(self, typeSlots) -> List[PokepediaElementType]:
+        if not utils.hasItems(typeSlots):
+            raise ValueError(f'typeSlots argument is malformed: \"{typeSlots}\"')
+
+        return [ PokepediaElementType.fromStr(typeSlot.type.name) for typeSlot in sorted(typeSlots, key = lambda typeSlot: typeSlot.slot) ]
+
+    def __getPokemonName(self, pokemonResponse, speciesResponse) -> str:
+        if pokemonResponse is None:
+            raise ValueError(f'pokemonResponse argument is malformed: \"{pokemonResponse}\"')
+        elif speciesResponse is None:
+            raise ValueError(f'speciesResponse argument is malformed: \"{speciesResponse}\"')
+
+        # alternate forms (e.g. "raichu-alola") would otherwise end up with their species' name
+        if pokemonResponse.is_default:
+            for name in speciesResponse.names:
+                if name.language.name == 'en':
+                    return utils.cleanStr(name.name)
+
+        return utils.cleanStr(pokemonResponse.name.replace('-', ' ').title())
+
+    def __getPokemonNameIndex(self) -> PokepediaNameIndex:
+        if self.__pokemonNameIndex is None:
+            localNames = list()
+
+            if self.__pokepediaDatabase is not None:
+                localNames = self.__pokepediaDatabase.getPokemonNames()
+
+            self.__pokemonNameIndex = self.__createNameIndex('pokemon', localNames)
+
+        return self.__pokemonNameIndex
+
+    def parseMove(self, jsonResponse: Dict) -> PokepediaMove:
+        # Turns a move in PokeAPI's JSON format into a PokepediaMove. This is public so that
+        # pokepediaIngest.py can reduce moves exactly the same way that searchMoves() does.
+        if not utils.hasItems(jsonResponse):
+            raise ValueError(f'jsonResponse argument is malformed: \"{jsonResponse}\"')
+
+        moveResponse = self.__moveSchema.decode(jsonResponse)
+
+        return PokepediaMove(
+            generationMoves = self.__getMoveGenerationDictionary(moveResponse),
+            moveId = moveResponse.id,
+            description = self.__getEnDescription(moveResponse),
+            name = self.__getEnName(moveResponse),
+            rawName = moveResponse.name,
+            learnedByPokedexIds = self.__getLearnedByPokedexIds(moveResponse)
+        )
+
+    def searchMoves(self, name: str) -> PokepediaMove:
+        if not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+
+        name = utils.cleanStr(name)
+        name = name.replace(' ', '-')
+
+        if self.__pokepediaDatabase is not None:
+            move = self.__pokepediaDatabase.getMove(name)
+
+            if move is not None:
+                return move
+
+        correctedName = self.__correctName(self.__getMoveNameIndex(), name, 'Pokemon move')
+
+        if correctedName != name:
+            if correctedName.lower() != name.lower():
+                print(f'Corrected Pokemon move \"{name}\" to \"{correctedName}\"')
+
+            name = correctedName
+
+            if self.__pokepediaDatabase is not None:
+                move = self.__pokepediaDatabase.getMove(name)
+
+                if move is not None:
+                    return move
+
+        move = self.fetchMove(name)
+
+        if self.__pokepediaDatabase is not None:
+            self.__pokepediaDatabase.addMove(move)
+
+        return move
+
+    def searchPokemon(self, name: str) -> PokepediaPokemon:
+        if not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+
+        name = utils.cleanStr(name)
+        name = name.replace(' ', '-')
+
+        if self.__pokepediaDatabase is not None:
+            pokemon = self.__pokepediaDatabase.getPokemon(name)
+
+            if pokemon is not None:
+                return pokemon
+
+        correctedName = self.__correctName(self.__getPokemonNameIndex(), name, 'Pokemon')
+
+        if correctedName != name:
+            if correctedName.lower() != name.lower():
+                print(f'Corrected Pokemon \"{name}\" to \"{correctedName}\"')
+
+            name = correctedName
+
+            if self.__pokepediaDatabase is not None:
+                pokemon = self.__pokepediaDatabase.getPokemon(name)
+
+                if pokemon is not None:
+                    return pokemon
+
+        pokemon = self.fetchPokemon(name)
+
+        if self.__pokepediaDatabase is not None:
+            self.__pokepediaDatabase.addPokemon(pokemon)
+
+        return pokemon
@@ -0,0 +1,225 @@
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.pokepediaElementType import PokepediaElementType
+    from CynanBotCommon.pokepediaGeneration import PokepediaGeneration
+    from CynanBotCommon.pokepediaPokemon import PokepediaPokemon
+except:
+    import utils
+    from pokepediaElementType import PokepediaElementType
+    from pokepediaGeneration import PokepediaGeneration
+    from pokepediaPokemon import PokepediaPokemon
+
+
+class PokepediaTypeChart():
+
+    # Type effectiveness multipliers, stored as one 18x18 NumPy matrix per generation. Rows are
+    # the attacking type and columns the defending type, both indexed in PokepediaElementType
+    # order. There are really only three distinct charts (Gen 1, Gens 2-5 and Gens 6+), so
+    # generations that share a chart share the same (read-only) matrix. Dual-type matchups are
+    # just the product of the matching columns, so every query is a single vectorized lookup.
+
+    def __init__(self):
+        self.__elementTypes = list(PokepediaElementType)
+        self.__indexes = { elementType: index for index, elementType in enumerate(self.__elementTypes) }
+        self.__generationElementTypes = self.__createGenerationElementTypes()
+        self.__charts = self.__createCharts()
+
+    def __createCharts(self) -> Dict[PokepediaGeneration, np.ndarray]:
+        # https://bulbapedia.bulbagarden.net/wiki/Type/Type_chart
+        modernChart = self.__createChart({
+            PokepediaElementType.BUG: ({ PokepediaElementType.DARK, PokepediaElementType.GRASS, PokepediaElementType.PSYCHIC }, { PokepediaElementType.FAIRY, PokepediaElementType.FIGHTING, PokepediaElementType.FIRE, PokepediaElementType.FLYING, PokepediaElementType.GHOST, PokepediaElementType.POISON, PokepediaElementType.STEEL }, set()),
+            PokepediaElementType.DARK: ({ PokepediaElementType.GHOST, PokepediaElementType.PSYCHIC }, { PokepediaElementType.DARK, PokepediaElementType.FAIRY, PokepediaElementType.FIGHTING }, set()),
+            PokepediaElementType.DRAGON: ({ PokepediaElementType.DRAGON }, { PokepediaElementType.STEEL }, { PokepediaElementType.FAIRY }),
+            PokepediaElementType.ELECTRIC: ({ PokepediaElementType.FLYING, PokepediaElementType.WATER }, { PokepediaElementType.DRAGON, PokepediaElementType.ELECTRIC, PokepediaElementType.GRASS }, { PokepediaElementType.GROUND }),
+            PokepediaElementType.FAIRY: ({ PokepediaElementType.DARK, PokepediaElementType.DRAGON, PokepediaElementType.FIGHTING }, { PokepediaElementType.FIRE, PokepediaElementType.POISON, PokepediaElementType.STEEL }, set()),
+            PokepediaElementType.FIGHTING: ({ PokepediaElementType.DARK, PokepediaElementType.ICE, PokepediaElementType.NORMAL, PokepediaElementType.ROCK, PokepediaElementType.STEEL }, { PokepediaElementType.BUG, PokepediaElementType.FAIRY, PokepediaElementType.FLYING, PokepediaElementType.POISON, PokepediaElementType.PSYCHIC }, { PokepediaElementType.GHOST }),
+            PokepediaElementType.FIRE: ({ PokepediaElementType.BUG, PokepediaElementType.GRASS, PokepediaElementType.ICE, PokepediaElementType.STEEL }, { PokepediaElementType.DRAGON, PokepediaElementType.FIRE, PokepediaElementType.ROCK, PokepediaElementType.WATER }, set()),
+            PokepediaElementType.FLYING: ({ PokepediaElementType.BUG, PokepediaElementType.FIGHTING, PokepediaElementType.GRASS }, { PokepediaElementType.ELECTRIC, PokepediaElementType.ROCK, PokepediaElementType.STEEL }, set()),
+            PokepediaElementType.GHOST: ({ PokepediaElementType.GHOST, PokepediaElementType.PSYCHIC }, { PokepediaElementType.DARK }, { PokepediaElementType.NORMAL }),
+            PokepediaElementType.GRASS: ({ PokepediaElementType.GROUND, PokepediaElementType.ROCK, PokepediaElementType.WATER }, { PokepediaElementType.BUG, PokepediaElementType.DRAGON, PokepediaElementType.FIRE, PokepediaElementType.FLYING, PokepediaElementType.GRASS, PokepediaElementType.POISON, PokepediaElementType.STEEL }, set()),
+            PokepediaElementType.GROUND: ({ PokepediaElementType.ELECTRIC, PokepediaElementType.FIRE, PokepediaElementType.POISON, PokepediaElementType.ROCK, PokepediaElementType.STEEL }, { PokepediaElementType.BUG, PokepediaElementType.GRASS }, { PokepediaElementType.FLYING }),
+            PokepediaElementType.ICE: ({ PokepediaElementType.DRAGON, PokepediaElementType.FLYING, PokepediaElementType.GRASS, PokepediaElementType.GROUND }, { PokepediaElementType.FIRE, PokepediaElementType.ICE, PokepediaElementType.STEEL, PokepediaElementType.WATER }, set()),
+            PokepediaElementType.NORMAL: (set(), { PokepediaElementType.ROCK, PokepediaElementType.STEEL }, { PokepediaElementType.GHOST }),
+            PokepediaElementType.POISON: ({ PokepediaElementType.FAIRY, PokepediaElementType.GRASS }, { PokepediaElementType.GHOST, PokepediaElementType.GROUND, PokepediaElementType.POISON, PokepediaElementType.ROCK }, { PokepediaElementType.STEEL }),
+            PokepediaElementType.PSYCHIC: ({ PokepediaElementType.FIGHTING, PokepediaElementType.POISON }, { PokepediaElementType.PSYCHIC, PokepediaElementType.STEEL }, { PokepediaElementType.DARK }),
+            PokepediaElementType.ROCK: ({ PokepediaElementType.BUG, PokepediaElementType.FIRE, PokepediaElementType.FLYING, PokepediaElementType.ICE }, { PokepediaElementType.FIGHTING, PokepediaElementType.GROUND, PokepediaElementType.STEEL }, set()),
+            PokepediaElementType.STEEL: ({ PokepediaElementType.FAIRY, PokepediaElementType.ICE, PokepediaElementType.ROCK }, { PokepediaElementType.ELECTRIC, PokepediaElementType.FIRE, PokepediaElementType.STEEL, PokepediaElementType.WATER }, set()),
+            PokepediaElementType.WATER: ({ PokepediaElementType.FIRE, PokepediaElementType.GROUND, PokepediaElementType.ROCK }, { PokepediaElementType.DRAGON, PokepediaElementType.GRASS, PokepediaElementType.WATER }, set())
+        })
+
+        # before Gen 6, Steel also resisted Ghost and Dark
+        gen2Chart = modernChart.copy()
+        gen2Chart[self.__indexes[PokepediaElementType.GHOST], self.__indexes[PokepediaElementType.STEEL]] = 0.5
+        gen2Chart[self.__indexes[PokepediaElementType.DARK], self.__indexes[PokepediaElementType.STEEL]] = 0.5
+
+        # Gen 1 had a handful of its own quirks
+        gen1Chart = gen2Chart.copy()
+        gen1Chart[self.__indexes[PokepediaElementType.BUG], self.__indexes[PokepediaElementType.POISON]] = 2
+        gen1Chart[self.__indexes[PokepediaElementType.GHOST], self.__indexes[PokepediaElementType.PSYCHIC]] = 0
+        gen1Chart[self.__indexes[PokepediaElementType.ICE], self.__indexes[PokepediaElementType.FIRE]] = 1
+        gen1Chart[self.__indexes[PokepediaElementType.POISON], self.__indexes[PokepediaElementType.BUG]] = 2
+
+        for chart in (gen1Chart, gen2Chart, modernChart):
+            chart.flags.writeable = False
+
+        charts = dict()
+
+        for generation in PokepediaGeneration:
+            if generation is PokepediaGeneration.GENERATION_1:
+                charts[generation] = gen1Chart
+            elif PokepediaElementType.FAIRY not in self.__generationElementTypes[generation]:
+                charts[generation] = gen2Chart
+            else:
+                charts[generation] = modernChart
+
+        return charts
+
+    def __createChart(self, matchups: Dict) -> np.ndarray:
+        chart = np.ones((len(self.__elementTypes), len(self.__elementTypes)), dtype = np.float64)
+
+        for attackingType, (superEffective, notVeryEffective, noEffect) in matchups.items():
+            row = self.__indexes[attackingType]
+
+            for defendingType in superEffective:
+                chart[row, self.__indexes[defendingType]] = 2
+
+            for defendingType in notVeryEffective:
+                chart[row, self.__indexes[defendingType]] = 0.5
+
+            for defendingType in noEffect:
+                chart[row, self.__indexes[defendingType]] = 0
+
+        return chart
+
+    def __createGenerationElementTypes(self) -> Dict[PokepediaGeneration, List[PokepediaElementType]]:
+        generationElementTypes = dict()
+
+        for generation in PokepediaGeneration:
+            elementTypes = list(self.__elementTypes)
+
+            if generation is PokepediaGeneration.GENERATION_1:
+                elementTypes.remove(PokepediaElementType.DARK)
+                elementTypes.remove(PokepediaElementType.STEEL)
+
+            if generation in (PokepediaGeneration.GENERATION_1, PokepediaGeneration.GENERATION_2, PokepediaGeneration.GENERATION_3, PokepediaGeneration.GENERATION_4, PokepediaGeneration.GENERATION_5):
+                elementTypes.remove(PokepediaElementType.FAIRY)
+
+            generationElementTypes[generation] = elementTypes
+
+        return generationElementTypes
+
+    def getDefensiveMultipliers(
+        self,
+        defendingTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration
+    ) -> Dict[PokepediaElementType, float]:
+        # Returns the multiplier that every attacking type (that exists in the given generation)
+        # has against a Pokemon of the given type(s).
+        defendingIndexes = self.__toIndexes(defendingTypes, generation, 'defendingTypes')
+        attackingTypes = self.__generationElementTypes[generation]
+        attackingIndexes = [ self.__indexes[elementType] for elementType in attackingTypes ]
+
+        multipliers = self.__charts[generation][np.ix_(attackingIndexes, defendingIndexes)].prod(axis = 1)
+        return { elementType: float(multiplier) for elementType, multiplier in zip(attackingTypes, multipliers) }
+
+    def getElementTypes(self, generation: PokepediaGeneration) -> List[PokepediaElementType]:
+        if generation is None:
+            raise ValueError(f'generation argument is malformed: \"{generation}\"')
+
+        return list(self.__generationElementTypes[generation])
+
+    def getImmunities(
+        self,
+        defendingTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration
+    ) -> List[PokepediaElementType]:
+        multipliers = self.getDefensiveMultipliers(defendingTypes, generation)
+        return [ elementType for elementType, multiplier in multipliers.items() if multiplier == 0 ]
+
+    def getMultiplier(
+        self,
+        attackingType: PokepediaElementType,
+        defendingTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration
+    ) -> float:
+        attackingIndexes = self.__toIndexes([ attackingType ], generation, 'attackingType')
+        defendingIndexes = self.__toIndexes(defendingTypes, generation, 'defendingTypes')
+        return float(self.__charts[generation][attackingIndexes[0], defendingIndexes].prod())
+
+    def getMultipliers(
+        self,
+        attackingTypes: List[PokepediaElementType],
+        defendingTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration
+    ) -> np.ndarray:
+        # Returns one multiplier per attacking type, in the same order as attackingTypes.
+        attackingIndexes = self.__toIndexes(attackingTypes, generation, 'attackingTypes')
+        defendingIndexes = self.__toIndexes(defendingTypes, generation, 'defendingTypes')
+        return self.__charts[generation][np.ix_(attackingIndexes, defendingIndexes)].prod(axis = 1)
+
+    def getPokemonWeaknesses(self, pokemon: PokepediaPokemon) -> Dict[PokepediaGeneration, Dict[PokepediaElementType, float]]:
+        # Returns the weaknesses of each of the Pokemon's type(s), keyed by the generation in
+        # which the Pokemon started having those type(s). A generation is also included if the
+        # Pokemon's types stayed the same but the type chart itself changed in that generation.
+        if pokemon is None:
+            raise ValueError(f'pokemon argument is malformed: \"{pokemon}\"')
+
+        generationElementTypes = pokemon.getGenerationElementTypes()
+        pokemonWeaknesses = dict()
+        elementTypes = None
+        previousWeaknesses = None
+
+        for generation in PokepediaGeneration:
+            if generation in generationElementTypes:
+                elementTypes = generationElementTypes[generation]
+
+            if elementTypes is None:
+                continue
+
+            weaknesses = self.getWeaknesses(elementTypes, generation)
+
+            if weaknesses != previousWeaknesses:
+                pokemonWeaknesses[generation] = weaknesses
+
+            previousWeaknesses = weaknesses
+
+        return pokemonWeaknesses
+
+    def getResistances(
+        self,
+        defendingTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration
+    ) -> Dict[PokepediaElementType, float]:
+        multipliers = self.getDefensiveMultipliers(defendingTypes, generation)
+        return { elementType: multiplier for elementType, multiplier in multipliers.items() if 0 < multiplier < 1 }
+
+    def getWeaknesses(
+        self,
+        defendingTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration
+    ) -> Dict[PokepediaElementType, float]:
+        multipliers = self.getDefensiveMultipliers(defendingTypes, generation)
+        return { elementType: multiplier for elementType, multiplier in multipliers.items() if multiplier > 1 }
+
+    def __toIndexes(
+        self,
+        elementTypes: List[PokepediaElementType],
+        generation: PokepediaGeneration,
+        argumentName: str
+    ) -> List[int]:
+        if generation is None:
+            raise ValueError(f'generation argument is malformed: \"{generation}\"')
+        elif not utils.hasItems(elementTypes) or None in elementTypes:
+            raise ValueError(f'{argumentName} argument is malformed: \"{elementTypes}\"')
+
+        generationElementTypes = self.__generationElementTypes[generation]
+
+        for elementType in elementTypes:
+            if elementType not in generationElementTypes:
+                raise ValueError(f'{argumentName} argument contains an element type that doesn\'t exist in {generation.toStr()}: \"{elementType}\"')
+
+        return [ self.__indexes[elementType] for elementType in elementTypes ]
@@ -0,0 +1,230 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from json.decoder import JSONDecodeError
+from typing import Callable, Dict, List
+
+import requests
+from requests import ConnectionError, HTTPError, RequestException, Timeout
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+try:
+    import CynanBotCommon.utils as utils
+    from CynanBotCommon.backingDatabase import BackingDatabase
+    from CynanBotCommon.pokepediaDatabase import PokepediaDatabase
+    from CynanBotCommon.pokepediaRepository import PokepediaRepository
+    from CynanBotCommon.responseSchema import (ResponseSchema,
+                                               ResponseSchemaError,
+                                               SchemaField, SchemaList)
+except:
+    import utils
+    from backingDatabase import BackingDatabase
+    from pokepediaDatabase import PokepediaDatabase
+    from pokepediaRepository import PokepediaRepository
+    from responseSchema import (ResponseSchema, ResponseSchemaError,
+                                SchemaField, SchemaList)
+
+
+# This file is meant to be run by hand, separately from the others in this repository. It fills
+# in (or refreshes) a PokepediaDatabase with every move and Pokemon that PokeAPI knows about, so
+# that PokepediaRepository never has to go to the network during a stream:
+#
+# python pokepediaWarmUp.py <moves|pokemon|all> [<databaseFile>] [<maxAgeDays>]
+#
+# Anything already in the database that was written less than maxAgeDays ago (30 by default) is
+# skipped, and results are committed in small batches, so an interrupted run can simply be
+# started again and will pick up where it left off.
+
+# how many moves or Pokemon to fetch at the same time
+MAX_PARALLELISM = 4
+
+# PokeAPI asks that its users be polite, so this caps how often we make a request to it
+MAX_REQUESTS_PER_SECOND = 8
+
+# The most requests that fetching a single move or Pokemon can take. A Pokemon takes its own
+# request and its species' request (at the same time), plus another species request for the
+# forms whose species has a different name.
+MOVE_FETCH_REQUESTS = 1
+POKEMON_FETCH_REQUESTS = 3
+
+# how many fetched moves or Pokemon to collect before committing them to the database
+BATCH_SIZE = 25
+
+PAGE_SIZE = 200
+
+
+class PokepediaWarmUpRateLimiter():
+
+    # Spaces out calls to wait() so that, across all threads, they let through no more than
+    # maxPerSecond requests a second.
+
+    def __init__(self, maxPerSecond: float):
+        if not utils.isValidNum(maxPerSecond) or maxPerSecond <= 0:
+            raise ValueError(f'maxPerSecond argument is malformed: \"{maxPerSecond}\"')
+
+        self.__interval = 1 / maxPerSecond
+        self.__lock = threading.Lock()
+        self.__nextTime = time.monotonic()
+
+    def wait(self, requestCount: int = 1):
+        # waits until the given number of requests can be made
+        if not utils.isValidNum(requestCount) or requestCount < 1:
+            raise ValueError(f'requestCount argument is malformed: \"{requestCount}\"')
+
+        with self.__lock:
+            now = time.monotonic()
+            waitTime = self.__nextTime - now
+            self.__nextTime = max(now, self.__nextTime) + requestCount * self.__interval
+
+        if waitTime > 0:
+            time.sleep(waitTime)
+
+
+def createNamedResourcePageSchema() -> ResponseSchema:
+    # https://pokeapi.co/docs/v2#resource-listspagination-section
+    return ResponseSchema(
+        name = 'PokeApiNamedResourceList',
+        fields = [
+            SchemaField('next', str, optional = True),
+            SchemaField('results', SchemaList(ResponseSchema(
+                name = 'PokeApiNamedResource',
+                fields = [
+                    SchemaField('name', str)
+                ]
+            )))
+        ]
+    )
+
+def fetchNames(resource: str, rateLimiter: PokepediaWarmUpRateLimiter) -> List[str]:
+    namedResourcePageSchema = createNamedResourcePageSchema()
+    names = list()
+    url = f'https://pokeapi.co/api/v2/{resource}/?limit={PAGE_SIZE}&offset=0'
+
+    while utils.isValidStr(url):
+        rateLimiter.wait()
+
+        rawResponse = None
+        try:
+            rawResponse = requests.get(
+                url = url,
+                timeout = utils.getDefaultTimeout()
+            )
+        except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
+            print(f'Exception occurred when attempting to fetch PokeAPI \"{resource}\" names: {e}')
+            raise RuntimeError(f'Exception occurred when attempting to fetch PokeAPI \"{resource}\" names: {e}')
+
+        namedResourcePage = None
+        try:
+            namedResourcePage = namedResourcePageSchema.decode(utils.loadJson(rawResponse.content))
+        except (JSONDecodeError, ResponseSchemaError) as e:
+            print(f'Exception occurred when attempting to read PokeAPI \"{resource}\" names: {e}')
+            raise RuntimeError(f'Exception occurred when attempting to read PokeAPI \"{resource}\" names: {e}')
+
+        names.extend(namedResource.name for namedResource in namedResourcePage.results)
+        url = namedResourcePage.next
+
+    return names
+
+def warmUp(
+    resource: str,
+    updatedTimes: Dict[str, int],
+    maxAge: timedelta,
+    fetch: Callable,
+    fetchRequestCount: int,
+    store: Callable,
+    rateLimiter: PokepediaWarmUpRateLimiter
+):
+    names = fetchNames(resource, rateLimiter)
+    oldestTimestamp = (datetime.now(timezone.utc) - maxAge).timestamp()
+    staleNames = [ name for name in names if updatedTimes.get(name, 0) < oldestTimestamp ]
+    print(f'Found {len(names):,} PokeAPI \"{resource}\" names, {len(staleNames):,} of which need to be fetched')
+
+    def rateLimitedFetch(name: str):
+        rateLimiter.wait(fetchRequestCount)
+        return fetch(name)
+
+    # Only the fetching happens on the executor's threads. SQLite connections can't be shared
+    # between threads, so everything is written to the database from this thread.
+    executor = ThreadPoolExecutor(max_workers = MAX_PARALLELISM)
+    futures = [ executor.submit(rateLimitedFetch, name) for name in staleNames ]
+    batch = list()
+    storedCount = 0
+    failedCount = 0
+
+    try:
+        for future in as_completed(futures):
+            try:
+                batch.append(future.result())
+            except (RequestException, RuntimeError, ValueError) as e:
+                # RequestException covers whatever the repository doesn't already turn into a
+                # RuntimeError (e.g. a connection dropped partway through a response)
+                print(f'Skipping PokeAPI \"{resource}\": {e}')
+                failedCount = failedCount + 1
+
+            if len(batch) >= BATCH_SIZE:
+                store(batch)
+                storedCount = storedCount + len(batch)
+                batch.clear()
+                print(f'Stored {storedCount:,} of {len(staleNames):,} PokeAPI \"{resource}\" entries...')
+    finally:
+        executor.shutdown(wait = True, cancel_futures = True)
+
+        if utils.hasItems(batch):
+            store(batch)
+            storedCount = storedCount + len(batch)
+
+        print(f'Stored {storedCount:,} PokeAPI \"{resource}\" entries ({failedCount:,} failed)')
+
+def main():
+    args = sys.argv[1:]
+
+    if not args or args[0] not in ('moves', 'pokemon', 'all'):
+        print('python pokepediaWarmUp.py <moves|pokemon|all> [<databaseFile>] [<maxAgeDays>]')
+        sys.exit(1)
+
+    if len(args) >= 2:
+        backingDatabase = BackingDatabase(args[1])
+    else:
+        backingDatabase = BackingDatabase()
+
+    maxAge = timedelta(days = 30)
+    if len(args) >= 3:
+        maxAge = timedelta(days = float(args[2]))
+
+    pokepediaDatabase = PokepediaDatabase(backingDatabase)
+
+    # each Pokemon fetch makes two requests at the same time
+    pokepediaRepository = PokepediaRepository(maxConcurrentRequests = 2 * MAX_PARALLELISM)
+    rateLimiter = PokepediaWarmUpRateLimiter(MAX_REQUESTS_PER_SECOND)
+
+    try:
+        if args[0] in ('moves', 'all'):
+            warmUp(
+                resource = 'move',
+                updatedTimes = pokepediaDatabase.getMoveUpdatedTimes(),
+                maxAge = maxAge,
+                fetch = pokepediaRepository.fetchMove,
+                fetchRequestCount = MOVE_FETCH_REQUESTS,
+                store = pokepediaDatabase.addMoves,
+                rateLimiter = rateLimiter
+            )
+
+        if args[0] in ('pokemon', 'all'):
+            warmUp(
+                resource = 'pokemon',
+                updatedTimes = pokepediaDatabase.getPokemonUpdatedTimes(),
+                maxAge = maxAge,
+                fetch = pokepediaRepository.fetchPokemon,
+                fetchRequestCount = POKEMON_FETCH_REQUESTS,
+                store = pokepediaDatabase.addPokemons,
+                rateLimiter = rateLimiter
+            )
+    except KeyboardInterrupt:
+        print('Interrupted, everything fetched so far has been stored. Run this again to resume.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
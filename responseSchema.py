@@ -0,0 +1,193 @@
+from collections import namedtuple
+from typing import Any, Callable, List
+
+try:
+    import CynanBotCommon.utils as utils
+except:
+    import utils
+
+
+class ResponseSchemaError(ValueError):
+
+    def __init__(self, schemaName: str, errors: List[str]):
+        super().__init__(f'{schemaName} response is malformed: {"; ".join(errors)}')
+
+        self.__schemaName = schemaName
+        self.__errors = errors
+
+    def getErrors(self) -> List[str]:
+        return self.__errors
+
+    def getSchemaName(self) -> str:
+        return self.__schemaName
+
+
+class SchemaList():
+
+    def __init__(self, elementType):
+        if elementType is None:
+            raise ValueError(f'elementType argument is malformed: \"{elementType}\"')
+
+        self.__elementType = elementType
+
+    def getElementType(self):
+        return self.__elementType
+
+
+class SchemaField():
+
+    def __init__(
+        self,
+        key: str,
+        fieldType,
+        optional: bool = False,
+        default: Any = None
+    ):
+        if not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+        elif fieldType is None:
+            raise ValueError(f'fieldType argument is malformed: \"{fieldType}\"')
+        elif optional is None:
+            raise ValueError(f'optional argument is malformed: \"{optional}\"')
+
+        self.__key = key
+        self.__fieldType = fieldType
+        self.__optional = optional
+        self.__default = default
+
+    def getDefault(self) -> Any:
+        return self.__default
+
+    def getFieldType(self):
+        return self.__fieldType
+
+    def getKey(self) -> str:
+        return self.__key
+
+    def isOptional(self) -> bool:
+        return self.__optional
+
+
+class ResponseSchema():
+
+    # A ResponseSchema declares the shape of a JSON object returned by an upstream API. On
+    # construction it's compiled down to a flat list of (key, converter, optional, default)
+    # steps plus a namedtuple type, so decoding a payload is a single pass over those steps with
+    # no per-access argument validation. Every problem found during that pass is collected and
+    # reported together in one ResponseSchemaError.
+
+    def __init__(self, name: str, fields: List[SchemaField]):
+        if not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+        elif not utils.hasItems(fields):
+            raise ValueError(f'fields argument is malformed: \"{fields}\"')
+
+        self.__name = name
+        self.__tupleType = namedtuple(name, [ field.getKey() for field in fields ])
+        self.__steps = [ (field.getKey(), self.__compileConverter(field.getFieldType()), field.isOptional(), field.getDefault()) for field in fields ]
+
+    def __compileConverter(self, fieldType) -> Callable:
+        if isinstance(fieldType, ResponseSchema):
+            return fieldType.__decodeObject
+        elif isinstance(fieldType, SchemaList):
+            elementConverter = self.__compileConverter(fieldType.getElementType())
+
+            def convertList(value, path, errors: List[str]):
+                if not isinstance(value, list):
+                    errors.append(f'\"{self.__pathToStr(path)}\" should be a list but is {type(value).__name__}')
+                    return None
+
+                return [ elementConverter(element, (path, index), errors) for index, element in enumerate(value) ]
+
+            return convertList
+        elif fieldType is bool:
+            def convertBool(value, path, errors: List[str]):
+                if isinstance(value, bool):
+                    return value
+
+                errors.append(f'\"{self.__pathToStr(path)}\" should be a bool but is {type(value).__name__}')
+                return None
+
+            return convertBool
+        elif fieldType is int:
+            def convertInt(value, path, errors: List[str]):
+                if isinstance(value, int) and not isinstance(value, bool):
+                    return value
+                elif isinstance(value, float) and utils.isValidNum(value):
+                    return int(value)
+
+                errors.append(f'\"{self.__pathToStr(path)}\" should be an int but is {type(value).__name__}')
+                return None
+
+            return convertInt
+        elif fieldType is float:
+            def convertFloat(value, path, errors: List[str]):
+                if isinstance(value, (int, float)) and not isinstance(value, bool) and utils.isValidNum(value):
+                    return float(value)
+
+                errors.append(f'\"{self.__pathToStr(path)}\" should be a float but is {type(value).__name__}')
+                return None
+
+            return convertFloat
+        elif fieldType is str:
+            def convertStr(value, path, errors: List[str]):
+                if isinstance(value, str):
+                    return value
+
+                errors.append(f'\"{self.__pathToStr(path)}\" should be a str but is {type(value).__name__}')
+                return None
+
+            return convertStr
+        elif fieldType is Any:
+            return lambda value, path, errors: value
+        else:
+            raise ValueError(f'unsupported fieldType: \"{fieldType}\"')
+
+    def decode(self, jsonResponse: Any):
+        errors = list()
+        result = self.__decodeObject(jsonResponse, self.__name, errors)
+
+        if utils.hasItems(errors):
+            raise ResponseSchemaError(self.__name, errors)
+
+        return result
+
+    def __decodeObject(self, value, path, errors: List[str]):
+        if not isinstance(value, dict):
+            errors.append(f'\"{self.__pathToStr(path)}\" should be an object but is {type(value).__name__}')
+            return None
+
+        values = list()
+
+        for key, converter, optional, default in self.__steps:
+            fieldValue = value.get(key)
+
+            if fieldValue is None:
+                if not optional:
+                    errors.append(f'\"{self.__pathToStr((path, key))}\" is missing')
+
+                values.append(default)
+            else:
+                values.append(converter(fieldValue, (path, key), errors))
+
+        return self.__tupleType._make(values)
+
+    def getName(self) -> str:
+        return self.__name
+
+    def __pathToStr(self, path) -> str:
+        # Paths are built up as nested (parent, key) tuples while decoding, and are only turned
+        # into strings if something actually goes wrong.
+        parts = list()
+
+        while isinstance(path, tuple):
+            path, key = path
+
+            if isinstance(key, int):
+                parts.append(f'[{key}]')
+            else:
+                parts.append(f'.{key}')
+
+        parts.append(path)
+        parts.reverse()
+        return ''.join(parts)
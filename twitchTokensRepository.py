@@ -8,6 +8,8 @@ from requests import ConnectionError, HTTPError, Timeout
 from urllib3.exceptions import MaxRetryError, NewConnectionError
 
 import CynanBotCommon.utils as utils
+from CynanBotCommon.responseSchema import (ResponseSchema, ResponseSchemaError,
+                                           SchemaField)
 
 
 class TwitchTokensRepository():
@@ -28,6 +30,27 @@ class TwitchTokensRepository():
         self.__oauth2TokenUrl = oauth2TokenUrl
         self.__oauth2ValidateUrl = oauth2ValidateUrl
         self.__twitchTokensFile = twitchTokensFile
+        self.__tokensSchema = self.__createTokensSchema()
+        self.__validationSchema = self.__createValidationSchema()
+
+    def __createTokensSchema(self) -> ResponseSchema:
+        # https://dev.twitch.tv/docs/authentication/refresh-tokens
+        return ResponseSchema(
+            name = 'TwitchTokens',
+            fields = [
+                SchemaField('access_token', str),
+                SchemaField('refresh_token', str)
+            ]
+        )
+
+    def __createValidationSchema(self) -> ResponseSchema:
+        # https://dev.twitch.tv/docs/authentication/validate-tokens
+        return ResponseSchema(
+            name = 'TwitchTokenValidation',
+            fields = [
+                SchemaField('client_id', str, optional = True)
+            ]
+        )
 
     def getAccessToken(self, twitchHandle: str) -> str:
         if not utils.isValidStr(twitchHandle):
@@ -113,20 +136,26 @@ class TwitchTokensRepository():
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
             print(f'Exception occurred when attempting to decode new Twitch tokens response into JSON: {e}')
             raise RuntimeError(f'Exception occurred when attempting to decode new Twitch tokens response into JSON: {e}')
 
-        if 'access_token' not in jsonResponse or len(jsonResponse['access_token']) == 0:
+        tokens = None
+        try:
+            tokens = self.__tokensSchema.decode(jsonResponse)
+        except ResponseSchemaError as e:
+            raise ValueError(f'Received malformed Twitch tokens: {e}')
+
+        if len(tokens.access_token) == 0:
             raise ValueError(f'Received malformed \"access_token\" Twitch token: {jsonResponse}')
-        elif 'refresh_token' not in jsonResponse or len(jsonResponse['refresh_token']) == 0:
+        elif len(tokens.refresh_token) == 0:
             raise ValueError(f'Received malformed \"refresh_token\" Twitch token: {jsonResponse}')
 
         jsonContents = dict()
         jsonContents[twitchHandle] = {
-            'accessToken': jsonResponse['access_token'],
-            'refreshToken': jsonResponse['refresh_token']
+            'accessToken': tokens.access_token,
+            'refreshToken': tokens.refresh_token
         }
 
         with open(self.__twitchTokensFile, 'w') as file:
@@ -164,12 +193,19 @@ class TwitchTokensRepository():
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
             print(f'Exception occurred when attempting to decode Twitch\'s response into JSON: {e}')
             raise RuntimeError(f'Exception occurred when attempting to decode Twitch\'s response into JSON: {e}')
 
-        if jsonResponse.get('client_id') is None or len(jsonResponse['client_id']) == 0:
+        validation = None
+        try:
+            validation = self.__validationSchema.decode(jsonResponse)
+        except ResponseSchemaError as e:
+            print(f'Exception occurred when attempting to read Twitch\'s token validation response: {e}')
+            raise ValueError(f'Exception occurred when attempting to read Twitch\'s token validation response: {e}')
+
+        if not utils.isValidStr(validation.client_id):
             print(f'Requesting new Twitch tokens for \"{twitchHandle}\"... ({utils.getNowTimeText(includeSeconds = True)})')
 
             self.__refreshTokens(
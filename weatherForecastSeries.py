@@ -0,0 +1,223 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import CynanBotCommon.utils as utils
+
+
+class WeatherForecastSeries():
+
+    # Holds Open Weather's hourly and daily forecasts as parallel NumPy arrays (one array per
+    # field, all sharing the same index) so that range and threshold queries are vectorized and
+    # no per-hour Python objects are kept around.
+
+    def __init__(
+        self,
+        hourlyTimestamps: np.ndarray,
+        hourlyTemperatures: np.ndarray,
+        hourlyPrecipitationProbabilities: np.ndarray,
+        hourlyWindSpeeds: np.ndarray,
+        dailyTimestamps: np.ndarray,
+        dailyHighTemperatures: np.ndarray,
+        dailyLowTemperatures: np.ndarray,
+        dailyPrecipitationProbabilities: np.ndarray,
+        dailyWindSpeeds: np.ndarray
+    ):
+        if hourlyTimestamps is None:
+            raise ValueError(f'hourlyTimestamps argument is malformed: \"{hourlyTimestamps}\"')
+        elif hourlyTemperatures is None or len(hourlyTemperatures) != len(hourlyTimestamps):
+            raise ValueError(f'hourlyTemperatures argument is malformed: \"{hourlyTemperatures}\"')
+        elif hourlyPrecipitationProbabilities is None or len(hourlyPrecipitationProbabilities) != len(hourlyTimestamps):
+            raise ValueError(f'hourlyPrecipitationProbabilities argument is malformed: \"{hourlyPrecipitationProbabilities}\"')
+        elif hourlyWindSpeeds is None or len(hourlyWindSpeeds) != len(hourlyTimestamps):
+            raise ValueError(f'hourlyWindSpeeds argument is malformed: \"{hourlyWindSpeeds}\"')
+        elif dailyTimestamps is None:
+            raise ValueError(f'dailyTimestamps argument is malformed: \"{dailyTimestamps}\"')
+        elif dailyHighTemperatures is None or len(dailyHighTemperatures) != len(dailyTimestamps):
+            raise ValueError(f'dailyHighTemperatures argument is malformed: \"{dailyHighTemperatures}\"')
+        elif dailyLowTemperatures is None or len(dailyLowTemperatures) != len(dailyTimestamps):
+            raise ValueError(f'dailyLowTemperatures argument is malformed: \"{dailyLowTemperatures}\"')
+        elif dailyPrecipitationProbabilities is None or len(dailyPrecipitationProbabilities) != len(dailyTimestamps):
+            raise ValueError(f'dailyPrecipitationProbabilities argument is malformed: \"{dailyPrecipitationProbabilities}\"')
+        elif dailyWindSpeeds is None or len(dailyWindSpeeds) != len(dailyTimestamps):
+            raise ValueError(f'dailyWindSpeeds argument is malformed: \"{dailyWindSpeeds}\"')
+
+        self.__hourlyTimestamps = hourlyTimestamps
+        self.__hourlyTemperatures = hourlyTemperatures
+        self.__hourlyPrecipitationProbabilities = hourlyPrecipitationProbabilities
+        self.__hourlyWindSpeeds = hourlyWindSpeeds
+        self.__dailyTimestamps = dailyTimestamps
+        self.__dailyHighTemperatures = dailyHighTemperatures
+        self.__dailyLowTemperatures = dailyLowTemperatures
+        self.__dailyPrecipitationProbabilities = dailyPrecipitationProbabilities
+        self.__dailyWindSpeeds = dailyWindSpeeds
+
+    @classmethod
+    def fromJson(cls, jsonResponse: Dict):
+        if not utils.hasItems(jsonResponse):
+            raise ValueError(f'jsonResponse argument is malformed: \"{jsonResponse}\"')
+
+        hourlyJson = jsonResponse.get('hourly') or list()
+        dailyJson = jsonResponse.get('daily') or list()
+        hourlyCount = len(hourlyJson)
+        dailyCount = len(dailyJson)
+
+        try:
+            return cls(
+                hourlyTimestamps = np.fromiter((hour['dt'] for hour in hourlyJson), dtype = np.int64, count = hourlyCount),
+                hourlyTemperatures = np.fromiter((hour['temp'] for hour in hourlyJson), dtype = np.float32, count = hourlyCount),
+                hourlyPrecipitationProbabilities = np.fromiter((hour.get('pop', 0) for hour in hourlyJson), dtype = np.float32, count = hourlyCount),
+                hourlyWindSpeeds = np.fromiter((hour.get('wind_speed', 0) for hour in hourlyJson), dtype = np.float32, count = hourlyCount),
+                dailyTimestamps = np.fromiter((day['dt'] for day in dailyJson), dtype = np.int64, count = dailyCount),
+                dailyHighTemperatures = np.fromiter((day['temp']['max'] for day in dailyJson), dtype = np.float32, count = dailyCount),
+                dailyLowTemperatures = np.fromiter((day['temp']['min'] for day in dailyJson), dtype = np.float32, count = dailyCount),
+                dailyPrecipitationProbabilities = np.fromiter((day.get('pop', 0) for day in dailyJson), dtype = np.float32, count = dailyCount),
+                dailyWindSpeeds = np.fromiter((day.get('wind_speed', 0) for day in dailyJson), dtype = np.float32, count = dailyCount)
+            )
+        except (AttributeError, KeyError, TypeError) as e:
+            print(f'Exception occurred when attempting to read forecast series from JSON response: {e}')
+            raise ValueError(f'Exception occurred when attempting to read forecast series from JSON response: {e}')
+
+    def __cToF(self, celsius: np.ndarray) -> np.ndarray:
+        return (celsius * (9 / 5)) + 32
+
+    def getDailyHighTemperatures(self, imperial: bool = False) -> np.ndarray:
+        if imperial is None:
+            raise ValueError(f'imperial argument is malformed: \"{imperial}\"')
+
+        if imperial:
+            return self.__cToF(self.__dailyHighTemperatures)
+        else:
+            return self.__dailyHighTemperatures
+
+    def getDailyLowTemperatures(self, imperial: bool = False) -> np.ndarray:
+        if imperial is None:
+            raise ValueError(f'imperial argument is malformed: \"{imperial}\"')
+
+        if imperial:
+            return self.__cToF(self.__dailyLowTemperatures)
+        else:
+            return self.__dailyLowTemperatures
+
+    def getDailyPrecipitationProbabilities(self) -> np.ndarray:
+        return self.__dailyPrecipitationProbabilities
+
+    def getDailyTimestamps(self) -> np.ndarray:
+        return self.__dailyTimestamps
+
+    def getDailyWindSpeeds(self, imperial: bool = False) -> np.ndarray:
+        if imperial is None:
+            raise ValueError(f'imperial argument is malformed: \"{imperial}\"')
+
+        if imperial:
+            return self.__msToMph(self.__dailyWindSpeeds)
+        else:
+            return self.__dailyWindSpeeds
+
+    def getHourlyPrecipitationProbabilities(self) -> np.ndarray:
+        return self.__hourlyPrecipitationProbabilities
+
+    def getHourlyTemperatures(self, imperial: bool = False) -> np.ndarray:
+        if imperial is None:
+            raise ValueError(f'imperial argument is malformed: \"{imperial}\"')
+
+        if imperial:
+            return self.__cToF(self.__hourlyTemperatures)
+        else:
+            return self.__hourlyTemperatures
+
+    def getHourlyTimestamps(self) -> np.ndarray:
+        return self.__hourlyTimestamps
+
+    def getHourlyWindSpeeds(self, imperial: bool = False) -> np.ndarray:
+        if imperial is None:
+            raise ValueError(f'imperial argument is malformed: \"{imperial}\"')
+
+        if imperial:
+            return self.__msToMph(self.__hourlyWindSpeeds)
+        else:
+            return self.__hourlyWindSpeeds
+
+    def __getHourlyRange(self, start: datetime, end: datetime) -> slice:
+        if start is None:
+            raise ValueError(f'start argument is malformed: \"{start}\"')
+        elif end is None or end < start:
+            raise ValueError(f'end argument is malformed: \"{end}\"')
+
+        # the hourly timestamps are sorted, so the range can be found with a binary search
+        startIndex = np.searchsorted(self.__hourlyTimestamps, self.__toTimestamp(start), side = 'left')
+        endIndex = np.searchsorted(self.__hourlyTimestamps, self.__toTimestamp(end), side = 'right')
+        return slice(startIndex, endIndex)
+
+    def getMaxPrecipitationProbability(self, start: datetime, end: datetime) -> float:
+        hourRange = self.__getHourlyRange(start, end)
+        return self.__reduce(np.max, self.__hourlyPrecipitationProbabilities[hourRange])
+
+    def getMaxTemperature(self, start: datetime, end: datetime, imperial: bool = False) -> float:
+        hourRange = self.__getHourlyRange(start, end)
+        return self.__reduce(np.max, self.getHourlyTemperatures(imperial)[hourRange])
+
+    def getMaxWindSpeed(self, start: datetime, end: datetime, imperial: bool = False) -> float:
+        hourRange = self.__getHourlyRange(start, end)
+        return self.__reduce(np.max, self.getHourlyWindSpeeds(imperial)[hourRange])
+
+    def getMinTemperature(self, start: datetime, end: datetime, imperial: bool = False) -> float:
+        hourRange = self.__getHourlyRange(start, end)
+        return self.__reduce(np.min, self.getHourlyTemperatures(imperial)[hourRange])
+
+    def getNextRainWindow(
+        self,
+        minPrecipitationProbability: float = 0.5,
+        withinHours: int = 48
+    ) -> Optional[Tuple[datetime, datetime]]:
+        if not utils.isValidNum(minPrecipitationProbability) or minPrecipitationProbability < 0 or minPrecipitationProbability > 1:
+            raise ValueError(f'minPrecipitationProbability argument is malformed: \"{minPrecipitationProbability}\"')
+        elif not utils.isValidNum(withinHours) or withinHours < 1:
+            raise ValueError(f'withinHours argument is malformed: \"{withinHours}\"')
+
+        now = datetime.now(timezone.utc)
+        hourRange = self.__getHourlyRange(now - timedelta(hours = 1), now + timedelta(hours = withinHours))
+        timestamps = self.__hourlyTimestamps[hourRange]
+        rainy = self.__hourlyPrecipitationProbabilities[hourRange] >= minPrecipitationProbability
+
+        if not rainy.any():
+            return None
+
+        startIndex = int(np.argmax(rainy))
+        remaining = rainy[startIndex:]
+        endIndex = len(rainy) if remaining.all() else startIndex + int(np.argmin(remaining))
+
+        # each hourly entry covers the hour that begins at its timestamp
+        start = datetime.fromtimestamp(int(timestamps[startIndex]), timezone.utc)
+        end = datetime.fromtimestamp(int(timestamps[endIndex - 1]), timezone.utc) + timedelta(hours = 1)
+        return start, end
+
+    def getRainyHours(self, minPrecipitationProbability: float = 0.5) -> List[datetime]:
+        if not utils.isValidNum(minPrecipitationProbability) or minPrecipitationProbability < 0 or minPrecipitationProbability > 1:
+            raise ValueError(f'minPrecipitationProbability argument is malformed: \"{minPrecipitationProbability}\"')
+
+        timestamps = self.__hourlyTimestamps[self.__hourlyPrecipitationProbabilities >= minPrecipitationProbability]
+        return [ datetime.fromtimestamp(int(timestamp), timezone.utc) for timestamp in timestamps ]
+
+    def hasDailyForecast(self) -> bool:
+        return len(self.__dailyTimestamps) >= 1
+
+    def hasHourlyForecast(self) -> bool:
+        return len(self.__hourlyTimestamps) >= 1
+
+    def __msToMph(self, metersPerSecond: np.ndarray) -> np.ndarray:
+        return metersPerSecond * 2.23694
+
+    def __reduce(self, function, values: np.ndarray) -> float:
+        if len(values) == 0:
+            return None
+        else:
+            return float(function(values))
+
+    def __toTimestamp(self, dt: datetime) -> int:
+        # naive datetimes are assumed to be UTC, in keeping with datetime.utcnow() elsewhere
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo = timezone.utc)
+
+        return int(dt.timestamp())
@@ -0,0 +1,263 @@
+from datetime import datetime, timezone
+from typing import List
+
+import CynanBotCommon.utils as utils
+from CynanBotCommon.backingDatabase import BackingDatabase
+from CynanBotCommon.weatherReport import WeatherReport
+
+
+class WeatherHistoryDailyAggregate():
+
+    def __init__(
+        self,
+        averageTemperature: float,
+        maxTemperature: float,
+        minTemperature: float,
+        reportCount: int,
+        day: str
+    ):
+        if not utils.isValidNum(averageTemperature):
+            raise ValueError(f'averageTemperature argument is malformed: \"{averageTemperature}\"')
+        elif not utils.isValidNum(maxTemperature):
+            raise ValueError(f'maxTemperature argument is malformed: \"{maxTemperature}\"')
+        elif not utils.isValidNum(minTemperature):
+            raise ValueError(f'minTemperature argument is malformed: \"{minTemperature}\"')
+        elif not utils.isValidNum(reportCount):
+            raise ValueError(f'reportCount argument is malformed: \"{reportCount}\"')
+        elif not utils.isValidStr(day):
+            raise ValueError(f'day argument is malformed: \"{day}\"')
+
+        self.__averageTemperature = averageTemperature
+        self.__maxTemperature = maxTemperature
+        self.__minTemperature = minTemperature
+        self.__reportCount = reportCount
+        self.__day = day
+
+    def getAverageTemperature(self) -> float:
+        return self.__averageTemperature
+
+    def getDay(self) -> str:
+        return self.__day
+
+    def getMaxTemperature(self) -> float:
+        return self.__maxTemperature
+
+    def getMinTemperature(self) -> float:
+        return self.__minTemperature
+
+    def getReportCount(self) -> int:
+        return self.__reportCount
+
+
+class WeatherHistoryEntry():
+
+    def __init__(
+        self,
+        airQuality: int,
+        humidity: int,
+        pressure: int,
+        temperature: float,
+        timestamp: datetime,
+        locationId: str
+    ):
+        if not utils.isValidNum(humidity):
+            raise ValueError(f'humidity argument is malformed: \"{humidity}\"')
+        elif not utils.isValidNum(pressure):
+            raise ValueError(f'pressure argument is malformed: \"{pressure}\"')
+        elif not utils.isValidNum(temperature):
+            raise ValueError(f'temperature argument is malformed: \"{temperature}\"')
+        elif timestamp is None:
+            raise ValueError(f'timestamp argument is malformed: \"{timestamp}\"')
+        elif not utils.isValidStr(locationId):
+            raise ValueError(f'locationId argument is malformed: \"{locationId}\"')
+
+        self.__airQuality = airQuality
+        self.__humidity = humidity
+        self.__pressure = pressure
+        self.__temperature = temperature
+        self.__timestamp = timestamp
+        self.__locationId = locationId
+
+    def getAirQuality(self) -> int:
+        return self.__airQuality
+
+    def getHumidity(self) -> int:
+        return self.__humidity
+
+    def getLocationId(self) -> str:
+        return self.__locationId
+
+    def getPressure(self) -> int:
+        return self.__pressure
+
+    def getTemperature(self) -> float:
+        return self.__temperature
+
+    def getTimestamp(self) -> datetime:
+        return self.__timestamp
+
+    def hasAirQuality(self) -> bool:
+        return utils.isValidNum(self.__airQuality)
+
+
+class WeatherHistoryRepository():
+
+    # Every report is written as soon as it's added. Reports only arrive about once an hour per
+    # location, so a single small INSERT each time is cheap, and nothing is lost on a restart.
+    # Temperatures are kept exactly as reported (not rounded like WeatherReport.getTemperature()),
+    # so that averages over a day aren't thrown off by rounding.
+
+    def __init__(self, backingDatabase: BackingDatabase):
+        if backingDatabase is None:
+            raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
+
+        self.__backingDatabase = backingDatabase
+
+        self.__initDatabaseTable()
+
+    def addWeatherReport(self, locationId: str, weatherReport: WeatherReport):
+        if not utils.isValidStr(locationId):
+            raise ValueError(f'locationId argument is malformed: \"{locationId}\"')
+        elif weatherReport is None:
+            raise ValueError(f'weatherReport argument is malformed: \"{weatherReport}\"')
+
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                INSERT OR REPLACE INTO weatherHistory (locationId, timestamp, airQuality, humidity, pressure, temperature)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''',
+            (
+                locationId,
+                int(datetime.now(timezone.utc).timestamp()),
+                weatherReport.getAirQuality(),
+                weatherReport.getHumidity(),
+                weatherReport.getPressure(),
+                weatherReport.getRawTemperature()
+            )
+        )
+
+        connection.commit()
+
+    def fetchAverageTemperature(self, locationId: str, start: datetime, end: datetime) -> float:
+        startTimestamp, endTimestamp = self.__toTimestampRange(locationId, start, end)
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT AVG(temperature) FROM weatherHistory
+                WHERE locationId = ? AND timestamp BETWEEN ? AND ?
+            ''',
+            (locationId, startTimestamp, endTimestamp)
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0]
+
+    def fetchDailyAggregates(self, locationId: str, start: datetime, end: datetime) -> List[WeatherHistoryDailyAggregate]:
+        startTimestamp, endTimestamp = self.__toTimestampRange(locationId, start, end)
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT DATE(timestamp, 'unixepoch') AS day, AVG(temperature), MAX(temperature), MIN(temperature), COUNT(*)
+                FROM weatherHistory
+                WHERE locationId = ? AND timestamp BETWEEN ? AND ?
+                GROUP BY day
+                ORDER BY day ASC
+            ''',
+            (locationId, startTimestamp, endTimestamp)
+        )
+
+        aggregates = list()
+
+        for row in cursor.fetchall():
+            aggregates.append(WeatherHistoryDailyAggregate(
+                averageTemperature = row[1],
+                maxTemperature = row[2],
+                minTemperature = row[3],
+                reportCount = row[4],
+                day = row[0]
+            ))
+
+        cursor.close()
+        return aggregates
+
+    def fetchHistory(self, locationId: str, start: datetime, end: datetime) -> List[WeatherHistoryEntry]:
+        startTimestamp, endTimestamp = self.__toTimestampRange(locationId, start, end)
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT timestamp, airQuality, humidity, pressure, temperature FROM weatherHistory
+                WHERE locationId = ? AND timestamp BETWEEN ? AND ?
+                ORDER BY timestamp ASC
+            ''',
+            (locationId, startTimestamp, endTimestamp)
+        )
+
+        entries = list()
+
+        for row in cursor.fetchall():
+            entries.append(WeatherHistoryEntry(
+                airQuality = row[1],
+                humidity = row[2],
+                pressure = row[3],
+                temperature = row[4],
+                timestamp = datetime.fromtimestamp(row[0], timezone.utc),
+                locationId = locationId
+            ))
+
+        cursor.close()
+        return entries
+
+    def fetchReportCount(self, locationId: str, start: datetime, end: datetime) -> int:
+        startTimestamp, endTimestamp = self.__toTimestampRange(locationId, start, end)
+        cursor = self.__backingDatabase.getConnection().cursor()
+        cursor.execute(
+            '''
+                SELECT COUNT(*) FROM weatherHistory
+                WHERE locationId = ? AND timestamp BETWEEN ? AND ?
+            ''',
+            (locationId, startTimestamp, endTimestamp)
+        )
+
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0]
+
+    def __initDatabaseTable(self):
+        connection = self.__backingDatabase.getConnection()
+        connection.execute(
+            '''
+                CREATE TABLE IF NOT EXISTS weatherHistory (
+                    locationId TEXT NOT NULL COLLATE NOCASE,
+                    timestamp INTEGER NOT NULL,
+                    airQuality INTEGER,
+                    humidity INTEGER NOT NULL,
+                    pressure INTEGER NOT NULL,
+                    temperature REAL NOT NULL,
+                    PRIMARY KEY (locationId, timestamp)
+                ) WITHOUT ROWID
+            '''
+        )
+
+        connection.commit()
+
+    def __toTimestampRange(self, locationId: str, start: datetime, end: datetime):
+        if not utils.isValidStr(locationId):
+            raise ValueError(f'locationId argument is malformed: \"{locationId}\"')
+        elif start is None:
+            raise ValueError(f'start argument is malformed: \"{start}\"')
+        elif end is None:
+            raise ValueError(f'end argument is malformed: \"{end}\"')
+
+        # naive datetimes are assumed to be UTC, in keeping with datetime.utcnow() elsewhere
+        if start.tzinfo is None:
+            start = start.replace(tzinfo = timezone.utc)
+
+        if end.tzinfo is None:
+            end = end.replace(tzinfo = timezone.utc)
+
+        if end < start:
+            raise ValueError(f'end argument ({end}) is before start argument ({start})')
+
+        return int(start.timestamp()), int(end.timestamp())
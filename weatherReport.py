@@ -63,6 +63,10 @@ class WeatherReport():
     def getPressureStr(self) -> str:
         return locale.format_string("%d", self.getPressure(), grouping = True)
 
+    def getRawTemperature(self) -> float:
+        # the temperature as it was reported, without getTemperature()'s rounding
+        return self.__temperature
+
     def getTemperature(self):
         return int(round(self.__temperature))
 
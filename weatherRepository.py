@@ -1,5 +1,6 @@
 from datetime import timedelta
 from json.decoder import JSONDecodeError
+from typing import Dict, List, Tuple
 
 import requests
 from requests import ConnectionError, HTTPError, Timeout
@@ -7,7 +8,11 @@ from urllib3.exceptions import MaxRetryError, NewConnectionError
 
 import CynanBotCommon.utils as utils
 from CynanBotCommon.locationsRepository import Location
+from CynanBotCommon.responseSchema import (ResponseSchema, ResponseSchemaError,
+                                           SchemaField, SchemaList)
 from CynanBotCommon.timedDict import TimedDict
+from CynanBotCommon.weatherForecastSeries import WeatherForecastSeries
+from CynanBotCommon.weatherHistoryRepository import WeatherHistoryRepository
 from CynanBotCommon.weatherReport import WeatherReport
 
 
@@ -17,30 +22,65 @@ class WeatherRepository():
         self,
         oneWeatherApiKey: str,
         iqAirApiKey: str = None,
-        cacheTimeDelta: timedelta = timedelta(hours = 1, minutes = 30)
+        cacheTimeDelta: timedelta = None,
+        airQualityCacheTimeDelta: timedelta = None,
+        alertsCacheTimeDelta: timedelta = None,
+        conditionsCacheTimeDelta: timedelta = None,
+        forecastCacheTimeDelta: timedelta = None,
+        includeForecastSeries: bool = False,
+        weatherHistoryRepository: WeatherHistoryRepository = None
     ):
         if not utils.isValidStr(oneWeatherApiKey):
             raise ValueError(f'oneWeatherApiKey argument is malformed: \"{oneWeatherApiKey}\"')
-        elif cacheTimeDelta is None:
-            raise ValueError(f'cacheTimeDelta argument is malformed: \"{cacheTimeDelta}\"')
+        elif includeForecastSeries is None:
+            raise ValueError(f'includeForecastSeries argument is malformed: \"{includeForecastSeries}\"')
 
         if not utils.isValidStr(iqAirApiKey):
             print(f'IQAir API key is malformed: \"{iqAirApiKey}\". This won\'t prevent us from fetching weather, but it will prevent us from fetching the current air quality conditions at the given location.')
 
         self.__iqAirApiKey = iqAirApiKey
         self.__oneWeatherApiKey = oneWeatherApiKey
-        self.__cache = TimedDict(timeDelta = cacheTimeDelta)
+        self.__includeForecastSeries = includeForecastSeries
+        self.__weatherHistoryRepository = weatherHistoryRepository
+
+        # cacheTimeDelta is the single cache time that every part of a WeatherReport used to
+        # share. It's still accepted, and is used for each part that isn't given a cache time of
+        # its own. Without it, each part has its own default.
+        airQualityCacheTimeDelta = self.__chooseTimeDelta(airQualityCacheTimeDelta, cacheTimeDelta, timedelta(hours = 3))
+        alertsCacheTimeDelta = self.__chooseTimeDelta(alertsCacheTimeDelta, cacheTimeDelta, timedelta(minutes = 10))
+        conditionsCacheTimeDelta = self.__chooseTimeDelta(conditionsCacheTimeDelta, cacheTimeDelta, timedelta(hours = 1))
+        forecastCacheTimeDelta = self.__chooseTimeDelta(forecastCacheTimeDelta, cacheTimeDelta, timedelta(hours = 3))
+
+        # Each part of a WeatherReport changes at a different rate upstream, so each one is cached
+        # on its own schedule. The WeatherReport itself is assembled on read. Conditions, alerts
+        # and the forecast all come from Open Weather's One Call API, and whichever of them are
+        # out of date are re-fetched together, in a single request (see __fetchOneCallParts()).
+        self.__airQualityCache = TimedDict(timeDelta = airQualityCacheTimeDelta)
+        self.__alertsCache = TimedDict(timeDelta = alertsCacheTimeDelta)
+        self.__conditionsCache = TimedDict(timeDelta = conditionsCacheTimeDelta)
+        self.__forecastCache = TimedDict(timeDelta = forecastCacheTimeDelta)
+        self.__forecastSeriesCache = TimedDict(timeDelta = forecastCacheTimeDelta)
+
         self.__conditionIcons = self.__createConditionIconsDict()
+        self.__createSchemas()
+
+    def __chooseTimeDelta(self, timeDelta: timedelta, cacheTimeDelta: timedelta, default: timedelta) -> timedelta:
+        if timeDelta is not None:
+            return timeDelta
+        elif cacheTimeDelta is not None:
+            return cacheTimeDelta
+        else:
+            return default
 
-    def __chooseTomorrowFromForecast(self, jsonResponse: dict):
-        currentSunrise = jsonResponse['current']['sunrise']
-        currentSunset = jsonResponse['current']['sunset']
+    def __chooseTomorrowFromForecast(self, forecast):
+        currentSunrise = forecast.current.sunrise
+        currentSunset = forecast.current.sunset
 
-        for dayJson in jsonResponse['daily']:
-            if dayJson['sunrise'] > currentSunrise and dayJson['sunset'] > currentSunset:
-                return dayJson
+        for day in forecast.daily:
+            if day.sunrise > currentSunrise and day.sunset > currentSunset:
+                return day
 
-        raise RuntimeError(f'Unable to find viable tomorrow data in JSON response: \"{jsonResponse}\"')
+        raise RuntimeError(f'Unable to find viable tomorrow data in forecast: \"{forecast}\"')
 
     def __createConditionIconsDict(self):
         # This dictionary is built from the Weather Condition Codes listed here:
@@ -88,10 +128,119 @@ class WeatherRepository():
 
         return icons
 
+    def __createSchemas(self):
+        # These schemas are built from the response formats documented here:
+        # https://openweathermap.org/api/one-call-api
+        # https://api-docs.iqair.com/
+
+        conditionSchema = ResponseSchema(
+            name = 'WeatherCondition',
+            fields = [
+                SchemaField('id', int, optional = True),
+                SchemaField('description', str)
+            ]
+        )
+
+        currentSchema = ResponseSchema(
+            name = 'WeatherCurrent',
+            fields = [
+                SchemaField('humidity', float),
+                SchemaField('pressure', float),
+                SchemaField('sunrise', int, optional = True, default = 0),
+                SchemaField('sunset', int, optional = True, default = 0),
+                SchemaField('temp', float),
+                SchemaField('weather', SchemaList(conditionSchema), optional = True)
+            ]
+        )
+
+        dayTemperatureSchema = ResponseSchema(
+            name = 'WeatherDayTemperature',
+            fields = [
+                SchemaField('max', float),
+                SchemaField('min', float)
+            ]
+        )
+
+        daySchema = ResponseSchema(
+            name = 'WeatherDay',
+            fields = [
+                SchemaField('sunrise', int, optional = True, default = 0),
+                SchemaField('sunset', int, optional = True, default = 0),
+                SchemaField('temp', dayTemperatureSchema),
+                SchemaField('weather', SchemaList(conditionSchema), optional = True)
+            ]
+        )
+
+        alertSchema = ResponseSchema(
+            name = 'WeatherAlert',
+            fields = [
+                SchemaField('event', str, optional = True),
+                SchemaField('sender_name', str, optional = True)
+            ]
+        )
+
+        self.__alertsSchema = ResponseSchema(
+            name = 'WeatherAlerts',
+            fields = [
+                SchemaField('alerts', SchemaList(alertSchema), optional = True)
+            ]
+        )
+
+        self.__conditionsSchema = ResponseSchema(
+            name = 'WeatherConditions',
+            fields = [
+                SchemaField('current', currentSchema)
+            ]
+        )
+
+        self.__forecastSchema = ResponseSchema(
+            name = 'WeatherForecast',
+            fields = [
+                SchemaField('current', currentSchema),
+                SchemaField('daily', SchemaList(daySchema))
+            ]
+        )
+
+        self.__airQualitySchema = ResponseSchema(
+            name = 'AirQuality',
+            fields = [
+                SchemaField('status', str, optional = True),
+                SchemaField('data', ResponseSchema(
+                    name = 'AirQualityData',
+                    fields = [
+                        SchemaField('current', ResponseSchema(
+                            name = 'AirQualityCurrent',
+                            fields = [
+                                SchemaField('pollution', ResponseSchema(
+                                    name = 'AirQualityPollution',
+                                    fields = [
+                                        SchemaField('aqius', int)
+                                    ]
+                                ))
+                            ]
+                        ))
+                    ]
+                ), optional = True)
+            ]
+        )
+
+    def __decode(self, schema: ResponseSchema, jsonResponse: Dict, location: Location):
+        try:
+            return schema.decode(jsonResponse)
+        except ResponseSchemaError as e:
+            print(f'Exception occurred when attempting to read {schema.getName()} response for \"{location.getLocationId()}\": {e}')
+            raise ValueError(f'Exception occurred when attempting to read {schema.getName()} response for \"{location.getLocationId()}\": {e}')
+
     def __fetchAirQuality(self, location: Location) -> int:
         if location is None:
             raise ValueError(f'location argument is malformed: \"{location}\"')
 
+        cacheValue = self.__airQualityCache[location.getLocationId()]
+        if cacheValue is not None:
+            return cacheValue
+
+        print(f'Refreshing air quality for \"{location.getLocationId()}\"... ({utils.getNowTimeText()})')
+
         # Retrieve air quality from: https://api-docs.iqair.com/
         # Doing this requires an API key, which you can get here:
         # https://www.iqair.com/us/commercial/air-quality-monitors/airvisual-platform/api
@@ -108,50 +257,43 @@ class WeatherRepository():
 
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
             print(f'Exception occurred when attempting to decode IQAir\'s response into JSON for \"{location.getLocationId()}\": {e}')
             raise RuntimeError(f'Exception occurred when attempting to decode IQAir\'s response into JSON for \"{location.getLocationId()}\": {e}')
 
-        if jsonResponse.get('status') != 'success':
+        airQualityResponse = self.__decode(self.__airQualitySchema, jsonResponse, location)
+
+        if airQualityResponse.status != 'success' or airQualityResponse.data is None:
             print(f'IQAir\'s response \"status\" was not \"success\": {jsonResponse}')
             raise ValueError(f'IQAir\'s response \"status\" was not \"success\": {jsonResponse}')
 
-        return utils.getIntFromDict(
-            d = jsonResponse['data']['current']['pollution'],
-            key = 'aqius'
-        )
+        airQuality = airQualityResponse.data.current.pollution.aqius
 
-    def fetchWeather(self, location: Location) -> WeatherReport:
+        self.__airQualityCache[location.getLocationId()] = airQuality
+        return airQuality
+
+    def fetchForecastSeries(self, location: Location) -> WeatherForecastSeries:
         if location is None:
             raise ValueError(f'location argument is malformed: \"{location}\"')
+        elif not self.__includeForecastSeries:
+            raise RuntimeError(f'Unable to fetch forecast series for \"{location.getLocationId()}\" as includeForecastSeries is disabled')
 
-        cacheValue = self.__cache[location.getLocationId()]
-        if cacheValue is not None:
-            return cacheValue
-
-        weatherReport = self.__fetchWeather(location)
-        self.__cache[location.getLocationId()] = weatherReport
+        _, _, _, forecastSeries = self.__fetchOneCallParts(location, forecastOnly = True)
+        return forecastSeries
 
-        return weatherReport
-
-    def __fetchWeather(self, location: Location) -> WeatherReport:
+    def __fetchOneCall(self, location: Location, exclude: str) -> Dict:
         if location is None:
             raise ValueError(f'location argument is malformed: \"{location}\"')
-
-        cacheValue = self.__cache[location.getLocationId()]
-
-        if cacheValue is not None:
-            return cacheValue
-
-        print(f'Refreshing weather for \"{location.getLocationId()}\"... ({utils.getNowTimeText()})')
+        elif not utils.isValidStr(exclude):
+            raise ValueError(f'exclude argument is malformed: \"{exclude}\"')
 
         # Retrieve weather report from https://openweathermap.org/api/one-call-api
         # Doing this requires an API key, which you can get here:
         # https://openweathermap.org/api
 
-        requestUrl = "https://api.openweathermap.org/data/2.5/onecall?appid={}&lat={}&lon={}&exclude=minutely,hourly&units=metric".format(
-            self.__oneWeatherApiKey, location.getLatitude(), location.getLongitude())
+        requestUrl = "https://api.openweathermap.org/data/2.5/onecall?appid={}&lat={}&lon={}&exclude={}&units=metric".format(
+            self.__oneWeatherApiKey, location.getLatitude(), location.getLongitude(), exclude)
 
         rawResponse = None
         try:
@@ -159,50 +301,116 @@ class WeatherRepository():
         except (ConnectionError, HTTPError, MaxRetryError, NewConnectionError, Timeout) as e:
             print(f'Exception occurred when attempting to fetch weather conditions from Open Weather for \"{location.getLocationId()}\": {e}')
             raise RuntimeError(f'Exception occurred when attempting to fetch weather conditions from Open Weather for \"{location.getLocationId()}\": {e}')
- 
+
         jsonResponse = None
         try:
-            jsonResponse = rawResponse.json()
+            jsonResponse = utils.loadJson(rawResponse.content)
         except JSONDecodeError as e:
             print(f'Exception occurred when attempting to decode Open Weather\'s response into JSON for \"{location.getLocationId()}\": {e}')
             raise RuntimeError(f'Exception occurred when attempting to decode Open Weather\'s response into JSON for \"{location.getLocationId()}\": {e}')
 
-        currentJson = jsonResponse['current']
-        humidity = currentJson['humidity']
-        pressure = currentJson['pressure']
-        temperature = currentJson['temp']
+        return jsonResponse
 
-        conditions = list()
-        if 'weather' in currentJson and len(currentJson['weather']) >= 1:
-            for conditionJson in currentJson['weather']:
-                conditions.append(self.__prettifyCondition(conditionJson))
+    def __fetchOneCallParts(self, location: Location, forecastOnly: bool = False) -> Tuple:
+        # Returns the (conditions, alerts, tomorrow, forecastSeries) parts of a WeatherReport,
+        # taking each one from its cache if it's there. Whichever parts aren't cached are all
+        # fetched with a single One Call request, excluding everything that's still cached. If
+        # forecastOnly is True, only the forecast is refreshed, and the other parts may be None.
+        if location is None:
+            raise ValueError(f'location argument is malformed: \"{location}\"')
 
-        alerts = list()
-        if 'alerts' in jsonResponse and len(jsonResponse['alerts']) >= 1:
-            for alertJson in jsonResponse['alerts']:
-                event = alertJson.get('event')
-                senderName = alertJson.get('sender_name')
+        locationId = location.getLocationId()
+        current = self.__conditionsCache[locationId]
+        alerts = self.__alertsCache[locationId]
+        tomorrow = self.__forecastCache[locationId]
+        forecastSeries = self.__forecastSeriesCache[locationId]
 
-                if event is not None and len(event) >= 1:
-                    if senderName is None or len(senderName) == 0:
-                        alerts.append(f'Alert: {event}.')
-                    else:
-                        alerts.append(f'Alert from {senderName}: {event}.')
+        isForecastNeeded = tomorrow is None or (self.__includeForecastSeries and forecastSeries is None)
+        isConditionsNeeded = current is None and not forecastOnly
+        isAlertsNeeded = alerts is None and not forecastOnly
+
+        if not isForecastNeeded and not isConditionsNeeded and not isAlertsNeeded:
+            return current, alerts, tomorrow, forecastSeries
+
+        refreshedParts = list()
+        exclude = [ 'minutely' ]
+
+        if isConditionsNeeded:
+            refreshedParts.append('conditions')
+
+        if isAlertsNeeded:
+            refreshedParts.append('alerts')
+        else:
+            exclude.append('alerts')
 
-        tomorrowsJson = self.__chooseTomorrowFromForecast(jsonResponse)
-        tomorrowsHighTemperature = tomorrowsJson['temp']['max']
-        tomorrowsLowTemperature = tomorrowsJson['temp']['min']
+        if isForecastNeeded:
+            refreshedParts.append('forecast')
+        else:
+            exclude.append('daily')
+
+        if not isForecastNeeded or not self.__includeForecastSeries:
+            exclude.append('hourly')
+
+        # the "current" block is also needed to pick out tomorrow's forecast
+        if not isConditionsNeeded and not isForecastNeeded:
+            exclude.append('current')
+
+        print(f'Refreshing weather {", ".join(refreshedParts)} for \"{locationId}\"... ({utils.getNowTimeText()})')
+
+        jsonResponse = self.__fetchOneCall(
+            location = location,
+            exclude = ','.join(exclude)
+        )
+
+        if isConditionsNeeded:
+            current = self.__decode(self.__conditionsSchema, jsonResponse, location).current
+            self.__conditionsCache[locationId] = current
+
+        if isAlertsNeeded:
+            alerts = self.__parseAlerts(self.__decode(self.__alertsSchema, jsonResponse, location))
+            self.__alertsCache[locationId] = alerts
+
+        if isForecastNeeded:
+            forecast = self.__decode(self.__forecastSchema, jsonResponse, location)
+            tomorrow = self.__chooseTomorrowFromForecast(forecast)
+            self.__forecastCache[locationId] = tomorrow
+
+            if self.__includeForecastSeries:
+                forecastSeries = WeatherForecastSeries.fromJson(jsonResponse)
+                self.__forecastSeriesCache[locationId] = forecastSeries
+
+        return current, alerts, tomorrow, forecastSeries
+
+    def fetchWeather(self, location: Location) -> WeatherReport:
+        if location is None:
+            raise ValueError(f'location argument is malformed: \"{location}\"')
+
+        # only conditions that were freshly fetched from upstream get recorded into history
+        isNewConditions = self.__conditionsCache[location.getLocationId()] is None
+
+        current, alerts, tomorrow, _ = self.__fetchOneCallParts(location)
+        humidity = current.humidity
+        pressure = current.pressure
+        temperature = current.temp
+
+        conditions = list()
+        if utils.hasItems(current.weather):
+            for condition in current.weather:
+                conditions.append(self.__prettifyCondition(condition))
+
+        tomorrowsHighTemperature = tomorrow.temp.max
+        tomorrowsLowTemperature = tomorrow.temp.min
 
         tomorrowsConditions = list()
-        if 'weather' in tomorrowsJson and len(tomorrowsJson['weather']) >= 1:
-            for conditionJson in tomorrowsJson['weather']:
-                tomorrowsConditions.append(conditionJson['description'])
+        if utils.hasItems(tomorrow.weather):
+            for condition in tomorrow.weather:
+                tomorrowsConditions.append(condition.description)
 
         airQuality = None
         if utils.isValidStr(self.__iqAirApiKey):
             airQuality = self.__fetchAirQuality(location)
 
-        return WeatherReport(
+        weatherReport = WeatherReport(
             airQuality = airQuality,
             humidity = int(round(humidity)),
             pressure = int(round(pressure)),
@@ -214,14 +422,35 @@ class WeatherRepository():
             tomorrowsConditions = tomorrowsConditions
         )
 
-    def __prettifyCondition(self, conditionJson: dict) -> str:
+        if isNewConditions and self.__weatherHistoryRepository is not None:
+            self.__weatherHistoryRepository.addWeatherReport(location.getLocationId(), weatherReport)
+
+        return weatherReport
+
+    def __prettifyCondition(self, condition) -> str:
         conditionIcon = ''
-        if 'id' in conditionJson:
-            id_ = str(conditionJson['id'])
+        if condition.id is not None:
+            id_ = str(condition.id)
 
             if id_ in self.__conditionIcons:
                 icon = self.__conditionIcons[id_]
                 conditionIcon = f'{icon} '
 
-        conditionDescription = conditionJson['description']
+        conditionDescription = condition.description
         return f'{conditionIcon}{conditionDescription}'
+
+    def __parseAlerts(self, alertsResponse) -> List[str]:
+        alerts = list()
+
+        if utils.hasItems(alertsResponse.alerts):
+            for alert in alertsResponse.alerts:
+                event = alert.event
+                senderName = alert.sender_name
+
+                if event is not None and len(event) >= 1:
+                    if senderName is None or len(senderName) == 0:
+                        alerts.append(f'Alert: {event}.')
+                    else:
+                        alerts.append(f'Alert from {senderName}: {event}.')
+
+        return alerts